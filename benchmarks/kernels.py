@@ -0,0 +1,54 @@
+"""
+Compare the time of the two-piece uniform's ``pdf``, ``cdf``, ``ppf`` and ``rvs`` with each
+kernel backend, and with the Python-level loop (``np.vectorize``) they replaced.
+
+Usage: ``poetry run python benchmarks/kernels.py`` (install the ``jit`` extra for numba)
+"""
+import time
+
+import numpy as np
+
+from rvtools.dists.gen import _kernels
+
+SIZE = 1_000_000
+PARAMS = (0.0, 1.0, 3.0, 0.3)
+
+
+def ppf_single(p, mini, sep, maxi, psep):
+    if 0 <= p < psep:
+        return mini + p / psep * (sep - mini)
+    elif psep <= p <= 1:
+        return sep + (p - psep) / (1 - psep) * (maxi - sep)
+    return np.nan
+
+
+def timed(func, repeat=3):
+    func()  # Compile, for numba
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-0.5, 3.5, SIZE)
+    q = rng.uniform(0, 1, SIZE)
+
+    loop = timed(lambda: np.vectorize(ppf_single, otypes=[float])(q, *PARAMS), repeat=1)
+    print(f"{'ppf, np.vectorize (s)':>24} {loop:>8.3f}")
+    print(f"{'backend':>10} {'pdf (s)':>8} {'cdf (s)':>8} {'ppf (s)':>8} {'rvs (s)':>8}")
+    for backend in _kernels.available_backends():
+        times = [
+            timed(lambda: _kernels.pdf(x, *PARAMS, backend=backend)),
+            timed(lambda: _kernels.cdf(x, *PARAMS, backend=backend)),
+            timed(lambda: _kernels.ppf(q, *PARAMS, backend=backend)),
+            timed(lambda: _kernels.rvs(*PARAMS, size=(SIZE,), random_state=rng, backend=backend)),
+        ]
+        print(f"{backend:>10} " + " ".join(f"{t:>8.3f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
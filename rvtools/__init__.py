@@ -1,4 +1,6 @@
 """Top-level package for Probability distribution and random variable tools."""
 from pathlib import Path
 
+__version__ = "0.1.6"
+
 PROJECT_ROOT = Path(__file__).parent.parent
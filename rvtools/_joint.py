@@ -0,0 +1,85 @@
+"""
+Helpers for functions that take the random inputs of a model, either as a ``CopulaJoint`` or as
+independent (frozen) distributions, and work with them in the latent space of the Gaussian
+copula.
+"""
+from typing import Any, Callable, Iterator, NamedTuple, Union
+
+import numpy as np
+import scipy
+from copula_wrapper import CopulaJoint
+from scipy.stats.distributions import rv_frozen
+
+Inputs = Union[CopulaJoint, dict[Any, rv_frozen], list[rv_frozen]]
+
+
+class Unpacked(NamedTuple):
+    names: list
+    marginals: list[rv_frozen]
+    # Correlation matrix of the latent normals
+    corr: np.ndarray
+    # Whether the inputs were given names (rather than positions)
+    named: bool
+
+
+def unpack(inputs: Inputs) -> Unpacked:
+    if isinstance(inputs, CopulaJoint):
+        marginals = list(inputs._wrapped.marginals)
+        named = inputs._idx_to_name is not None
+        names = list(inputs._idx_to_name) if named else list(range(len(marginals)))
+        return Unpacked(names, marginals, np.asarray(inputs._wrapped.copula.corr), named)
+    if isinstance(inputs, dict):
+        names, marginals = list(inputs.keys()), list(inputs.values())
+        return Unpacked(names, marginals, np.eye(len(marginals)), True)
+    if isinstance(inputs, (list, tuple)):
+        marginals = list(inputs)
+        return Unpacked(list(range(len(marginals))), marginals, np.eye(len(marginals)), False)
+    raise TypeError(
+        f"Expected a CopulaJoint, or a dict or list of frozen distributions, got {type(inputs)}."
+    )
+
+
+def to_inputs(unpacked: Unpacked, latent: np.ndarray) -> dict:
+    """
+    Transform latent standard normals (one column per input) to samples of the inputs, as a
+    dictionary mapping names (or positions) to arrays.
+
+    Positive latent values go through the inverse survival function, so that upper tails are as
+    accurate as lower tails (``ndtr(z)`` rounds to 1 for ``z > 8.3``).
+    """
+    inputs = {}
+    for j, (name, marginal) in enumerate(zip(unpacked.names, unpacked.marginals)):
+        z = latent[:, j]
+        upper = z > 0
+        x = np.empty(len(z))
+        x[~upper] = marginal.ppf(scipy.special.ndtr(z[~upper]))
+        x[upper] = marginal.isf(scipy.special.ndtr(-z[upper]))
+        inputs[name] = x
+    return inputs
+
+
+def chunks(array: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    for start in range(0, len(array), chunk_size):
+        yield array[start : start + chunk_size]
+
+
+def evaluate(model: Callable[[dict], np.ndarray], unpacked: Unpacked, latent_chunks) -> np.ndarray:
+    """Outputs of ``model`` for each chunk of latent normals, concatenated."""
+    outputs = []
+    for latent in latent_chunks:
+        outputs.append(check_output(model(to_inputs(unpacked, latent)), len(latent)))
+    return np.concatenate(outputs)
+
+
+def check_output(y, n: int) -> np.ndarray:
+    """The output of a model for ``n`` samples, as a float array, checking its shape."""
+    y = np.asarray(y, dtype=float)
+    if y.shape != (n,):
+        raise ValueError(
+            f"The model must return one output per sample, i.e. shape {(n,)}, got {y.shape}."
+        )
+    return y
+
+
+def is_independent(corr: np.ndarray) -> bool:
+    return np.array_equal(corr, np.eye(len(corr)))
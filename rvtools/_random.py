@@ -0,0 +1,21 @@
+"""Helpers for ``random_state`` arguments."""
+from typing import Union
+
+import numpy as np
+
+RandomState = Union[None, int, np.random.RandomState, np.random.Generator]
+
+
+def check_random_state(
+    random_state: RandomState,
+) -> Union[np.random.RandomState, np.random.Generator]:
+    """
+    A random generator from ``random_state``, which may be anything SciPy's ``rvs`` accepts.
+
+    Instances of ``np.random.RandomState`` and ``np.random.Generator`` are returned as they are.
+    Otherwise (``None``, an integer or a ``SeedSequence``), a new ``np.random.Generator`` is
+    created, so that all draws from it are independent, even given an integer seed.
+    """
+    if isinstance(random_state, (np.random.RandomState, np.random.Generator)):
+        return random_state
+    return np.random.default_rng(random_state)
@@ -0,0 +1,160 @@
+"""
+Monte Carlo estimates of the output of a model, sampling until a target precision is reached.
+
+Rather than choosing a sample size up front, :py:func:`run` samples the inputs in growing
+rounds. After each round it estimates the mean and the requested quantiles of the output, with
+their standard errors, and stops once every standard error is within ``rtol`` of its estimate
+(or within ``atol``). Easy models stop after a few thousand evaluations; hard ones keep going,
+up to ``max_size``.
+
+Standard errors are computed by batch means: the outputs are split into ``n_batches`` batches,
+each statistic is computed on each batch, and the standard error of the statistic over all
+outputs is the standard deviation of the batch statistics divided by ``sqrt(n_batches)``. Unlike
+the textbook standard error of a mean, this works for quantiles too.
+
+The size of each round is chosen from the current standard errors, which shrink like
+``1 / sqrt(size)``: it aims slightly past the size at which the target would be met, but never
+more than multiplies the total by ``max_growth``.
+
+Examples
+--------
+
+>>> from rvtools.construct import lognorm, norm
+>>> from rvtools.adaptive import run
+>>> inputs = {"price": lognorm(mu=0, sigma=0.5), "quantity": norm(10, 2)}
+>>> def model(x):
+...     return x["price"] * x["quantity"]
+>>> result = run(model, inputs, rtol=0.005, quantiles=[0.05, 0.95], random_state=0)
+>>> result.converged
+True
+>>> round(result.mean, 1)  # Exactly exp(0.125) * 10
+11.3
+>>> bool(result.mean_stderr <= 0.005 * result.mean)
+True
+>>> result.quantiles.round(1)
+array([ 4. , 23.8])
+"""
+from typing import Callable, NamedTuple, Sequence
+
+import numpy as np
+
+from rvtools._joint import Inputs, evaluate, unpack
+
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+class AdaptiveEstimate(NamedTuple):
+    #: Estimate of the mean output
+    mean: float
+    #: Batch-means standard error of ``mean``
+    mean_stderr: float
+    #: The requested probabilities
+    probabilities: np.ndarray
+    #: Estimates of the output's quantiles at ``probabilities``
+    quantiles: np.ndarray
+    #: Batch-means standard errors of ``quantiles``
+    quantile_stderrs: np.ndarray
+    #: Total number of model evaluations
+    size: int
+    #: Whether the target precision was reached (rather than ``max_size``)
+    converged: bool
+    #: Total number of model evaluations after each round
+    sizes: list[int]
+
+
+def run(
+    model: Callable[[dict], np.ndarray],
+    inputs: Inputs,
+    *,
+    rtol: float = 0.01,
+    atol: float = 0.0,
+    quantiles: Sequence[float] = (),
+    mean: bool = True,
+    initial_size: int = 10_000,
+    max_size: int = 10_000_000,
+    max_growth: float = 4.0,
+    n_batches: int = 32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> AdaptiveEstimate:
+    """
+    Sample ``model(inputs)`` until its mean and ``quantiles`` are estimated to within ``rtol``.
+
+    :param model: A vectorized function of the inputs. See :ref:`models`.
+    :param inputs: The random inputs of the model. See :ref:`models`.
+    :param rtol: Target standard error, relative to the absolute value of each estimate.
+    :param atol:
+        Target standard error in absolute terms. A statistic is precise enough once it meets
+        either target. This is useful for statistics that are close to 0.
+    :param quantiles: Probabilities of the quantiles to estimate.
+    :param mean: Whether the precision of the mean counts towards stopping.
+    :param initial_size: Number of model evaluations in the first round.
+    :param max_size: Maximum number of model evaluations, after which sampling stops regardless.
+    :param max_growth: Maximum factor by which a round multiplies the total number of evaluations.
+    :param n_batches: Number of batches for the standard errors.
+    :param chunk_size: Number of samples evaluated at a time.
+    """
+    probabilities = np.asarray(quantiles, dtype=float).reshape(-1)
+    if np.any((probabilities < 0) | (probabilities > 1)):
+        raise ValueError(f"Quantile probabilities must be in [0, 1], got {probabilities}.")
+    if not mean and probabilities.size == 0:
+        raise ValueError("There is nothing to estimate: pass `quantiles`, or `mean=True`.")
+    if initial_size < 2 * n_batches:
+        raise ValueError(
+            f"`initial_size` must be at least 2 * n_batches = {2 * n_batches}, got {initial_size}."
+        )
+
+    unpacked = unpack(inputs)
+    cholesky = np.linalg.cholesky(unpacked.corr)
+    rng = np.random.default_rng(random_state)
+
+    def latent_chunks(size):
+        for start in range(0, size, chunk_size):
+            n = min(chunk_size, size - start)
+            yield rng.standard_normal((n, len(unpacked.names))) @ cholesky.T
+
+    y = np.empty(0)
+    sizes = []
+    target = min(initial_size, max_size)
+    while True:
+        y = np.concatenate([y, evaluate(model, unpacked, latent_chunks(target - len(y)))])
+        sizes.append(target)
+        estimates, stderrs = _batch_means(y, probabilities, n_batches)
+
+        checked = slice(0 if mean else 1, None)
+        tolerance = np.maximum(atol, rtol * np.abs(estimates[checked]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.max(np.where(stderrs[checked] <= tolerance, 0, stderrs[checked] / tolerance))
+        converged = bool(ratio == 0)
+        if converged or target >= max_size:
+            break
+        # Standard errors shrink like 1 / sqrt(size). Aim 20% past the predicted size.
+        predicted = target * ratio**2 * 1.2 if np.isfinite(ratio) else np.inf
+        target = int(min(max_size, target * max_growth, max(predicted, target + n_batches)))
+
+    return AdaptiveEstimate(
+        mean=float(estimates[0]),
+        mean_stderr=float(stderrs[0]),
+        probabilities=probabilities,
+        quantiles=estimates[1:],
+        quantile_stderrs=stderrs[1:],
+        size=len(y),
+        converged=converged,
+        sizes=sizes,
+    )
+
+
+def _batch_means(
+    y: np.ndarray, probabilities: np.ndarray, n_batches: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The mean and quantiles of ``y`` (in that order), and their batch-means standard errors.
+    Samples left over after splitting ``y`` into equal batches only count towards the estimates.
+    """
+    estimates = np.concatenate([[np.mean(y)], np.quantile(y, probabilities)])
+    batches = y[: len(y) - len(y) % n_batches].reshape(n_batches, -1)
+    batch_estimates = np.column_stack(
+        [np.mean(batches, axis=1), np.quantile(batches, probabilities, axis=1).T]
+    )
+    stderrs = np.std(batch_estimates, axis=0, ddof=1) / np.sqrt(n_batches)
+    return estimates, stderrs
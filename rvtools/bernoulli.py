@@ -0,0 +1,119 @@
+"""
+Bit-packed samples of many independent Bernoulli events.
+
+Sampling events with ``scipy.stats.bernoulli.rvs`` takes 8 bytes per draw. Here, the draws of
+each event are packed into bits with ``np.packbits``, i.e. 1/64th of the memory, and frequencies
+and co-occurrences are computed on the packed form by counting bits, a byte at a time.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.bernoulli import cooccurrence, frequencies, packed_rvs, unpack
+>>> packed = packed_rvs([0.1, 0.5, 0.9], 100_000, random_state=0)
+>>> packed.shape, packed.dtype
+((3, 12500), dtype('uint8'))
+>>> frequencies(packed, 100_000).round(2)
+array([0.1, 0.5, 0.9])
+>>> cooccurrence(packed, 100_000).round(2)
+array([[0.1 , 0.05, 0.09],
+       [0.05, 0.5 , 0.45],
+       [0.09, 0.45, 0.9 ]])
+>>> unpack(packed, 100_000).shape
+(3, 100000)
+"""
+from typing import Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.fam import is_frozen_bernoulli
+
+DEFAULT_CHUNK_SIZE = 2**15
+# Number of set bits in each byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def packed_rvs(
+    events: Union[ArrayLike, Sequence[rv_frozen]],
+    size: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> np.ndarray:
+    """
+    Draw ``size`` samples of each event, packed into bits.
+
+    :param events:
+        The probabilities of the events, or frozen Bernoulli distributions (with ``loc=0``).
+    :param chunk_size:
+        Number of samples drawn at a time, as uniforms that are compared to the probabilities.
+        Rounded up to a multiple of 8.
+    :return:
+        An array of ``uint8`` of shape ``(n_events, ceil(size / 8))``, as from
+        ``np.packbits(samples, axis=1)``. Bits beyond ``size`` are 0.
+    """
+    ps = _probabilities(events)
+    chunk_size = -(-chunk_size // 8) * 8
+    rng = np.random.default_rng(random_state)
+    packed = np.empty((len(ps), -(-size // 8)), dtype=np.uint8)
+    for start in range(0, size, chunk_size):
+        n = min(chunk_size, size - start)
+        draws = rng.random((len(ps), n)) < ps[:, None]
+        packed[:, start // 8 : (start + n + 7) // 8] = np.packbits(draws, axis=1)
+    return packed
+
+
+def unpack(packed: np.ndarray, size: int) -> np.ndarray:
+    """The samples as booleans, of shape ``(n_events, size)``."""
+    return np.unpackbits(packed, axis=-1, count=size).astype(bool)
+
+
+def counts(packed: np.ndarray) -> np.ndarray:
+    """Number of samples in which each event occurs."""
+    return _popcount(packed)
+
+
+def frequencies(packed: np.ndarray, size: int) -> np.ndarray:
+    """Fraction of the ``size`` samples in which each event occurs."""
+    return counts(packed) / size
+
+
+def cooccurrence(packed: np.ndarray, size: int, *, chunk_size: int = 2**16) -> np.ndarray:
+    """
+    Matrix of the fractions of samples in which both events ``i`` and ``j`` occur. Its diagonal
+    is :py:func:`frequencies`.
+
+    :param chunk_size: Number of bytes of each event processed at a time.
+    """
+    n_events = len(packed)
+    pair_counts = np.zeros((n_events, n_events), dtype=np.int64)
+    for start in range(0, packed.shape[1], chunk_size):
+        chunk = packed[:, start : start + chunk_size]
+        for i in range(n_events):
+            pair_counts[i, i:] += _popcount(chunk[i] & chunk[i:])
+    upper = np.triu(pair_counts)
+    return (upper + np.triu(upper, 1).T) / size
+
+
+def _popcount(packed: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        bits = np.bitwise_count(packed)
+    else:
+        bits = _POPCOUNT[packed]
+    return bits.sum(axis=-1, dtype=np.int64)
+
+
+def _probabilities(events) -> np.ndarray:
+    if len(events) and all(isinstance(e, rv_frozen) for e in events):
+        if not all(is_frozen_bernoulli(e) and e.support()[0] == 0 for e in events):
+            raise ValueError("Expected frozen Bernoulli distributions with loc=0.")
+        events = [e.mean() for e in events]
+    ps = np.asarray(events, dtype=float)
+    if ps.ndim != 1:
+        raise ValueError(f"Expected a 1-dimensional array of probabilities, got shape {ps.shape}.")
+    if not np.all((ps >= 0) & (ps <= 1)):
+        raise ValueError("Probabilities must be between 0 and 1.")
+    return ps
@@ -0,0 +1,208 @@
+"""
+An opt-in, persistent cache of random samples.
+
+Drawing the same samples again (same distribution, parameters, size and seed) loads them from a
+memory-mapped ``.npy`` file instead of recomputing them.
+
+Examples
+--------
+
+>>> import tempfile
+>>> from rvtools.construct import lognorm
+>>> from rvtools.cache import SampleCache
+>>> cache = SampleCache(tempfile.mkdtemp(), max_bytes=2**30)
+>>> first = cache.rvs(lognorm(p5=1, p95=10), 1000, seed=42)  # Computed and stored
+>>> second = cache.rvs(lognorm(p5=1, p95=10), 1000, seed=42)  # Loaded from disk
+>>> bool((first == second).all())
+True
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from numbers import Real
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+import scipy
+from copula_wrapper import CopulaJoint
+from scipy.stats.distributions import rv_frozen
+
+import rvtools
+from rvtools.dists import Empirical, Mixture
+
+SUFFIX = ".npy"
+
+
+class SampleCache:
+    """
+    A directory of cached samples, keyed by a stable hash of the distribution's family and
+    parameters, the sample size, the seed, the sampling method, and the versions of rvtools,
+    NumPy and SciPy.
+
+    :param directory: Where to store the samples. Created if it does not exist.
+    :param max_bytes:
+        Maximum total size of the cached files. When it is exceeded, the least recently used
+        files are deleted.
+
+    Files are written to a temporary file and then renamed, so several processes can safely use
+    the same directory concurrently: a reader never sees a partially written file.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = 10 * 2**30):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def rvs(self, dist, size: int, seed, method: str = "rvs"):
+        """
+        Equivalent to ``getattr(dist, method)(size, random_state=seed)``, but cached.
+
+        :param dist: A frozen distribution or a ``CopulaJoint``.
+        :param seed:
+            An integer or sequence of integers (there is no point caching unseeded samples).
+        :return:
+            A read-only memory-mapped array (or a ``DataFrame`` for a ``CopulaJoint`` with named
+            marginals).
+        """
+        if seed is None:
+            raise ValueError("Samples can only be cached when a seed is given.")
+        path = self.directory / (key(dist, size, seed, method) + SUFFIX)
+        try:
+            array = np.load(path, mmap_mode="r")
+            _touch(path)
+        except FileNotFoundError:
+            sample = getattr(dist, method)(size, random_state=np.random.default_rng(seed))
+            self._write(path, np.asarray(sample))
+            self._evict(keep=path)
+            array = np.load(path, mmap_mode="r")
+
+        if isinstance(dist, CopulaJoint) and dist._idx_to_name:
+            return pd.DataFrame(array, columns=dist._idx_to_name, copy=False)
+        return array
+
+    def size_bytes(self) -> int:
+        """Total size of the cached files."""
+        return sum(size for _, _, size in self._entries())
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            path.unlink(missing_ok=True)
+
+    def _write(self, path: Path, array: np.ndarray):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            _touch(path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _evict(self, keep: Path):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # Another process may have deleted it already
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        """``(path, last used, size)`` of each cached file."""
+        entries = []
+        for path in self.directory.glob("*" + SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+
+def key(dist, size: int, seed, method: str = "rvs") -> str:
+    """
+    A stable hash identifying the samples ``getattr(dist, method)(size, random_state=seed)``.
+
+    Equal distributions get equal keys however they were constructed, e.g.
+    ``lognorm(mu=0, sigma=1)`` and ``scipy.stats.lognorm(1)``. The versions of rvtools, NumPy and
+    SciPy are part of the key, since their random streams may change between versions.
+    """
+    description = {
+        "dist": describe(dist),
+        "size": size,
+        "seed": str(np.random.SeedSequence(seed).entropy),
+        "method": method,
+        "versions": [rvtools.__version__, np.__version__, scipy.__version__],
+    }
+    encoded = json.dumps(_canonical(description), sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def describe(dist) -> dict:
+    """A JSON-serializable description of the family and canonical parameters of ``dist``."""
+    if isinstance(dist, CopulaJoint):
+        marginals = dist.marginals
+        names = list(marginals.keys()) if isinstance(marginals, dict) else None
+        return {
+            "family": _qualname(dist),
+            "names": [repr(name) for name in names] if names else None,
+            "marginals": [describe(m) for m in dist._wrapped.marginals],
+            "corr": dist._wrapped.copula.corr,
+        }
+    if not isinstance(dist, rv_frozen):
+        raise TypeError(f"Cannot describe {type(dist)}: expected a frozen distribution.")
+
+    shapes, loc, scale = dist.dist._parse_args(*dist.args, **dist.kwds)
+    description = {"family": _qualname(dist.dist), "shapes": shapes, "loc": loc, "scale": scale}
+    # Distributions whose parameters are given to the instance, not as shapes
+    if isinstance(dist.dist, Mixture):
+        description["components"] = [describe(c) for c in dist.dist._components]
+        description["weights"] = dist.dist._weights
+    elif isinstance(dist.dist, Empirical):
+        description["samples"] = _digest(dist.dist._sorted)
+    elif isinstance(dist.dist, scipy.stats.rv_histogram):
+        description["histogram"] = [_digest(a) for a in dist.dist._histogram]
+    return description
+
+
+def _touch(path: Path):
+    """
+    Mark as recently used. File timestamps set by the OS have a coarse resolution (often several
+    milliseconds), so set them explicitly.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def _qualname(obj) -> str:
+    return f"{type(obj).__module__}.{type(obj).__qualname__}"
+
+
+def _digest(array, chunk_size=10_000_000) -> str:
+    h = hashlib.sha256(str(np.asarray(array[:0]).dtype).encode())
+    for start in range(0, len(array), chunk_size):
+        h.update(np.ascontiguousarray(array[start : start + chunk_size]).tobytes())
+    return h.hexdigest()
+
+
+def _canonical(obj):
+    """Convert to JSON-serializable types, with all numbers as floats (so that ``1 == 1.0``)."""
+    if isinstance(obj, dict):
+        return {k: _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, Real):
+        return float(obj)
+    if obj is None or isinstance(obj, str):
+        return obj
+    raise TypeError(f"Cannot serialize {type(obj)}.")
@@ -0,0 +1,81 @@
+"""
+The ``rvtools`` command.
+
+Modules with heavier dependencies are imported by the subcommands that need them, so that
+``rvtools --help`` is fast.
+"""
+import argparse
+import asyncio
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="rvtools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="Serve samples, quantiles and CDF values of distributions over HTTP.",
+        description="See the documentation of rvtools.serve for the endpoints.",
+    )
+    serve.add_argument(
+        "models",
+        help="A dictionary of distributions (or a function returning one), as 'module:attribute'.",
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead.")
+    serve.add_argument("--batch-window", type=float, help="Seconds to wait to coalesce requests.")
+    serve.add_argument("--max-batch-size", type=int, help="Largest number of values per batch.")
+    serve.add_argument("--seed", type=int, help="Seed for requests that do not give one.")
+    serve.set_defaults(func=_serve)
+
+    sample = subparsers.add_parser(
+        "sample",
+        help="Stream samples of a model specification to .npy files or Parquet.",
+        description="See the documentation of rvtools.spec for the specification format.",
+    )
+    sample.add_argument("spec", help="A .json or .toml model specification.")
+    sample.add_argument("--size", type=int, required=True, help="Number of samples.")
+    sample.add_argument(
+        "--out",
+        required=True,
+        help="A directory for one .npy file per marginal, or a .parquet file.",
+    )
+    sample.add_argument("--format", choices=["npy", "parquet"], help="Default: from --out.")
+    sample.add_argument("--chunk-size", type=int, help="Rows sampled and written at a time.")
+    sample.add_argument("--seed", type=int, help="Overrides the seed of the specification.")
+    sample.set_defaults(func=_sample)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+def _serve(args: argparse.Namespace):
+    from rvtools.serve import SamplingServer, load_models
+
+    options = {"batch_window": args.batch_window, "max_batch_size": args.max_batch_size}
+    options = {key: value for key, value in options.items() if value is not None}
+    server = SamplingServer(load_models(args.models), random_state=args.seed, **options)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, path=args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+def _sample(args: argparse.Namespace):
+    from rvtools import spec
+
+    model = spec.load(args.spec)
+    joint = spec.from_dict(model)
+    seed = args.seed if args.seed is not None else model.get("seed")
+    options = {"random_state": seed}
+    if args.chunk_size is not None:
+        options["chunk_size"] = args.chunk_size
+    format = args.format or ("parquet" if args.out.endswith(".parquet") else "npy")
+    if format == "parquet":
+        spec.write_parquet(joint, args.out, args.size, **options)
+    else:
+        spec.write_npy(joint, args.out, args.size, **options)
@@ -7,4 +7,8 @@ from rvtools.construct.uniform import uniform
 from rvtools.construct.loguniform import loguniform
 from rvtools.construct.pert import pert
 from rvtools.construct.tp_uniform import tp_uniform
+from rvtools.construct.mixture import mixture
+from rvtools.construct.empirical import empirical
+from rvtools.construct.iman_conover import ImanConoverJoint
 from rvtools.dists import certainty  # noqa
+from rvtools.construct import fit  # noqa
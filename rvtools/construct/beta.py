@@ -4,8 +4,11 @@ import numpy as np
 import scipy
 
 from rvtools.construct._helpers import parse_spec
+from rvtools.gradients import cdf_grad
+from rvtools.memo import memoized
 
 
+@memoized
 def beta(alpha: Real = None, beta: Real = None, *, quantiles: dict[Real, Real] = None, **kwargs):
     """
     Create a (frozen) SciPy beta distribution.
@@ -16,14 +19,14 @@ def beta(alpha: Real = None, beta: Real = None, *, quantiles: dict[Real, Real] =
 
     >>> from rvtools.construct import beta
     >>> beta(1, 2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     2. Using quantiles:
 
     >>> beta(p5=0.1, p95=0.9) # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     >>> beta(quantiles={1/1000: 0.1, 999/1000: 0.9})  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     """
     spec = parse_spec(alpha=alpha, beta=beta, quantiles=quantiles, **kwargs)
@@ -39,19 +42,12 @@ def from_quantiles(quantiles: dict[Real, Real]):
     if len(quantiles) != 2:
         raise ValueError(f"Expected exactly two quantiles, got {len(quantiles)}.")
     # Get the values of the quantiles
-    ps = list(quantiles.keys())
-    qs = list(quantiles.values())
+    ps = np.array(list(quantiles.keys()), dtype=float)
+    qs = np.array(list(quantiles.values()), dtype=float)
 
-    alpha_init, beta_init = 1, 1
-    fit = scipy.optimize.curve_fit(
-        lambda x, alpha, beta: scipy.stats.beta.cdf(x, alpha, beta),
-        xdata=qs,
-        ydata=ps,
-        p0=[alpha_init, beta_init],
-    )
+    alpha, beta = params_from_quantiles(ps, qs)
 
     # Since we estimated numerically, check that the estimated parameters give us the right quantiles
-    alpha, beta = fit[0]
     fitted_ps = scipy.stats.beta.cdf(qs, alpha, beta)
     if not np.allclose(fitted_ps, ps):
         raise ValueError(
@@ -60,3 +56,121 @@ def from_quantiles(quantiles: dict[Real, Real]):
         )
 
     return scipy.stats.beta(alpha, beta)
+
+
+def params_from_quantiles(ps, qs, max_iter: int = 200, tol: float = 1e-12) -> tuple[float, float]:
+    """
+    Find ``alpha`` and ``beta`` such that ``cdf(qs) = ps``.
+
+    This is solved with the Levenberg-Marquardt algorithm on the logarithms of the parameters
+    (which keeps them positive), using the exact Jacobian from
+    :py:func:`rvtools.gradients.cdf_grad`. The residuals are measured on the normal scale, i.e.
+    ``ndtri(cdf(qs)) - ndtri(ps)``, so that quantiles far in the tails weigh as much as central
+    ones.
+
+    >>> alpha, beta = params_from_quantiles([0.1, 0.9], [0.2, 0.6])
+    >>> [round(float(x), 6) for x in scipy.stats.beta.cdf([0.2, 0.6], alpha, beta)]
+    [0.1, 0.9]
+    """
+    ps, qs = np.asarray(ps, dtype=float), np.asarray(qs, dtype=float)
+    targets = scipy.special.ndtri(ps)
+
+    def residuals(log_params):
+        with np.errstate(over="ignore"):
+            return scipy.special.ndtri(scipy.stats.beta.cdf(qs, *np.exp(log_params))) - targets
+
+    best = None
+    for initial in [_initial_params(ps, qs), np.array([1.0, 1.0])]:
+        log_params = np.log(initial)
+        r = residuals(log_params)
+        damping = 1e-3
+        for _ in range(max_iter):
+            cost = np.sum(r**2)
+            if not np.isfinite(cost) or np.max(np.abs(r)) < tol:
+                break
+            params = np.exp(log_params)
+            grad = cdf_grad(scipy.stats.beta(*params), qs)
+            # Chain rule, through ndtri and the logarithms of the parameters
+            scale = params / scipy.stats.norm.pdf(r + targets)[:, None]
+            jacobian = np.stack([grad["alpha"], grad["beta"]], axis=1) * scale
+            hessian = jacobian.T @ jacobian
+            system = hessian + damping * np.diag(np.diag(hessian))
+            step = -np.linalg.lstsq(system, jacobian.T @ r, rcond=None)[0]
+            candidate = residuals(log_params + step)
+            if np.sum(candidate**2) < cost:
+                log_params, r = log_params + step, candidate
+                damping /= 3
+            else:
+                damping *= 4
+                if damping > 1e12:
+                    break
+        if best is None or np.sum(r**2) < best[1]:
+            best = log_params, np.sum(r**2)
+        if best[1] < tol**2:
+            break
+
+    alpha, beta = np.exp(best[0])
+    return float(alpha), float(beta)
+
+
+def params_from_log_means(
+    log_mean: Real, log1m_mean: Real, max_iter: int = 100, tol: float = 1e-12
+) -> tuple[float, float]:
+    """
+    The maximum likelihood ``alpha`` and ``beta`` for data with mean ``log(x)`` equal to
+    ``log_mean`` and mean ``log(1 - x)`` equal to ``log1m_mean`` (the sufficient statistics of the
+    beta distribution).
+
+    Solves ``digamma(alpha) - digamma(alpha + beta) = log_mean`` and
+    ``digamma(beta) - digamma(alpha + beta) = log1m_mean`` by Newton's method on the logarithms of
+    the parameters, starting from the approximation ``alpha = 1/2 + G / (2 (1 - G - H))``
+    (and symmetrically for ``beta``), where ``G`` and ``H`` are the geometric means of ``x`` and
+    ``1 - x``.
+
+    >>> from scipy.special import digamma
+    >>> alpha, beta = params_from_log_means(digamma(2) - digamma(7), digamma(5) - digamma(7))
+    >>> round(alpha, 9), round(beta, 9)
+    (2.0, 5.0)
+    """
+    g, h = np.exp(log_mean), np.exp(log1m_mean)
+    if not (log_mean < 0 and log1m_mean < 0 and g + h < 1):
+        raise ValueError(
+            f"No beta distribution has mean log(x) = {log_mean} and mean log(1 - x) = "
+            f"{log1m_mean}. The data may be constant, or outside (0, 1)."
+        )
+    targets = np.array([log_mean, log1m_mean])
+
+    def residuals(params):
+        return scipy.special.digamma(params) - scipy.special.digamma(params.sum()) - targets
+
+    log_params = np.log(0.5 + np.array([g, h]) / (2 * (1 - g - h)))
+    r = residuals(np.exp(log_params))
+    for _ in range(max_iter):
+        params = np.exp(log_params)
+        trigamma = scipy.special.polygamma(1, params)
+        jacobian = (np.diag(trigamma) - scipy.special.polygamma(1, params.sum())) * params
+        step = -np.linalg.solve(jacobian, r)
+        # Halve the step until the residuals shrink (the equations are well-behaved, so this
+        # rarely happens)
+        for _ in range(50):
+            candidate = residuals(np.exp(log_params + step))
+            if np.sum(candidate**2) < np.sum(r**2):
+                break
+            step /= 2
+        log_params, r = log_params + step, candidate
+        if np.max(np.abs(step)) < tol:
+            break
+
+    alpha, beta = np.exp(log_params)
+    return float(alpha), float(beta)
+
+
+def _initial_params(ps: np.ndarray, qs: np.ndarray) -> np.ndarray:
+    """Match the moments of the normal distribution with the same quantiles, if possible."""
+    zs = scipy.special.ndtri(ps)
+    sd = (qs[1] - qs[0]) / (zs[1] - zs[0])
+    mean = np.clip(qs[0] - sd * zs[0], 0.01, 0.99)
+    common = mean * (1 - mean) / sd**2 - 1
+    if not (np.isfinite(common) and sd > 0 and common > 0):
+        return np.array([1.0, 1.0])
+    return np.array([mean * common, (1 - mean) * common])
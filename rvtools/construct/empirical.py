@@ -0,0 +1,67 @@
+import os
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.dists import Empirical
+from rvtools.dists.gen.empirical import is_sorted
+from rvtools.memo import memoized
+
+
+@memoized
+def empirical(
+    samples: ArrayLike = None, *, path: Union[str, os.PathLike] = None, mmap: bool = True
+) -> rv_frozen:
+    """
+    Create a (frozen) distribution from samples, e.g. the output of another model. See
+    :py:class:`rvtools.dists.Empirical` for details.
+
+    You can provide the samples in one of three ways.
+
+    1. As an array, which is sorted (in memory) once:
+
+    >>> from rvtools.construct import empirical
+    >>> dist = empirical([3, 1, 2, 4, 5])
+    >>> float(dist.ppf(0.5))
+    3.0
+
+    2. As a ``.npy`` file of samples already sorted in ascending order (see :py:func:`sort_npy`):
+
+    >>> import numpy as np, os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "samples.npy")
+    >>> np.save(path, np.arange(11.0))
+    >>> dist = empirical(path=path)
+    >>> float(dist.cdf(2.5))
+    0.25
+
+    By default, the file is memory-mapped rather than loaded, so it need not fit in memory.
+
+    3. Both: the samples are sorted and saved to ``path``, then memory-mapped from there.
+    """
+    if samples is not None and path is not None:
+        np.save(path, np.sort(np.asarray(samples).ravel()))
+    elif samples is not None:
+        return Empirical(samples).freeze()
+    elif path is None:
+        raise ValueError("You must specify 'samples', 'path', or both.")
+
+    array = np.load(path, mmap_mode="r" if mmap else None)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-dimensional array in {path}, got shape {array.shape}.")
+    if not is_sorted(array):
+        raise ValueError(f"Samples in {path} are not sorted. Use `sort_npy` to sort them.")
+    return Empirical(array, assume_sorted=True).freeze()
+
+
+def sort_npy(path: Union[str, os.PathLike]):
+    """
+    Sort the 1-dimensional array in a ``.npy`` file in place.
+
+    The file is memory-mapped, so the operating system pages it in and out as needed rather than
+    loading it in full.
+    """
+    array = np.load(path, mmap_mode="r+")
+    array.sort()
+    array.flush()
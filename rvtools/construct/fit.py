@@ -0,0 +1,187 @@
+"""
+Fit distributions to data too large for memory, in a single pass over chunks of it.
+
+Each fit function takes the data as an array (which is read in chunks, so a memory-mapped array
+need not fit in memory), as an iterable of chunks (e.g. a generator reading a file), or as
+:py:class:`SufficientStatistics` already accumulated from the data. It returns the same frozen
+distribution as the corresponding constructor in :py:mod:`rvtools.construct`.
+
+The statistics are mergeable, so a large dataset can be split between worker processes, each of
+which computes the :py:class:`SufficientStatistics` of its part, and the results merged before
+fitting. Memory use does not depend on the amount of data.
+
+All fits are maximum likelihood estimates:
+
+============== ======================================= =========================================
+Function       Statistics                              Estimate
+============== ======================================= =========================================
+``norm``       mean and variance of ``x``              ``mean``, ``sd`` (with ``ddof=0``)
+``lognorm``    mean and variance of ``log(x)``         ``mu``, ``sigma`` (with ``ddof=0``)
+``uniform``    minimum and maximum                     ``a``, ``b``
+``loguniform`` minimum and maximum                     ``a``, ``b``
+``beta``       means of ``log(x)`` and ``log(1 - x)``  ``alpha``, ``beta`` (by Newton's method)
+============== ======================================= =========================================
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import fit
+>>> rng = np.random.default_rng(0)
+>>> chunks = (rng.lognormal(1, 0.5, 100_000) for _ in range(10))
+>>> dist = fit.lognorm(chunks)
+>>> [round(float(x), 2) for x in dist.ppf([0.05, 0.5, 0.95])]
+[1.19, 2.72, 6.19]
+
+Statistics computed separately are merged before fitting:
+
+>>> a = fit.statistics(rng.beta(2, 5, 100_000))
+>>> b = fit.statistics(rng.beta(2, 5, 100_000))
+>>> dist = fit.beta(a.merge(b))
+>>> [round(float(x), 1) for x in dist.args]
+[2.0, 5.0]
+"""
+from typing import Iterable, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.construct.beta import beta as construct_beta
+from rvtools.construct.beta import params_from_log_means
+from rvtools.construct.lognorm import lognorm as construct_lognorm
+from rvtools.construct.loguniform import loguniform as construct_loguniform
+from rvtools.construct.norm import norm as construct_norm
+from rvtools.construct.uniform import uniform as construct_uniform
+from rvtools.summary import Moments
+
+DEFAULT_CHUNK_SIZE = 2**20
+
+
+class SufficientStatistics:
+    """
+    Statistics of a stream of data, from which each of the fit functions computes its estimate.
+
+    Moments of ``log(x)`` are only accumulated over positive values, and the sum of
+    ``log(1 - x)`` over values below 1. The counts of the other values tell whether these are
+    the statistics of all the data, which the fits that use them require.
+    """
+
+    def __init__(self):
+        #: Moments of ``x``
+        self.moments = Moments()
+        #: Moments of ``log(x)``, over positive values
+        self.log_moments = Moments()
+        #: Sum of ``log(1 - x)``, over values below 1
+        self.sum_log1m = 0.0
+        self.n_nonpositive = 0
+        self.n_at_least_one = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def n(self) -> int:
+        return self.moments.n
+
+    def update(self, chunk: ArrayLike) -> "SufficientStatistics":
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+        if np.isnan(chunk).any():
+            raise ValueError("The data contain missing values. Drop them first.")
+        self.moments.update(chunk)
+        positive = chunk > 0
+        below_one = chunk < 1
+        self.log_moments.update(np.log(chunk[positive]))
+        self.sum_log1m += np.log1p(-chunk[below_one]).sum()
+        self.n_nonpositive += chunk.size - np.count_nonzero(positive)
+        self.n_at_least_one += chunk.size - np.count_nonzero(below_one)
+        self.min = min(self.min, chunk.min())
+        self.max = max(self.max, chunk.max())
+        return self
+
+    def merge(self, other: "SufficientStatistics") -> "SufficientStatistics":
+        self.moments.merge(other.moments)
+        self.log_moments.merge(other.log_moments)
+        self.sum_log1m += other.sum_log1m
+        self.n_nonpositive += other.n_nonpositive
+        self.n_at_least_one += other.n_at_least_one
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+
+Data = Union[ArrayLike, Iterable[ArrayLike], SufficientStatistics]
+
+
+def statistics(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SufficientStatistics:
+    """
+    The :py:class:`SufficientStatistics` of ``data``: an array (read ``chunk_size`` values at a
+    time), an iterable of chunks, or statistics (returned unchanged).
+    """
+    if isinstance(data, SufficientStatistics):
+        return data
+    stats = SufficientStatistics()
+    if hasattr(data, "__array__") or isinstance(data, (list, tuple)):
+        array = np.asarray(data).ravel()
+        for start in range(0, array.size, chunk_size):
+            stats.update(array[start : start + chunk_size])
+    else:
+        for chunk in data:
+            stats.update(chunk)
+    return stats
+
+
+def norm(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> rv_frozen:
+    """Fit a normal distribution to ``data``."""
+    stats = _statistics(data, chunk_size)
+    return construct_norm(stats.moments.mean(), stats.moments.std())
+
+
+def lognorm(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> rv_frozen:
+    """Fit a log-normal distribution (with ``loc=0``) to positive ``data``."""
+    stats = _statistics(data, chunk_size)
+    _check_positive(stats, "log-normal")
+    return construct_lognorm(mu=stats.log_moments.mean(), sigma=stats.log_moments.std())
+
+
+def uniform(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> rv_frozen:
+    """Fit a uniform distribution to ``data``: its bounds are the minimum and maximum."""
+    stats = _statistics(data, chunk_size)
+    return construct_uniform(stats.min, stats.max)
+
+
+def loguniform(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> rv_frozen:
+    """Fit a log-uniform distribution to positive ``data``: its bounds are the extrema."""
+    stats = _statistics(data, chunk_size)
+    _check_positive(stats, "log-uniform")
+    return construct_loguniform(stats.min, stats.max)
+
+
+def beta(data: Data, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> rv_frozen:
+    """Fit a beta distribution (with ``loc=0`` and ``scale=1``) to ``data`` in (0, 1)."""
+    stats = _statistics(data, chunk_size)
+    if stats.n_nonpositive or stats.n_at_least_one:
+        raise ValueError(
+            f"A beta distribution needs data strictly between 0 and 1. "
+            f"{stats.n_nonpositive + stats.n_at_least_one} of {stats.n} values are not."
+        )
+    alpha, beta_ = params_from_log_means(stats.log_moments.mean(), stats.sum_log1m / stats.n)
+    return construct_beta(alpha, beta_)
+
+
+def _statistics(data: Data, chunk_size: int) -> SufficientStatistics:
+    stats = statistics(data, chunk_size=chunk_size)
+    if stats.n < 2:
+        raise ValueError(f"At least 2 values are needed to fit, got {stats.n}.")
+    if stats.min == stats.max:
+        raise ValueError(f"All values are equal to {stats.min}. Use a certainty instead.")
+    return stats
+
+
+def _check_positive(stats: SufficientStatistics, family: str):
+    if stats.n_nonpositive:
+        raise ValueError(
+            f"A {family} distribution needs positive data. "
+            f"{stats.n_nonpositive} of {stats.n} values are not."
+        )
@@ -0,0 +1,94 @@
+from functools import cached_property, lru_cache
+
+import numpy as np
+import pandas as pd
+import scipy
+from copula_wrapper import CopulaJoint
+
+from rvtools._random import check_random_state
+
+
+class ImanConoverJoint(CopulaJoint):
+    """
+    A joint distribution with the same arguments as ``CopulaJoint``, which draws random samples
+    with the `Iman-Conover method <https://doi.org/10.1080/03610918208812265>`_ instead of
+    transforming draws from the Gaussian copula.
+
+    Each marginal is sampled independently (using its own, typically fast, sampler). The samples
+    are then reordered so that their ranks follow a matrix of normal scores whose correlation
+    matrix is exactly that of the Gaussian copula. The rank correlations of the result therefore
+    match those of the ``CopulaJoint`` closely (but not exactly), while the marginal samples are
+    exact. This is much faster for large numbers of marginals.
+
+    Only ``rvs`` differs from ``CopulaJoint``. ``pdf``, ``cdf`` and ``logpdf`` are those of the
+    Gaussian copula.
+
+    Examples
+    --------
+
+    >>> import scipy
+    >>> from rvtools.construct import ImanConoverJoint, uniform, lognorm
+    >>> marginals = {"a": uniform(0, 1), "b": lognorm(mu=0, sigma=1)}
+    >>> dist = ImanConoverJoint(marginals, kendall_tau={("a", "b"): 0.5})
+    >>> sample = dist.rvs(10_000, random_state=0)
+    >>> round(scipy.stats.kendalltau(sample["a"], sample["b"])[0], 1)
+    0.5
+    """
+
+    def rvs(self, size=1, random_state=None):
+        rng = check_random_state(random_state)
+        marginals = self._wrapped.marginals
+        n_dims = len(marginals)
+
+        # One row per marginal, so that each marginal's scores are contiguous in memory
+        scores = np.empty((n_dims, size))
+        scores[:] = _normal_scores(size)
+        for row in scores:
+            # In place, and unlike ``permuted``, also available on a ``RandomState``
+            rng.shuffle(row)
+        if size > n_dims:
+            # Remove the spurious correlation of the random permutations, then impose the target.
+            # Every row is a permutation of the same standardized scores, so this is their
+            # correlation matrix.
+            achieved = np.linalg.cholesky(scores @ scores.T / size)
+            transform = scipy.linalg.solve_triangular(achieved.T, self._target_cholesky.T)
+            scores = transform.T @ scores
+
+        rows = np.empty((n_dims, size))
+        for j, marginal in enumerate(marginals):
+            sample = np.sort(marginal.rvs(size=size, random_state=rng))
+            # The k-th smallest score gets the k-th smallest sample
+            rows[j, np.argsort(scores[j])] = sample
+        array = rows.T
+
+        if self._idx_to_name:
+            return pd.DataFrame(array, columns=self._idx_to_name)
+        return array
+
+    @cached_property
+    def _target_cholesky(self):
+        return np.linalg.cholesky(self._wrapped.copula.corr)
+
+
+# Larger score arrays are recomputed on each call, rather than kept alive by the cache. Computing
+# them is cheap compared to sampling the marginals.
+_MAX_CACHED_SIZE = 2**16
+
+
+def _normal_scores(size) -> np.ndarray:
+    """Van der Waerden scores, standardized to have unit variance."""
+    if size <= _MAX_CACHED_SIZE:
+        return _cached_normal_scores(size)
+    return _compute_normal_scores(size)
+
+
+@lru_cache(maxsize=8)
+def _cached_normal_scores(size) -> np.ndarray:
+    return _compute_normal_scores(size)
+
+
+def _compute_normal_scores(size) -> np.ndarray:
+    scores = scipy.stats.norm.ppf(np.arange(1, size + 1) / (size + 1))
+    scores /= scores.std()
+    scores.flags.writeable = False
+    return scores
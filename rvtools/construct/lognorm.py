@@ -4,9 +4,11 @@ import numpy as np
 import scipy
 
 from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
 from rvtools.construct.norm import params_from_quantiles as norm_params_from_quantiles
 
 
+@memoized
 def lognorm(
     mu: Real = None,
     sigma: Real = None,
@@ -25,7 +27,7 @@ def lognorm(
 
     >>> from rvtools.construct import lognorm
     >>> lognorm(mu=1, sigma=2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     If two positional arguments are given, they are interpreted as ``mu`` and ``sigma``. **This is
     different from SciPy.**
@@ -33,14 +35,14 @@ def lognorm(
     2. Using ``mean`` and ``sd``:
 
     >>> lognorm(mean=1, sd=2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     3. Using quantiles:
 
     >>> lognorm(p5=0.1, p95=0.9) # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     >>> lognorm(quantiles={1/1000: 0.1, 999/1000: 0.9})  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     """
     spec = parse_spec(mu=mu, sigma=sigma, mean=mean, sd=sd, quantiles=quantiles, **kwargs)
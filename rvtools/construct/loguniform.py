@@ -5,8 +5,10 @@ import scipy
 from scipy.interpolate import interp1d
 
 from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
 
 
+@memoized
 def loguniform(a: Real = None, b: Real = None, *, quantiles: dict[Real, Real] = None, **kwargs):
     """
     Create a (frozen) SciPy log-uniform distribution.
@@ -17,14 +19,14 @@ def loguniform(a: Real = None, b: Real = None, *, quantiles: dict[Real, Real] =
 
     >>> from rvtools.construct import loguniform
     >>> loguniform(1, 2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     2. Using quantiles:
 
     >>> loguniform(p5=0.1, p95=0.9) # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     >>> loguniform(quantiles={1/1000: 0.1, 999/1000: 0.9})  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     """
     spec = parse_spec(a=a, b=b, quantiles=quantiles, **kwargs)
     if spec.keys() == {"a", "b"}:
@@ -0,0 +1,30 @@
+from numbers import Real
+from typing import Sequence
+
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.dists import Mixture
+from rvtools.memo import memoized
+
+
+@memoized
+def mixture(components: Sequence[rv_frozen], weights: Sequence[Real]) -> rv_frozen:
+    """
+    Create a (frozen) mixture of distributions.
+
+    With probability ``weights[i]``, a draw comes from ``components[i]``. See
+    :py:class:`rvtools.dists.Mixture` for details.
+
+    Examples
+    --------
+
+    30% chance of exactly 0, otherwise log-normal:
+
+    >>> from rvtools.construct import mixture, certainty, lognorm
+    >>> dist = mixture([certainty(0), lognorm(p5=1, p95=10)], [0.3, 0.7])
+    >>> float(dist.cdf(0))
+    0.3
+    >>> float(dist.mean()) == 0.7 * lognorm(p5=1, p95=10).mean()
+    True
+    """
+    return Mixture(components, weights).freeze()
@@ -3,8 +3,10 @@ from numbers import Real
 import scipy
 
 from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
 
 
+@memoized
 def norm(mean: Real = None, sd: Real = None, *, quantiles: dict[Real, Real] = None, **kwargs):
     """
     Create a (frozen) SciPy normal distribution.
@@ -15,14 +17,14 @@ def norm(mean: Real = None, sd: Real = None, *, quantiles: dict[Real, Real] = No
 
     >>> from rvtools.construct import norm
     >>> norm(1, 2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     2. Using quantiles:
 
     >>> norm(p5=0.1, p95=0.9) # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     >>> norm(quantiles={1/1000: 0.1, 999/1000: 0.9})  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     """
     spec = parse_spec(mean=mean, sd=sd, quantiles=quantiles, **kwargs)
     if spec.keys() == {"mean", "sd"}:
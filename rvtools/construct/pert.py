@@ -1,8 +1,28 @@
+from numbers import Real
+from typing import NamedTuple
+
+import numpy as np
+import scipy
 from betapert import mpert
+from numpy.typing import ArrayLike
 from scipy.stats.distributions import rv_frozen
 
+from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
+
+DEFAULT_LAMBD = 4
+
 
-def pert(mini, mode, maxi, lambd=4) -> rv_frozen:
+@memoized
+def pert(
+    mini: Real = None,
+    mode: Real = None,
+    maxi: Real = None,
+    lambd: Real = None,
+    *,
+    quantiles: dict[Real, Real] = None,
+    **kwargs,
+) -> rv_frozen:
     """
     Create a (frozen) PERT or modified PERT distribution.
 
@@ -12,9 +32,9 @@ def pert(mini, mode, maxi, lambd=4) -> rv_frozen:
     This is a simple wrapper function that fixes this by accepting ``lambd`` as an optional
     argument with a default of 4, which corresponds to the original PERT distribution.
 
+    You can specify the parameters in one of two ways.
 
-    Examples
-    --------
+    1. Using ``mini``, ``mode``, ``maxi`` and optionally ``lambd``:
 
     >>> from rvtools.construct import pert
     >>> d1 = pert(0, 3, 12)
@@ -22,5 +42,216 @@ def pert(mini, mode, maxi, lambd=4) -> rv_frozen:
     >>> d1.ppf(0.9)  == d2.ppf(0.9)
     True
 
+    2. Using quantiles, optionally together with some of the parameters, which are then held
+    fixed. ``lambd`` is also fitted if there are enough quantiles, and is 4 otherwise:
+
+    >>> d = pert(p5=1, p50=3, p95=8)
+    >>> [round(float(x), 6) for x in d.ppf([0.05, 0.5, 0.95])]
+    [1.0, 3.0, 8.0]
+    >>> d = pert(p5=0.665, p25=1.6, p50=2.556, p95=5.504)  # Also fits lambd
+    >>> [round(float(x)) for x in d.args + (d.kwds["lambd"],)]
+    [0, 2, 10, 6]
+    >>> d = pert(mini=0, p50=3, p95=8)
+
+    See :py:func:`params_from_quantiles` to fit many PERT distributions at once.
+    """
+    spec = parse_spec(mini=mini, mode=mode, maxi=maxi, lambd=lambd, quantiles=quantiles, **kwargs)
+    if "quantiles" in spec:
+        return from_quantiles(spec["quantiles"], mini=mini, mode=mode, maxi=maxi, lambd=lambd)
+    elif spec.keys() - {"lambd"} == {"mini", "mode", "maxi"}:
+        return mpert(mini, mode, maxi, lambd=DEFAULT_LAMBD if lambd is None else lambd)
+    else:
+        raise ValueError("You must specify either 'mini', 'mode' and 'maxi', or 'quantiles'.")
+
+
+def from_quantiles(
+    quantiles: dict[Real, Real],
+    *,
+    mini: Real = None,
+    mode: Real = None,
+    maxi: Real = None,
+    lambd: Real = None,
+) -> rv_frozen:
+    fixed = {"mini": mini, "mode": mode, "maxi": maxi, "lambd": lambd}
+    n_free = sum(value is None for value in fixed.values())
+    if lambd is None and len(quantiles) < n_free:
+        fixed["lambd"] = DEFAULT_LAMBD
+        n_free -= 1
+    if len(quantiles) < n_free:
+        raise ValueError(
+            f"Expected at least {n_free} quantiles to fit {n_free} parameters, "
+            f"got {len(quantiles)}."
+        )
+
+    fit = params_from_quantiles(list(quantiles.keys()), list(quantiles.values()), **fixed)
+    exact = len(quantiles) == n_free
+    if not fit.converged[0] or (exact and fit.residual[0] > 1e-6):
+        raise ValueError(
+            f"Could not fit PERT distribution to quantiles {quantiles}. "
+            f"The fitted quantiles differ by {fit.residual[0]:.2g} (relative to their range)."
+        )
+    return mpert(
+        float(fit.mini[0]), float(fit.mode[0]), float(fit.maxi[0]), lambd=float(fit.lambd[0])
+    )
+
+
+class PertFit(NamedTuple):
+    mini: np.ndarray
+    mode: np.ndarray
+    maxi: np.ndarray
+    lambd: np.ndarray
+    #: Whether the solver converged, either to an exact fit or to a least-squares optimum
+    converged: np.ndarray
+    #: Number of iterations of the solver
+    iterations: np.ndarray
+    #: Largest absolute error of the fitted quantiles, relative to the range of the targets
+    residual: np.ndarray
+
+
+def params_from_quantiles(
+    ps: ArrayLike,
+    xs: ArrayLike,
+    *,
+    mini: ArrayLike = None,
+    mode: ArrayLike = None,
+    maxi: ArrayLike = None,
+    lambd: ArrayLike = None,
+    max_iter: int = 200,
+    tol: float = 1e-12,
+) -> PertFit:
+    """
+    Find parameters of modified PERT distributions such that ``ppf(ps) = xs``, for a batch of
+    distributions at once.
+
+    :param ps:
+        Probabilities, of shape ``(n_dists, n_quantiles)`` or ``(n_quantiles,)`` (for a single
+        distribution, or the same probabilities for all distributions).
+    :param xs: Values of the quantiles, with the same shape as ``ps`` (or broadcastable to it).
+    :param mini, mode, maxi, lambd:
+        Parameters to hold fixed, if any (scalars, or arrays of shape ``(n_dists,)``).
+    :return: Arrays of shape ``(n_dists,)``.
+
+    The parameters are found by least squares on the quantiles, with the Levenberg-Marquardt
+    algorithm (the quantile function is ``mini + (maxi - mini) * betaincinv(alpha, beta, p)``).
+    All distributions in the batch are solved simultaneously with array operations. With more
+    quantiles than free parameters, the fit is a least-squares compromise, so check
+    ``residual``.
+
+    >>> fit = params_from_quantiles([0.05, 0.5, 0.95], [[1, 3, 8], [0, 10, 15]], lambd=4)
+    >>> fit.converged.tolist()
+    [True, True]
+    >>> fit.mode.round(3).tolist()
+    [1.098, 13.084]
+    >>> bool(fit.residual.max() < 1e-9)
+    True
     """
-    return mpert(mini, mode, maxi, lambd=lambd)
+    ps, xs = np.broadcast_arrays(np.atleast_2d(ps), np.atleast_2d(xs))
+    ps, xs = ps.astype(float), xs.astype(float)
+    n_dists = len(xs)
+
+    # Work in standardized units, so that tolerances and finite differences are relative
+    center = xs.mean(axis=1)
+    spread = np.ptp(xs, axis=1)
+    spread = np.where(spread > 0, spread, 1)
+    targets = (xs - center[:, None]) / spread[:, None]
+
+    # Parameters: mini, mode, maxi and log(lambd)
+    fixed_values = [mini, mode, maxi, None if lambd is None else np.log(lambd)]
+    is_fixed = np.array([value is not None for value in fixed_values])
+    params = _initial_params(ps, targets)
+    for j, value in enumerate(fixed_values):
+        if value is not None:
+            params[:, j] = np.broadcast_to(value, n_dists)
+            if j < 3:
+                params[:, j] = (params[:, j] - center) / spread
+
+    def residuals(params):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return _quantiles(ps, params) - targets
+
+    def cost(params, r):
+        feasible = (params[:, 0] <= params[:, 1]) & (params[:, 1] <= params[:, 2])
+        feasible &= params[:, 0] < params[:, 2]
+        c = np.sum(r**2, axis=1)
+        return np.where(feasible & np.isfinite(c), c, np.inf)
+
+    r = residuals(params)
+    current_cost = cost(params, r)
+    damping = np.full(n_dists, 1e-3)
+    active = np.ones(n_dists, dtype=bool)
+    converged = np.zeros(n_dists, dtype=bool)
+    iterations = np.zeros(n_dists, dtype=int)
+    step_size = 1e-7
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        iterations += active
+
+        # Forward-difference Jacobian
+        jacobian = np.empty(r.shape + (4,))
+        for j in range(4):
+            shifted = params.copy()
+            shifted[:, j] += step_size
+            jacobian[:, :, j] = (residuals(shifted) - r) / step_size
+        jacobian[:, :, is_fixed] = 0
+        jacobian = np.nan_to_num(jacobian)
+
+        gradient = np.einsum("bkm,bk->bm", jacobian, r)
+        hessian = np.einsum("bkm,bkn->bmn", jacobian, jacobian)
+        diagonal = np.diagonal(hessian, axis1=1, axis2=2)
+        regularization = damping[:, None] * (diagonal + 1e-9 * diagonal.max(axis=1, keepdims=True))
+        regularization = regularization + is_fixed
+        system = hessian + regularization[:, :, None] * np.eye(4)
+        step = -np.linalg.solve(system, gradient[:, :, None])[:, :, 0]
+        step[:, is_fixed] = 0
+
+        candidate = params + step
+        candidate_r = residuals(candidate)
+        candidate_cost = cost(candidate, candidate_r)
+        better = active & (candidate_cost < current_cost)
+
+        params[better] = candidate[better]
+        r[better] = candidate_r[better]
+        current_cost[better] = candidate_cost[better]
+        damping = np.where(better, damping / 3, damping * 2)
+
+        exact = np.max(np.abs(r), axis=1) < tol
+        stationary = better & (np.max(np.abs(step), axis=1) < tol)
+        stationary |= np.max(np.abs(gradient), axis=1) < tol
+        done = active & (exact | stationary | (damping > 1e12))
+        converged |= done & (exact | stationary)
+        active &= ~done
+
+    params[:, :3] = params[:, :3] * spread[:, None] + center[:, None]
+    return PertFit(
+        mini=params[:, 0],
+        mode=params[:, 1],
+        maxi=params[:, 2],
+        lambd=np.exp(params[:, 3]),
+        converged=converged,
+        iterations=iterations,
+        residual=np.max(np.abs(r), axis=1),
+    )
+
+
+def _quantiles(ps: np.ndarray, params: np.ndarray) -> np.ndarray:
+    mini, mode, maxi, log_lambd = (params[:, [j]] for j in range(4))
+    width = maxi - mini
+    lambd = np.exp(log_lambd)
+    alpha = 1 + (mode - mini) * lambd / width
+    beta = 1 + (maxi - mode) * lambd / width
+    return mini + width * scipy.special.betaincinv(alpha, beta, ps)
+
+
+def _initial_params(ps: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    """Extrapolate linearly to the bounds, with the mode at the quantile closest to the median."""
+    order = np.argsort(ps, axis=1)
+    ps, xs = np.take_along_axis(ps, order, axis=1), np.take_along_axis(xs, order, axis=1)
+    p_lo, p_hi, x_lo, x_hi = ps[:, 0], ps[:, -1], xs[:, 0], xs[:, -1]
+    slope = (x_hi - x_lo) / np.maximum(p_hi - p_lo, 1e-3)
+    mini = x_lo - p_lo * slope
+    maxi = x_hi + (1 - p_hi) * slope
+    middle = xs[np.arange(len(xs)), np.argmin(np.abs(ps - 0.5), axis=1)]
+    mode = np.clip(middle, mini + 0.05 * (maxi - mini), maxi - 0.05 * (maxi - mini))
+    return np.stack([mini, mode, maxi, np.full(len(xs), np.log(DEFAULT_LAMBD))], axis=1)
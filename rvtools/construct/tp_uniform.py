@@ -1,9 +1,24 @@
+from numbers import Real
+
+import numpy as np
+from numpy.typing import ArrayLike
 from scipy.stats.distributions import rv_frozen
 
 import rvtools.dists
+from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
 
 
-def tp_uniform(mini, mode, maxi, psep=0.5) -> rv_frozen:
+@memoized
+def tp_uniform(
+    mini: Real = None,
+    mode: Real = None,
+    maxi: Real = None,
+    psep: Real = None,
+    *,
+    quantiles: dict[Real, Real] = None,
+    **kwargs,
+) -> rv_frozen:
     """
     Create a (frozen) two-piece uniform distribution.
 
@@ -13,8 +28,9 @@ def tp_uniform(mini, mode, maxi, psep=0.5) -> rv_frozen:
     This is a simple wrapper function that fixes this by accepting ``psep`` as an optional
     argument with a default of 0.5, which corresponds to a ``halves_uniform`` distribution.
 
-    Examples
-    --------
+    You can specify the parameters in one of two ways.
+
+    1. Using ``mini``, ``mode``, ``maxi`` and optionally ``psep``:
 
     >>> from rvtools.construct import tp_uniform
     >>> d1 = tp_uniform(0, 3, 12)
@@ -22,5 +38,55 @@ def tp_uniform(mini, mode, maxi, psep=0.5) -> rv_frozen:
     >>> d1.ppf(0.9)  == d2.ppf(0.9)
     True
 
+    2. Using exactly three quantiles. The middle one is the boundary between the two pieces:
+
+    >>> d = tp_uniform(p10=1, p50=3, p90=11)
+    >>> d.support()
+    (0.5, 13.0)
+    >>> d.ppf([0.1, 0.5, 0.9])
+    array([ 1.,  3., 11.])
     """
-    return rvtools.dists.tp_uniform(mini, mode, maxi, psep=psep)
+    spec = parse_spec(mini=mini, mode=mode, maxi=maxi, psep=psep, quantiles=quantiles, **kwargs)
+    if spec.keys() == {"quantiles"}:
+        return from_quantiles(spec["quantiles"])
+    elif spec.keys() - {"psep"} == {"mini", "mode", "maxi"}:
+        return rvtools.dists.tp_uniform(mini, mode, maxi, psep=0.5 if psep is None else psep)
+    else:
+        raise ValueError("You must specify either 'mini', 'mode' and 'maxi', or 'quantiles'.")
+
+
+def from_quantiles(quantiles: dict[Real, Real]) -> rv_frozen:
+    if len(quantiles) != 3:
+        raise ValueError(f"Expected exactly three quantiles, got {len(quantiles)}.")
+    mini, sep, maxi, psep = params_from_quantiles(list(quantiles.keys()), list(quantiles.values()))
+    return rvtools.dists.tp_uniform(float(mini), float(sep), float(maxi), psep=float(psep))
+
+
+def params_from_quantiles(ps: ArrayLike, xs: ArrayLike) -> tuple[np.ndarray, ...]:
+    """
+    Find parameters ``(mini, sep, maxi, psep)`` of two-piece uniform distributions such that
+    ``ppf(ps) = xs``, in closed form.
+
+    ``ps`` and ``xs`` have three quantiles along their last axis, and may have any number of
+    leading (batch) dimensions. The middle quantile is taken as the boundary ``sep`` between the
+    pieces, and each piece is extended linearly to its bound.
+
+    >>> params_from_quantiles([0.1, 0.5, 0.9], [[1, 2, 3], [0, 1, 5]])
+    (array([ 0.75, -0.25]), array([2., 1.]), array([3.25, 6.  ]), array([0.5, 0.5]))
+    """
+    ps, xs = np.broadcast_arrays(np.asarray(ps, dtype=float), np.asarray(xs, dtype=float))
+    if ps.shape[-1] != 3:
+        raise ValueError(f"Expected exactly three quantiles, got {ps.shape[-1]}.")
+    order = np.argsort(ps, axis=-1)
+    ps, xs = np.take_along_axis(ps, order, axis=-1), np.take_along_axis(xs, order, axis=-1)
+    p_lo, psep, p_hi = np.moveaxis(ps, -1, 0)
+    x_lo, sep, x_hi = np.moveaxis(xs, -1, 0)
+
+    if not (np.all(p_lo < psep) and np.all(psep < p_hi)):
+        raise ValueError("The probabilities of the quantiles must be distinct.")
+    if not (np.all(x_lo <= sep) and np.all(sep <= x_hi)):
+        raise ValueError("The values of the quantiles must increase with their probabilities.")
+
+    mini = sep - psep * (sep - x_lo) / (psep - p_lo)
+    maxi = sep + (1 - psep) * (x_hi - sep) / (p_hi - psep)
+    return mini, sep, maxi, psep
@@ -4,8 +4,10 @@ import scipy
 from scipy.interpolate import interp1d
 
 from rvtools.construct._helpers import parse_spec
+from rvtools.memo import memoized
 
 
+@memoized
 def uniform(a: Real = None, b: Real = None, *, quantiles: dict[Real, Real] = None, **kwargs):
     """
     Create a (frozen) SciPy uniform distribution.
@@ -16,7 +18,7 @@ def uniform(a: Real = None, b: Real = None, *, quantiles: dict[Real, Real] = Non
 
     >>> from rvtools.construct import uniform
     >>> uniform(1, 2)  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
 
     If two positional arguments are given, they are interpreted as ``a`` and ``b``. **This is
     different from SciPy.**
@@ -24,9 +26,9 @@ def uniform(a: Real = None, b: Real = None, *, quantiles: dict[Real, Real] = Non
     2. Using quantiles:
 
     >>> uniform(p5=0.1, p95=0.9) # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     >>> uniform(quantiles={1/1000: 0.1, 999/1000: 0.9})  # doctest: +ELLIPSIS
-    <scipy.stats._distn_infrastructure.rv_continuous_frozen object at 0x...>
+    <rvtools.memo.CachedFrozen object at 0x...>
     """
     spec = parse_spec(a=a, b=b, quantiles=quantiles, **kwargs)
     if spec.keys() == {"a", "b"}:
@@ -0,0 +1,101 @@
+"""
+The distribution of a sum of independent random variables, computed numerically (without
+sampling) by discretizing each distribution and convolving with the FFT.
+
+This is useful when there is no closed form (see :py:mod:`rvtools.propagate` for the cases where
+there is one). The result is deterministic, and for sums of a few dozen terms, much more accurate
+than Monte Carlo at a fraction of the cost.
+
+Examples
+--------
+
+>>> from rvtools.construct import beta, pert, tp_uniform
+>>> from rvtools.convolve import convolve
+>>> terms = [pert(0, 3, 12), tp_uniform(0, 1, 5, 0.3), beta(2, 5)]
+>>> dist = convolve(*terms)
+>>> round(float(dist.mean()), 4) == round(sum(t.mean() for t in terms), 4)
+True
+"""
+import numpy as np
+import scipy
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.dists import certainty
+
+# Probability in each tail outside the bulk of a distribution, which sets the grid spacing
+_BULK = 0.01
+
+
+def convolve(
+    *dists: rv_frozen, n_points: int = 2**16, tail: float = 1e-10, max_points: int = 2**22
+) -> rv_frozen:
+    """
+    The distribution of the sum of independent ``dists``.
+
+    All distributions are discretized on grids with the same spacing, which is chosen from their
+    quantiles rather than their extremes: the bulk of each distribution (between its 1% and 99%
+    quantiles) spans about ``n_points`` points in total, so a heavy tail does not make the grid
+    too coarse to resolve the bulk. Each grid covers the distribution down to its ``tail`` and
+    up to its ``1 - tail`` quantile. If that would take more than ``max_points`` points (e.g. for
+    a wide log-normal), the tails are cut at larger probabilities until it does not. The
+    probability in the tails is not lost: it is assigned to the first and last grid points.
+    Heavy tails cut this way make the ``cdf`` and ``ppf`` slightly inaccurate in the far tails,
+    and the moments too low. Each grid point gets the probability of the cell centered on it, so
+    point masses like :py:obj:`rvtools.dists.certainty` are handled exactly.
+
+    The result is returned as a (frozen) piecewise-uniform distribution with one piece per grid
+    cell (``scipy.stats.rv_histogram``), so its ``cdf`` and ``ppf`` are vectorized and cheap.
+
+    :param n_points: Resolution of the grid.
+    :param tail: Probability cut off in each tail.
+    :param max_points: Maximum size of the grid of the sum.
+    """
+    if not dists:
+        raise ValueError("Must provide at least one distribution.")
+
+    bulk_width = sum(hi - lo for lo, hi in (_bounds(d, _BULK) for d in dists))
+    bounds = [_bounds(d, tail) for d in dists]
+    total_width = sum(hi - lo for lo, hi in bounds)
+    if total_width == 0:
+        return certainty(sum(lo for lo, _ in bounds))
+    step = (bulk_width or total_width) / n_points
+    while total_width / step > max_points and tail < _BULK:
+        tail *= 10
+        bounds = [_bounds(d, tail) for d in dists]
+        total_width = sum(hi - lo for lo, hi in bounds)
+    start = sum(lo for lo, _ in bounds)
+
+    lattices = [_discretize(d, lo, hi, step) for d, (lo, hi) in zip(dists, bounds)]
+    masses = _fft_convolve(lattices)
+
+    # The sum takes value ``start + j * step`` with probability ``masses[j]``. Spread that
+    # probability uniformly over the cell centered on each value.
+    edges = start + (np.arange(masses.size + 1) - 0.5) * step
+    return scipy.stats.rv_histogram((masses, edges), density=False).freeze()
+
+
+def _bounds(dist: rv_frozen, tail: float) -> tuple[float, float]:
+    """The ``tail`` and ``1 - tail`` quantiles, within the support."""
+    lo, hi = dist.support()
+    lo, hi = max(lo, dist.ppf(tail)), min(hi, dist.isf(tail))
+    return float(lo), float(max(lo, hi))
+
+
+def _discretize(dist: rv_frozen, lo: float, hi: float, step: float) -> np.ndarray:
+    """Probability of each cell of width ``step`` centered on ``lo, lo + step, ...``."""
+    n_cells = max(int(np.ceil((hi - lo) / step)), 0) + 1
+    inner_edges = lo + (np.arange(n_cells - 1) + 0.5) * step
+    cdf = np.concatenate([[0], dist.cdf(inner_edges), [1]])
+    return np.diff(cdf)
+
+
+def _fft_convolve(lattices: list[np.ndarray]) -> np.ndarray:
+    size = sum(lattice.size - 1 for lattice in lattices) + 1
+    n_fft = scipy.fft.next_fast_len(size, real=True)
+    spectrum = np.ones(n_fft // 2 + 1, dtype=complex)
+    for lattice in lattices:
+        spectrum *= scipy.fft.rfft(lattice, n_fft)
+    masses = scipy.fft.irfft(spectrum, n_fft)[:size]
+    # Round-off in the FFT can produce tiny negative values
+    masses = np.clip(masses, 0, None)
+    return masses / masses.sum()
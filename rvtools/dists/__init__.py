@@ -2,6 +2,8 @@
 from rvtools.dists.gen.tp_uniform import TwoPieceUniform
 from rvtools.dists.gen.halves_uniform import HalvesUniform
 from rvtools.dists.gen.certainty import Certainty
+from rvtools.dists.gen.mixture import Mixture
+from rvtools.dists.gen.empirical import Empirical
 from betapert import pert, mpert  # noqa
 
 # These being instances, not classes, is not IMO idiomatic Python, but it's core to the way SciPy's
@@ -0,0 +1,203 @@
+"""
+Array kernels for the two-piece uniform distribution (and so the halves uniform): ``pdf``,
+``cdf``, ``ppf`` and sampling.
+
+There are two backends:
+
+- ``"numba"``, used if `numba <https://numba.pydata.org>`_ is installed: compiled loops that
+  make a single pass over the data, computing each element's piece and value together (without
+  temporary arrays), in parallel over the available cores. They are compiled on first use.
+- ``"numpy"``: the same computations as NumPy array expressions.
+
+Set the environment variable ``RVTOOLS_KERNELS=numpy`` to use NumPy even if numba is installed.
+
+Parameters broadcast against ``x`` (or ``q``) like NumPy arguments. SciPy usually passes them as
+arrays of size 1, which the numba loops read without broadcasting them to the size of ``x``.
+(:py:class:`rvtools.dists.Certainty` needs no kernels: its methods are single NumPy calls.)
+
+Examples
+--------
+
+>>> from rvtools.dists.gen import _kernels
+>>> _kernels.ppf([0.05, 0.5, 0.95], 0, 1, 3, 0.1)
+array([0.5       , 1.88888889, 2.88888889])
+"""
+import importlib.util
+import os
+
+import numpy as np
+
+BACKENDS = ("numba", "numpy")
+
+
+def available_backends() -> list[str]:
+    numba = importlib.util.find_spec("numba") is not None
+    return [backend for backend in BACKENDS if backend != "numba" or numba]
+
+
+def default_backend() -> str:
+    if os.environ.get("RVTOOLS_KERNELS") == "numpy":
+        return "numpy"
+    return available_backends()[0]
+
+
+def pdf(x, mini, sep, maxi, psep=0.5, *, backend: str = None) -> np.ndarray:
+    return _apply("pdf", backend, x, mini, sep, maxi, psep)
+
+
+def cdf(x, mini, sep, maxi, psep=0.5, *, backend: str = None) -> np.ndarray:
+    return _apply("cdf", backend, x, mini, sep, maxi, psep)
+
+
+def ppf(q, mini, sep, maxi, psep=0.5, *, backend: str = None) -> np.ndarray:
+    return _apply("ppf", backend, q, mini, sep, maxi, psep)
+
+
+def rvs(mini, sep, maxi, psep=0.5, size=None, random_state=None, *, backend: str = None):
+    """
+    ``ceil(size * psep)`` samples from the uniform distribution on ``[mini, sep]``, followed by
+    the rest from the uniform distribution on ``[sep, maxi]``. The standard uniforms are drawn in
+    one call, and transformed in place.
+    """
+    if size is not None:
+        if len(size) == 1:  # Caller will give this as (size,)
+            size = size[0]
+        else:
+            raise NotImplementedError("size must be a scalar for TwoPieceUniform")
+    mini, sep, maxi, psep = (float(np.asarray(a).item()) for a in (mini, sep, maxi, psep))
+    size_left = int(np.ceil(size * psep))
+
+    if random_state is None:
+        random_state = np.random.mtrand._rand
+    out = random_state.uniform(size=size)
+    if _backend(backend) == "numba":
+        _compiled()["rvs"](out, size_left, mini, sep, maxi)
+    else:
+        left, right = out[:size_left], out[size_left:]
+        left *= sep - mini
+        left += mini
+        right *= maxi - sep
+        right += sep
+    return out
+
+
+def _backend(backend):
+    backend = default_backend() if backend is None else backend
+    if backend not in available_backends():
+        raise ValueError(
+            f"Backend {backend!r} is not available. Choose from {available_backends()}."
+        )
+    return backend
+
+
+def _apply(kernel: str, backend, x, *params) -> np.ndarray:
+    x, *params = (np.asarray(a, dtype=float) for a in (x, *params))
+    if _backend(backend) == "numpy":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _NUMPY[kernel](x, *params)
+
+    shape = np.broadcast_shapes(x.shape, *(p.shape for p in params))
+    # Size-1 parameters are read as scalars by the loops, so only others are broadcast
+    x, *params = (
+        _read_only(a if a.size == 1 and a is not x else np.broadcast_to(a, shape))
+        for a in (x, *params)
+    )
+    out = np.empty(x.size)
+    _compiled()[kernel](x, *params, out)
+    return out.reshape(shape)
+
+
+def _read_only(a: np.ndarray) -> np.ndarray:
+    """
+    A flat view (or copy) of ``a`` that numba accepts without warnings, even if ``a`` comes from
+    ``np.broadcast_arrays``, as SciPy's arguments do.
+    """
+    a = a.reshape(-1).view()
+    a.flags.writeable = False
+    return a
+
+
+def _numpy_pdf(x, mini, sep, maxi, psep):
+    left = (mini <= x) & (x <= sep)
+    right = (sep <= x) & (x <= maxi)
+    left_density = psep * (1 / (sep - mini))
+    right_density = (1 - psep) * (1 / (maxi - sep))
+    return np.where(left, left_density, np.where(right, right_density, 0.0))
+
+
+def _numpy_cdf(x, mini, sep, maxi, psep):
+    left = psep * ((x - mini) / (sep - mini))
+    right = psep + (1 - psep) * ((x - sep) / (maxi - sep))
+    return np.where(x < mini, 0.0, np.where(x < sep, left, np.where(x < maxi, right, 1.0)))
+
+
+def _numpy_ppf(q, mini, sep, maxi, psep):
+    left = mini + q / psep * (sep - mini)
+    right = sep + (q - psep) / (1 - psep) * (maxi - sep)
+    inside = (0 <= q) & (q <= 1)
+    return np.where(inside, np.where(q < psep, left, right), np.nan)
+
+
+_NUMPY = {"pdf": _numpy_pdf, "cdf": _numpy_cdf, "ppf": _numpy_ppf}
+_NUMBA = {}
+
+
+def _compiled() -> dict:
+    """The numba kernels, compiled on first use."""
+    if _NUMBA:
+        return _NUMBA
+    import numba
+
+    # NumPy's semantics for division by zero (``inf`` or ``nan``), rather than Python's exception
+    jit = numba.njit(parallel=True, cache=True, error_model="numpy")
+    inline = numba.njit(inline="always", error_model="numpy")
+
+    @inline
+    def at(array, i):
+        return array[i] if array.size > 1 else array[0]
+
+    @jit
+    def pdf_loop(x, mini, sep, maxi, psep, out):
+        for i in numba.prange(x.size):
+            xi, a, s, b, p = x[i], at(mini, i), at(sep, i), at(maxi, i), at(psep, i)
+            if a <= xi <= s:
+                out[i] = p * (1 / (s - a))
+            elif s <= xi <= b:
+                out[i] = (1 - p) * (1 / (b - s))
+            else:
+                out[i] = 0.0
+
+    @jit
+    def cdf_loop(x, mini, sep, maxi, psep, out):
+        for i in numba.prange(x.size):
+            xi, a, s, b, p = x[i], at(mini, i), at(sep, i), at(maxi, i), at(psep, i)
+            if xi < a:
+                out[i] = 0.0
+            elif xi < s:
+                out[i] = p * ((xi - a) / (s - a))
+            elif xi < b:
+                out[i] = p + (1 - p) * ((xi - s) / (b - s))
+            else:
+                out[i] = 1.0
+
+    @jit
+    def ppf_loop(q, mini, sep, maxi, psep, out):
+        for i in numba.prange(q.size):
+            qi, a, s, b, p = q[i], at(mini, i), at(sep, i), at(maxi, i), at(psep, i)
+            if 0 <= qi < p:
+                out[i] = a + qi / p * (s - a)
+            elif p <= qi <= 1:
+                out[i] = s + (qi - p) / (1 - p) * (b - s)
+            else:
+                out[i] = np.nan
+
+    @jit
+    def rvs_loop(out, size_left, mini, sep, maxi):
+        for i in numba.prange(out.size):
+            if i < size_left:
+                out[i] = mini + (sep - mini) * out[i]
+            else:
+                out[i] = sep + (maxi - sep) * out[i]
+
+    _NUMBA.update(pdf=pdf_loop, cdf=cdf_loop, ppf=ppf_loop, rvs=rvs_loop)
+    return _NUMBA
@@ -40,6 +40,14 @@ class Certainty(scipy.stats.rv_continuous):
     def _rvs(self, value, size=None, random_state=None):
         return np.full(size, value)
 
+    def _stats(self, value):
+        # SciPy's generic methods integrate the pdf numerically, which fails for a point mass.
+        # Higher moments are computed by SciPy from ``_munp``.
+        return value, 0.0, None, None
+
+    def _munp(self, n, value):
+        return value**n
+
 
 # These being instances, not a classes, is not IMO idiomatic Python, but it's core to the way SciPy's
 # ``rv_continuous`` class works. See examples of how SciPy defines their distributions in
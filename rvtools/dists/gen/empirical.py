@@ -0,0 +1,103 @@
+import numpy as np
+import scipy
+
+from rvtools.summary import Moments
+
+# Number of samples processed at a time when scanning a (possibly memory-mapped) array
+CHUNK_SIZE = 10_000_000
+
+
+class Empirical(scipy.stats.rv_continuous):
+    """
+    A continuous distribution defined by samples, whose quantile function linearly interpolates
+    between the sorted samples (like ``numpy.quantile`` with the default ``method="linear"``).
+
+    ``cdf`` and ``ppf`` take ``O(log n)`` time per point (by binary search), and random variates
+    are drawn by interpolating between samples at uniformly random (fractional) indices.
+
+    :param samples:
+        The samples. May be a memory-mapped array (see ``numpy.load`` with ``mmap_mode``), in which
+        case it is never loaded into memory in full.
+    :param assume_sorted:
+        If ``True``, ``samples`` must already be sorted in ascending order, and are not copied.
+        Otherwise, a sorted copy is made.
+
+    The mean, variance, skewness and kurtosis are those of the samples. They are computed once,
+    in a single pass.
+
+    Unlike most distributions in this subpackage, the parameters are given when creating the
+    instance (like ``scipy.stats.rv_histogram``).
+
+    Examples
+    --------
+    >>> from rvtools.dists import Empirical
+    >>> dist = Empirical([3, 1, 2, 4, 5])
+    >>> float(dist.ppf(0.5)), float(dist.cdf(2.5))
+    (3.0, 0.375)
+    """
+
+    def __init__(self, samples, *args, assume_sorted=False, moments=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if assume_sorted:
+            self._sorted = samples
+        else:
+            self._sorted = np.sort(np.asarray(samples).ravel())
+        if self._sorted.size < 2:
+            raise ValueError("Must provide at least two samples.")
+
+        if moments is None:
+            moments = Moments()
+            for start in range(0, self._sorted.size, CHUNK_SIZE):
+                moments.update(self._sorted[start : start + CHUNK_SIZE])
+        self._moments = moments
+
+        self.a = float(self._sorted[0])
+        self.b = float(self._sorted[-1])
+
+    def _updated_ctor_param(self):
+        # Frozen distributions re-create their ``dist`` from these, see ``rv_frozen.__init__``.
+        # Pass everything we already computed, so that freezing is cheap.
+        dct = super()._updated_ctor_param()
+        dct["samples"] = self._sorted
+        dct["assume_sorted"] = True
+        dct["moments"] = self._moments
+        return dct
+
+    def _cdf(self, x):
+        n = self._sorted.size
+        i = np.clip(np.searchsorted(self._sorted, x, side="right"), 1, n - 1)
+        left = self._sorted[i - 1]
+        right = self._sorted[i]
+        # ``left < right`` unless x is past the last sample, which SciPy handles before calling us
+        frac = np.clip((x - left) / np.where(right > left, right - left, 1), 0, 1)
+        return (i - 1 + frac) / (n - 1)
+
+    def _pdf(self, x):
+        n = self._sorted.size
+        i = np.clip(np.searchsorted(self._sorted, x, side="right"), 1, n - 1)
+        width = self._sorted[i] - self._sorted[i - 1]
+        return np.where(width > 0, 1 / ((n - 1) * np.where(width > 0, width, 1)), 0)
+
+    def _ppf(self, q):
+        n = self._sorted.size
+        h = q * (n - 1)
+        lo = np.clip(np.floor(h).astype(np.int64), 0, n - 2)
+        left = self._sorted[lo]
+        right = self._sorted[lo + 1]
+        return left + (h - lo) * (right - left)
+
+    def _rvs(self, size=None, random_state=None):
+        return self._ppf(random_state.random(size))
+
+    def _stats(self):
+        m = self._moments
+        return m.mean(), m.var(), m.skew(), m.kurtosis()
+
+
+def is_sorted(array) -> bool:
+    """Whether ``array`` is sorted in ascending order, checked in chunks to bound memory use."""
+    for start in range(0, array.size - 1, CHUNK_SIZE):
+        chunk = np.asarray(array[start : start + CHUNK_SIZE + 1])
+        if np.any(chunk[1:] < chunk[:-1]):
+            return False
+    return True
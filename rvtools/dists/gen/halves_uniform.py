@@ -1,15 +1,7 @@
-import numpy as np
 import scipy
 
-from rvtools.dists.gen.tp_uniform import (
-    argcheck,
-    get_support,
-    rvs,
-    pdf_single,
-    cdf_single,
-    ppf_single,
-    stats,
-)
+from rvtools.dists.gen import _kernels
+from rvtools.dists.gen.tp_uniform import argcheck, get_support, rvs, stats
 
 
 class HalvesUniform(scipy.stats.rv_continuous):
@@ -36,13 +28,13 @@ class HalvesUniform(scipy.stats.rv_continuous):
         return rvs(mini, sep, maxi, size=size, random_state=random_state)
 
     def _pdf(self, x, mini, sep, maxi):
-        return np.vectorize(pdf_single)(x, mini, sep, maxi)
+        return _kernels.pdf(x, mini, sep, maxi)
 
     def _cdf(self, x, mini, sep, maxi):
-        return np.vectorize(cdf_single)(x, mini, sep, maxi)
+        return _kernels.cdf(x, mini, sep, maxi)
 
     def _ppf(self, p, mini, sep, maxi):
-        return np.vectorize(ppf_single)(p, mini, sep, maxi)
+        return _kernels.ppf(p, mini, sep, maxi)
 
     def _stats(self, mini, sep, maxi):
         return stats(mini, sep, maxi)
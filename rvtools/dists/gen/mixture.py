@@ -0,0 +1,144 @@
+import numpy as np
+import scipy
+
+
+class Mixture(scipy.stats.rv_continuous):
+    """
+    A finite mixture of (frozen) continuous distributions.
+
+    With probability ``weights[i]``, a draw comes from ``components[i]``. Components may be point
+    masses like :py:obj:`rvtools.dists.certainty`.
+
+    :param components: The frozen distributions to mix.
+    :param weights: The probability of each component. Normalized to sum to 1.
+
+    Unlike most distributions in this subpackage, the parameters are given when creating the
+    instance (like ``scipy.stats.rv_histogram``), because the number of components is arbitrary.
+
+    Examples
+    --------
+    >>> from rvtools.dists import Mixture, certainty
+    >>> from rvtools.construct import lognorm
+    >>> dist = Mixture([certainty(0), lognorm(p5=1, p95=10)], [0.3, 0.7])
+    >>> float(dist.cdf(0))
+    0.3
+    >>> float(dist.ppf(0.2))
+    0.0
+
+    Notes
+    -----
+    Sampling selects components with Walker's alias method, which takes constant time per draw,
+    and then samples each component in bulk.
+    """
+
+    def __init__(self, components, weights, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        weights = np.asarray(weights, dtype=float)
+        if len(components) != len(weights):
+            raise ValueError(
+                f"Got {len(components)} components but {len(weights)} weights. They must match."
+            )
+        if len(components) == 0:
+            raise ValueError("Must provide at least one component.")
+        if np.any(weights < 0) or not weights.sum() > 0:
+            raise ValueError("Weights must be non-negative, and not all zero.")
+
+        self._components = list(components)
+        self._weights = weights / weights.sum()
+        self._alias_prob, self._alias = alias_table(self._weights)
+
+        supports = np.array([c.support() for c in self._components], dtype=float)
+        self.a = supports[:, 0].min()
+        self.b = supports[:, 1].max()
+
+    def _updated_ctor_param(self):
+        # Frozen distributions re-create their ``dist`` from these, see ``rv_frozen.__init__``
+        dct = super()._updated_ctor_param()
+        dct["components"] = self._components
+        dct["weights"] = self._weights
+        return dct
+
+    def _pdf(self, x):
+        return self._weighted_sum(lambda c: c.pdf(x))
+
+    def _cdf(self, x):
+        return self._weighted_sum(lambda c: c.cdf(x))
+
+    def _sf(self, x):
+        return self._weighted_sum(lambda c: c.sf(x))
+
+    def _ppf(self, q):
+        # The mixture's quantile lies between the smallest and largest component quantiles, so
+        # bisection can start from there (for all ``q`` at once).
+        component_ppfs = np.array([c.ppf(q) for c in self._components])
+        lo = component_ppfs.min(axis=0)
+        hi = component_ppfs.max(axis=0)
+        for _ in range(200):
+            done = hi - lo <= self.xtol * (1 + np.abs(hi))
+            if np.all(done):
+                break
+            mid = lo + (hi - lo) / 2
+            below = self._cdf(mid) < q
+            lo = np.where(below & ~done, mid, lo)
+            hi = np.where(~below & ~done, mid, hi)
+        # Bisection only gets within ``xtol`` of a jump in the cdf (i.e. a point mass). Snap to the
+        # component quantile that is the exact location of the jump.
+        near = np.abs(component_ppfs - hi) <= 2 * self.xtol * (1 + np.abs(hi))
+        snapped = np.where(near, component_ppfs, np.inf).min(axis=0)
+        return np.where(np.isfinite(snapped), snapped, hi)
+
+    def _rvs(self, size=None, random_state=None):
+        n = int(np.prod(size))
+        idx = alias_sample(self._alias_prob, self._alias, n, random_state)
+        out = np.empty(n)
+        for i, component in enumerate(self._components):
+            mask = idx == i
+            count = np.count_nonzero(mask)
+            if count:
+                out[mask] = component.rvs(size=count, random_state=random_state)
+        return out.reshape(size)
+
+    def _stats(self):
+        mean = self._weighted_sum(lambda c: c.mean())
+        second = self._weighted_sum(lambda c: c.var() + c.mean() ** 2)
+        # Higher moments are computed by SciPy from ``_munp``
+        return mean, second - mean**2, None, None
+
+    def _munp(self, n):
+        return self._weighted_sum(lambda c: c.moment(n))
+
+    def _weighted_sum(self, func):
+        return sum(w * np.asarray(func(c)) for w, c in zip(self._weights, self._components))
+
+
+def alias_table(weights):
+    """
+    Build the tables for Walker's alias method (in the numerically stable form due to Vose).
+
+    Returns ``prob`` and ``alias`` such that picking a column ``i`` uniformly at random, then
+    keeping ``i`` with probability ``prob[i]`` or otherwise switching to ``alias[i]``, selects
+    each index with probability ``weights[i]``.
+    """
+    n = len(weights)
+    prob = np.asarray(weights, dtype=float) * n / np.sum(weights)
+    alias = np.arange(n)
+    small = [i for i in range(n) if prob[i] < 1]
+    large = [i for i in range(n) if prob[i] >= 1]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        alias[s] = l
+        prob[l] -= 1 - prob[s]
+        (small if prob[l] < 1 else large).append(l)
+    # Whatever is left over is 1 up to rounding error
+    for i in small + large:
+        prob[i] = 1
+    return prob, alias
+
+
+def alias_sample(prob, alias, size, random_state):
+    """Draw ``size`` indices from alias tables, using a single uniform per draw."""
+    u = random_state.random(size) * len(prob)
+    column = np.minimum(u.astype(int), len(prob) - 1)
+    keep = u - column < prob[column]
+    return np.where(keep, column, alias[column])
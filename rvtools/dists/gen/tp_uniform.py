@@ -5,9 +5,10 @@ one for the halves-uniform distribution (with ``p=0.5``) and one for the more ge
 repetitious, this also adversely affects the user-facing API.
 """
 
-import numpy as np
 import scipy
 
+from rvtools.dists.gen import _kernels
+
 
 class TwoPieceUniform(scipy.stats.rv_continuous):
     """
@@ -34,13 +35,13 @@ class TwoPieceUniform(scipy.stats.rv_continuous):
         return rvs(mini, sep, maxi, psep, size=size, random_state=random_state)
 
     def _pdf(self, x, mini, sep, maxi, psep):
-        return np.vectorize(pdf_single)(x, mini, sep, maxi, psep)
+        return _kernels.pdf(x, mini, sep, maxi, psep)
 
     def _cdf(self, x, mini, sep, maxi, psep):
-        return np.vectorize(cdf_single)(x, mini, sep, maxi, psep)
+        return _kernels.cdf(x, mini, sep, maxi, psep)
 
     def _ppf(self, p, mini, sep, maxi, psep):
-        return np.vectorize(ppf_single)(p, mini, sep, maxi, psep)
+        return _kernels.ppf(p, mini, sep, maxi, psep)
 
     def _stats(self, mini, sep, maxi, psep):
         return stats(mini, sep, maxi, psep)
@@ -59,46 +60,7 @@ def rvs(mini, sep, maxi, psep=0.5, size=None, random_state=None):
     With size proportional to p, sample from a uniform distribution on [mini, q]. With
     size propotional to 1-p, sample from a uniform distribution on [q, maxi].
     """
-    if size is not None:
-        if len(size) == 1:  # Caller will give this as (size,)
-            size = size[0]
-        else:
-            raise NotImplementedError("size must be a scalar for TwoPieceUniform")
-    size_left = np.ceil(size * psep).astype(int)
-    size_right = size - size_left
-
-    samples_left = np.random.uniform(mini, sep, size_left)
-    samples_right = np.random.uniform(sep, maxi, size_right)
-    return np.concatenate([samples_left, samples_right])
-
-
-def pdf_single(x, mini, sep, maxi, psep=0.5):
-    if mini <= x <= sep:
-        return psep * _uniform_pdf(x, mini, sep)
-    elif sep <= x <= maxi:
-        return (1 - psep) * _uniform_pdf(x, sep, maxi)
-    else:
-        return 0
-
-
-def cdf_single(x, mini, sep, maxi, psep=0.5):
-    if x < mini:
-        return 0
-    elif mini <= x < sep:
-        return psep * ((x - mini) / (sep - mini))
-    elif sep <= x < maxi:
-        return psep + (1 - psep) * ((x - sep) / (maxi - sep))
-    else:  # x >= maxi
-        return 1
-
-
-def ppf_single(p, mini, sep, maxi, psep=0.5):
-    if 0 <= p < psep:
-        return mini + p / psep * (sep - mini)
-    elif psep <= p <= 1:
-        return sep + (p - psep) / (1 - psep) * (maxi - sep)
-    else:
-        return np.nan
+    return _kernels.rvs(mini, sep, maxi, psep, size=size, random_state=random_state)
 
 
 def stats(mini, sep, maxi, psep=0.5):
@@ -140,16 +102,6 @@ def _var(mini, sep, maxi, psep):
     return variance
 
 
-def _uniform_pdf(x, mini, maxi):
-    """
-    Helper. Using `scipy.stats.uniform`, would require converting to (loc, scale) form and make the code more confusing.
-    """
-    if mini <= x <= maxi:
-        return 1 / (maxi - mini)
-    else:
-        return 0
-
-
 # These being instances, not a classes, is not IMO idiomatic Python, but it's core to the way SciPy's
 # ``rv_continuous`` class works. See examples of how SciPy defines their distributions in
 # ``scipy/stats/_continuous_distns.py``.
@@ -0,0 +1,357 @@
+"""
+Sampling and evaluation in a chosen floating-point type, typically ``float32`` to halve the
+memory used by large runs.
+
+SciPy always computes in ``float64`` (and :py:obj:`rvtools.dists.certainty` returns the type of
+its ``value``, which may be an integer). The functions in this module instead write their results
+directly into an array of the requested ``dtype``:
+
+- For the normal, log-normal, uniform, log-uniform, two-piece uniform and certainty
+  distributions, the computation itself is done in ``dtype``, end to end, without any ``float64``
+  temporaries. Random numbers are drawn with ``numpy.random.Generator`` in ``dtype``, and the
+  normal CDF and quantile function use the single-precision kernels of ``scipy.special``.
+- For other distributions, results are computed by SciPy in ``float64`` one chunk of
+  ``chunk_size`` values at a time and cast, so the ``float64`` temporaries have a bounded size.
+- :py:func:`joint_rvs` samples a ``CopulaJoint`` through its Gaussian copula in ``dtype``, then
+  transforms each marginal as above.
+
+Results are not the same random numbers as those of the SciPy methods for the same seed, but
+have the same distribution.
+
+The ``dtype`` option is on these functions, which take the distribution as their first argument,
+rather than on the distributions' own ``rvs``, ``ppf`` and ``cdf``: those are SciPy's methods,
+with SciPy's signatures, and adding an argument to them would mean wrapping every SciPy family.
+
+Precision
+---------
+
+With ``float32``, the relative precision is about ``6e-8`` (``2**-24``) instead of about
+``1e-16``, and values above about ``3.4e38`` overflow to ``inf``. For most models this is
+immaterial next to Monte Carlo error, but it is lost in some places:
+
+- **Upper-tail probabilities.** Probabilities close to 1 are spaced ``2**-24`` apart, so ``cdf``
+  returns exactly 1 for all values beyond about the ``1 - 6e-8`` quantile (5.3 standard
+  deviations for a normal), and ``ppf`` cannot reach quantiles beyond that (``ppf(1 - 1e-9)``
+  is ``ppf(1) = inf``). Probabilities close to 0 do not have this problem.
+- **Copula tails.** For the same reason, in :py:func:`joint_rvs` the copula's uniforms are
+  limited to ``[tiny, 1 - 2**-24]``, which truncates the upper tail of each marginal at about
+  5.3 standard deviations of the latent normal. This affects about one draw in 20 million.
+- **Log-normal tails.** ``exp`` turns the absolute error of the latent normal into a relative
+  error of the result, so the largest samples of a log-normal with large ``sigma`` carry
+  relative errors of ``sigma * |z| * 2**-24``, where ``z`` is the latent normal (still under
+  ``1e-5`` for ``sigma=10``). More importantly, samples overflow to ``inf`` when
+  ``mu + sigma * z > 88.7``, e.g. for ``sigma=10`` at ``z > 8.9``.
+- **Parameters.** Parameters are rounded to ``dtype``, so e.g. a uniform on
+  ``[1e8, 1e8 + 1]`` is not representable: the spacing of ``float32`` around ``1e8`` is 8.
+- **Accumulation.** Sums over many samples (e.g. ``sample.mean()``) should be accumulated in
+  ``float64``, e.g. with ``sample.mean(dtype=np.float64)``.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import lognorm
+>>> from rvtools import dtypes
+>>> dist = lognorm(p5=1, p95=10)
+>>> sample = dtypes.rvs(dist, 1_000_000, random_state=0)
+>>> sample.dtype, sample.nbytes
+(dtype('float32'), 4000000)
+>>> bool(abs(np.median(sample) / dist.median() - 1) < 0.01)
+True
+>>> q = dtypes.ppf(dist, [0.05, 0.95])
+>>> q.dtype, np.allclose(q, [1, 10], rtol=1e-6)
+(dtype('float32'), True)
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import scipy
+from copula_wrapper import CopulaJoint
+from numpy.typing import ArrayLike, DTypeLike
+from scipy.stats.distributions import rv_frozen
+
+from rvtools.dists.gen.certainty import Certainty
+from rvtools.dists.gen.tp_uniform import TwoPieceUniform
+
+DEFAULT_CHUNK_SIZE = 2**20
+
+
+def rvs(
+    dist: rv_frozen,
+    size: int,
+    *,
+    dtype: DTypeLike = np.float32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> np.ndarray:
+    """
+    ``size`` random samples from ``dist``, as an array of type ``dtype``.
+
+    :param random_state: Anything accepted by ``numpy.random.default_rng``.
+    """
+    dtype = _float_dtype(dtype)
+    rng = np.random.default_rng(random_state)
+    kernel = _kernel(dist, dtype)
+    out = np.empty(size, dtype=dtype)
+    for start in range(0, size, chunk_size):
+        chunk = out[start : start + chunk_size]
+        if kernel is None:
+            chunk[:] = dist.rvs(size=chunk.size, random_state=rng)
+        else:
+            kernel.rvs(chunk, rng)
+    return out
+
+
+def ppf(
+    dist: rv_frozen,
+    q: ArrayLike,
+    *,
+    dtype: DTypeLike = np.float32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """The quantile function of ``dist`` at ``q``, as an array of type ``dtype``."""
+    return _evaluate(dist, "ppf", q, dtype, chunk_size)
+
+
+def cdf(
+    dist: rv_frozen,
+    x: ArrayLike,
+    *,
+    dtype: DTypeLike = np.float32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """The cumulative distribution function of ``dist`` at ``x``, as an array of type ``dtype``."""
+    return _evaluate(dist, "cdf", x, dtype, chunk_size)
+
+
+def joint_rvs(
+    dist: CopulaJoint,
+    size: int,
+    *,
+    dtype: DTypeLike = np.float32,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+):
+    """
+    ``size`` random samples from the ``CopulaJoint`` ``dist``, as an array of type ``dtype`` with
+    one column per marginal (or a ``DataFrame`` if the marginals are named).
+
+    >>> from rvtools.construct import CopulaJoint, norm, uniform
+    >>> dist = CopulaJoint({"a": norm(0, 1), "b": uniform(0, 1)}, kendall_tau={("a", "b"): 0.5})
+    >>> joint_rvs(dist, 1000, random_state=0).dtypes.tolist()
+    [dtype('float32'), dtype('float32')]
+    """
+    dtype = _float_dtype(dtype)
+    rng = np.random.default_rng(random_state)
+    marginals = dist._wrapped.marginals
+    kernels = [_kernel(m, dtype) for m in marginals]
+    cholesky = np.linalg.cholesky(dist._wrapped.copula.corr).astype(dtype)
+    bounds = np.finfo(dtype).tiny, np.nextafter(dtype.type(1), dtype.type(0))
+
+    out = np.empty((size, len(marginals)), dtype=dtype)
+    rows = max(chunk_size // len(marginals), 1)
+    for start in range(0, size, rows):
+        chunk = out[start : start + rows]
+        latent = rng.standard_normal(chunk.shape, dtype=dtype)
+        # Uniforms of the Gaussian copula
+        uniforms = scipy.special.ndtr(latent @ cholesky.T)
+        del latent
+        np.clip(uniforms, *bounds, out=uniforms)
+        for j, (marginal, kernel) in enumerate(zip(marginals, kernels)):
+            if kernel is None:
+                chunk[:, j] = marginal.ppf(uniforms[:, j])
+            else:
+                kernel.ppf(uniforms[:, j], chunk[:, j])
+
+    if dist._idx_to_name:
+        return pd.DataFrame(out, columns=dist._idx_to_name, copy=False)
+    return out
+
+
+def _evaluate(dist, method: str, values: ArrayLike, dtype, chunk_size: int) -> np.ndarray:
+    dtype = _float_dtype(dtype)
+    values = np.asarray(values)
+    kernel = _kernel(dist, dtype)
+    out = np.empty(values.shape, dtype=dtype)
+    flat_values, flat_out = values.reshape(-1), out.reshape(-1)
+    for start in range(0, flat_out.size, chunk_size):
+        chunk = np.asarray(flat_values[start : start + chunk_size], dtype=dtype)
+        chunk_out = flat_out[start : start + chunk_size]
+        if kernel is None:
+            chunk_out[:] = getattr(dist, method)(chunk)
+        else:
+            getattr(kernel, method)(chunk, chunk_out)
+    return out
+
+
+def _float_dtype(dtype) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError(f"Expected a floating-point dtype, got {dtype}.")
+    return dtype
+
+
+def _kernel(dist, dtype: np.dtype) -> Optional["_Kernel"]:
+    """The native implementation for the family of ``dist``, or ``None`` if there is none."""
+    try:
+        family = dist.dist
+        shapes, loc, scale = family._parse_args(*dist.args, **dist.kwds)
+    except AttributeError:
+        return None
+    for gen, kernel in _KERNELS.items():
+        if isinstance(family, gen):
+            return kernel(dtype, *shapes, loc=loc, scale=scale)
+    return None
+
+
+class _Kernel(ABC):
+    """
+    Sampling, quantile function and CDF of a location-scale family, computed in ``dtype``.
+
+    Subclasses implement the standardized distribution (``loc=0, scale=1``) in place, writing
+    into ``out``. All methods must accept non-contiguous ``out`` arrays, except ``rvs``.
+    """
+
+    def __init__(self, dtype: np.dtype, *shapes, loc, scale):
+        self.dtype = dtype
+        self.shapes = [dtype.type(s) for s in shapes]
+        self.loc = dtype.type(loc)
+        self.scale = dtype.type(scale)
+
+    def rvs(self, out: np.ndarray, rng: np.random.Generator):
+        # Inverse transform sampling by default
+        rng.random(out=out, dtype=self.dtype)
+        self._standard_ppf(out, out)
+        self._unstandardize(out)
+
+    def ppf(self, q: np.ndarray, out: np.ndarray):
+        self._standard_ppf(q, out)
+        self._unstandardize(out)
+        out[(q < 0) | (q > 1)] = np.nan
+
+    def cdf(self, x: np.ndarray, out: np.ndarray):
+        np.subtract(x, self.loc, out=out)
+        out /= self.scale
+        self._standard_cdf(out, out)
+
+    def _unstandardize(self, out):
+        out *= self.scale
+        out += self.loc
+
+    @abstractmethod
+    def _standard_ppf(self, q, out):
+        ...
+
+    @abstractmethod
+    def _standard_cdf(self, x, out):
+        ...
+
+
+class _Norm(_Kernel):
+    def rvs(self, out, rng):
+        rng.standard_normal(out=out, dtype=self.dtype)
+        self._unstandardize(out)
+
+    def _standard_ppf(self, q, out):
+        scipy.special.ndtri(q, out=out)
+
+    def _standard_cdf(self, x, out):
+        scipy.special.ndtr(x, out=out)
+
+
+class _Lognorm(_Kernel):
+    def rvs(self, out, rng):
+        rng.standard_normal(out=out, dtype=self.dtype)
+        self._exp(out)
+        self._unstandardize(out)
+
+    def _standard_ppf(self, q, out):
+        scipy.special.ndtri(q, out=out)
+        self._exp(out)
+
+    def _standard_cdf(self, x, out):
+        (sigma,) = self.shapes
+        # Zero probability below the support (``log(0) = -inf``)
+        np.maximum(x, 0, out=out)
+        with np.errstate(divide="ignore"):
+            np.log(out, out=out)
+        out /= sigma
+        scipy.special.ndtr(out, out=out)
+
+    def _exp(self, out):
+        (sigma,) = self.shapes
+        out *= sigma
+        np.exp(out, out=out)
+
+
+class _Uniform(_Kernel):
+    def _standard_ppf(self, q, out):
+        out[:] = q
+
+    def _standard_cdf(self, x, out):
+        np.clip(x, 0, 1, out=out)
+
+
+class _Loguniform(_Kernel):
+    def _standard_ppf(self, q, out):
+        a, b = self.shapes
+        np.multiply(q, np.log(b) - np.log(a), out=out)
+        out += np.log(a)
+        np.exp(out, out=out)
+
+    def _standard_cdf(self, x, out):
+        a, b = self.shapes
+        np.clip(x, a, b, out=out)
+        np.log(out, out=out)
+        out -= np.log(a)
+        out /= np.log(b) - np.log(a)
+
+
+class _TwoPieceUniform(_Kernel):
+    def _standard_ppf(self, q, out):
+        mini, sep, maxi, psep = self.shapes
+        left = q < psep
+        left_values = mini + q[left] * ((sep - mini) / psep) if psep > 0 else None
+        # ``q`` may be ``out``, so it must not be used after this
+        np.subtract(q, psep, out=out)
+        out *= (maxi - sep) / (1 - psep) if psep < 1 else 0
+        out += sep
+        if left_values is not None:
+            out[left] = left_values
+
+    def _standard_cdf(self, x, out):
+        mini, sep, maxi, psep = self.shapes
+        left = x < sep
+        left_values = psep * (x[left] - mini) / (sep - mini) if sep > mini else 0
+        above = x >= maxi
+        np.subtract(x, sep, out=out)
+        out *= (1 - psep) / (maxi - sep) if maxi > sep else 0
+        out += psep
+        out[left] = left_values
+        out[above] = 1
+        np.clip(out, 0, 1, out=out)
+
+
+class _Certainty(_Kernel):
+    def rvs(self, out, rng):
+        out.fill(self.shapes[0])
+        self._unstandardize(out)
+
+    def _standard_ppf(self, q, out):
+        out.fill(self.shapes[0])
+
+    def _standard_cdf(self, x, out):
+        (value,) = self.shapes
+        np.greater_equal(x, value, out=out, casting="unsafe")
+
+
+_KERNELS = {
+    scipy.stats._continuous_distns.norm_gen: _Norm,
+    scipy.stats._continuous_distns.lognorm_gen: _Lognorm,
+    scipy.stats._continuous_distns.uniform_gen: _Uniform,
+    scipy.stats._continuous_distns.reciprocal_gen: _Loguniform,
+    TwoPieceUniform: _TwoPieceUniform,
+    Certainty: _Certainty,
+}
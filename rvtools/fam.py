@@ -2,6 +2,9 @@ import betapert
 import scipy
 
 from rvtools.dists.gen.certainty import Certainty
+from rvtools.dists.gen.halves_uniform import HalvesUniform
+from rvtools.dists.gen.mixture import Mixture
+from rvtools.dists.gen.tp_uniform import TwoPieceUniform
 
 
 def is_frozen_norm(obj):
@@ -22,6 +25,36 @@ def is_frozen_lognorm(obj):
     return isinstance(dist, scipy.stats._continuous_distns.lognorm_gen)
 
 
+def is_frozen_uniform(obj):
+    """Returns ``True`` if and only if ``obj`` is a frozen uniform distribution."""
+    try:
+        dist = obj.dist
+    except AttributeError:
+        return False
+    return isinstance(dist, scipy.stats._continuous_distns.uniform_gen)
+
+
+def is_frozen_loguniform(obj):
+    """Returns ``True`` if and only if ``obj`` is a frozen log-uniform (reciprocal) distribution."""
+    try:
+        dist = obj.dist
+    except AttributeError:
+        return False
+    return isinstance(dist, scipy.stats._continuous_distns.reciprocal_gen)
+
+
+def is_frozen_tp_uniform(obj):
+    """
+    Returns ``True`` if and only if ``obj`` is a frozen two-piece uniform distribution (including
+    the halves uniform).
+    """
+    try:
+        dist = obj.dist
+    except AttributeError:
+        return False
+    return isinstance(dist, (TwoPieceUniform, HalvesUniform))
+
+
 def is_frozen_beta(obj):
     """Returns ``True`` if and only if ``obj`` is a frozen beta distribution."""
     try:
@@ -51,6 +84,15 @@ def is_frozen_certainty(obj):
     return isinstance(dist, Certainty)
 
 
+def is_frozen_mixture(obj):
+    """Returns ``True`` if and only if ``obj`` is a frozen :py:class:`rvtools.dists.Mixture`."""
+    try:
+        dist = obj.dist
+    except AttributeError:
+        return False
+    return isinstance(dist, Mixture)
+
+
 def is_frozen_pert(obj):
     """Returns ``True`` if and only if ``obj`` is a frozen PERT distribution."""
     try:
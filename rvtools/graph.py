@@ -0,0 +1,267 @@
+"""
+Lazy, vectorized models over distributions, evaluated in chunks.
+
+A model is built as a graph of :py:class:`Node` objects: random inputs (see :py:func:`rv` and
+:py:func:`joint`), and operations on them (arithmetic operators, NumPy ufuncs, or any elementwise
+function via :py:func:`apply`). Nothing is computed until :py:func:`evaluate` or
+:py:func:`iter_chunks` is called.
+
+Evaluation proceeds in chunks of ``chunk_size`` samples, so intermediate arrays never have more
+than ``chunk_size`` elements, whatever the total number of samples. Within a chunk:
+
+- each node is computed once, even if several other nodes use it (a node is identified by the
+  Python object, so reuse the same object to share a subexpression)
+- an intermediate array is discarded as soon as the last node that uses it has been computed,
+  and its memory is reused for the results of later NumPy ufuncs
+
+Random inputs in each chunk are drawn from a random generator derived from ``seed``, the index
+of the chunk, and the position of the input in the graph, so results are exactly reproducible
+for a given ``seed`` and ``chunk_size``.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import norm, lognorm
+>>> from rvtools import graph
+>>> x = graph.rv(norm(0, 1))
+>>> y = graph.rv(lognorm(mu=0, sigma=1))
+>>> shared = x * y
+>>> model = {"z": shared + np.exp(shared), "w": 2 * shared}
+>>> out = graph.evaluate(model, size=1_000_000, seed=0)
+>>> out["z"].shape
+(1000000,)
+>>> bool(np.all(out["z"] == graph.evaluate(model, size=1_000_000, seed=0)["z"]))
+True
+"""
+from collections import Counter
+from typing import Any, Callable, Iterator, Union
+
+import numpy as np
+from scipy.stats.distributions import rv_frozen
+
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+class Node:
+    """
+    A lazily computed array in a model graph. Supports arithmetic operators and NumPy ufuncs,
+    which return new nodes.
+    """
+
+    def __init__(self, func: Callable, *args):
+        self._func = func
+        # Mix of nodes and constants
+        self._args = args
+
+    @property
+    def _parents(self) -> list["Node"]:
+        return [a for a in self._args if isinstance(a, Node)]
+
+    def _compute(self, values: list, pool: "_BufferPool", n: int):
+        if isinstance(self._func, np.ufunc) and self._func.nout == 1:
+            out = pool.take(n, values)
+            if out is not None:
+                return self._func(*values, out=out)
+        return self._func(*values)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        return Node(ufunc, *inputs)
+
+    def __add__(self, other):
+        return Node(np.add, self, other)
+
+    def __radd__(self, other):
+        return Node(np.add, other, self)
+
+    def __sub__(self, other):
+        return Node(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        return Node(np.subtract, other, self)
+
+    def __mul__(self, other):
+        return Node(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        return Node(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        return Node(np.true_divide, self, other)
+
+    def __rtruediv__(self, other):
+        return Node(np.true_divide, other, self)
+
+    def __pow__(self, other):
+        return Node(np.power, self, other)
+
+    def __rpow__(self, other):
+        return Node(np.power, other, self)
+
+    def __neg__(self):
+        return Node(np.negative, self)
+
+    def __abs__(self):
+        return Node(np.absolute, self)
+
+
+class _Leaf(Node):
+    """A node whose value is random, and drawn rather than computed from other nodes."""
+
+    def __init__(self, sample: Callable[[int, np.random.Generator], Any]):
+        super().__init__(sample)
+
+    def _draw(self, n: int, rng: np.random.Generator):
+        return np.asarray(self._func(n, rng))
+
+
+def rv(dist: rv_frozen) -> Node:
+    """A random input with (frozen) distribution ``dist``."""
+    return _Leaf(lambda n, rng: dist.rvs(size=n, random_state=rng))
+
+
+def joint(dist) -> Union[dict[Any, Node], list[Node]]:
+    """
+    Random inputs with joint distribution ``dist`` (a
+    :py:class:`~copula_wrapper.joint_distribution.CopulaJoint`).
+
+    Returns a dictionary of nodes if the marginals of ``dist`` are named, and a list otherwise.
+    """
+    sample = _Leaf(lambda n, rng: dist.rvs(n, random_state=rng))
+    columns = [Node(_column, sample, i) for i in range(len(dist.marginals))]
+    if isinstance(dist.marginals, dict):
+        return dict(zip(dist.marginals.keys(), columns))
+    return columns
+
+
+def apply(func: Callable, *args) -> Node:
+    """
+    A node computed by calling ``func`` on the values of ``args`` (nodes or constants).
+
+    ``func`` must be elementwise, i.e. work on arrays of any length.
+    """
+    return Node(func, *args)
+
+
+def iter_chunks(outputs, size: int, *, chunk_size: int = DEFAULT_CHUNK_SIZE, seed=None) -> Iterator:
+    """
+    Evaluate ``outputs`` for ``size`` samples, yielding the results for one chunk of at most
+    ``chunk_size`` samples at a time.
+
+    :param outputs: A node, or a list, tuple or dict of nodes.
+    :return: Values with the same structure as ``outputs``.
+    """
+    nodes, rebuild = _flatten(outputs)
+    order = _topological_order(nodes)
+    leaf_index = {id(node): i for i, node in enumerate(n for n in order if isinstance(n, _Leaf))}
+    uses = Counter(id(parent) for node in order for parent in node._parents)
+    keep = {id(node) for node in nodes}
+    entropy = np.random.SeedSequence(seed).entropy
+    pool = _BufferPool()
+
+    for chunk_index, start in enumerate(range(0, size, chunk_size)):
+        n = min(chunk_size, size - start)
+        values = {}
+        remaining_uses = uses.copy()
+        for node in order:
+            if isinstance(node, _Leaf):
+                seed_seq = np.random.SeedSequence(
+                    entropy, spawn_key=(chunk_index, leaf_index[id(node)])
+                )
+                values[id(node)] = node._draw(n, np.random.default_rng(seed_seq))
+                continue
+            args = [values[id(a)] if isinstance(a, Node) else a for a in node._args]
+            values[id(node)] = node._compute(args, pool, n)
+            del args
+            for parent in node._parents:
+                remaining_uses[id(parent)] -= 1
+                if remaining_uses[id(parent)] == 0 and id(parent) not in keep:
+                    pool.give(values.pop(id(parent)), values.values())
+        yield rebuild([values[id(node)] for node in nodes])
+
+
+def evaluate(outputs, size: int, *, chunk_size: int = DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Evaluate ``outputs`` for ``size`` samples, in chunks of at most ``chunk_size`` samples.
+
+    Only the final results are held in memory in full. See :py:func:`iter_chunks` to process
+    the results chunk by chunk instead.
+
+    :param outputs: A node, or a list, tuple or dict of nodes.
+    :return: Arrays of length ``size``, with the same structure as ``outputs``.
+    """
+    nodes, rebuild = _flatten(outputs)
+    results = None
+    start = 0
+    for chunk in iter_chunks(nodes, size, chunk_size=chunk_size, seed=seed):
+        if results is None:
+            results = [np.empty((size,) + c.shape[1:], dtype=c.dtype) for c in chunk]
+        n = len(chunk[0])
+        for result, c in zip(results, chunk):
+            result[start : start + n] = c
+        start += n
+    return rebuild(results)
+
+
+class _BufferPool:
+    """Arrays that are no longer needed, kept so that their memory can be reused."""
+
+    def __init__(self):
+        self._free = []
+
+    def give(self, array, live_values):
+        # Views share memory with another array, which may still be in use. Also make sure no
+        # other node's value shares the array's memory (an elementwise function may return its
+        # input, or a view of it).
+        if not isinstance(array, np.ndarray) or array.base is not None or array.ndim != 1:
+            return
+        if any(isinstance(v, np.ndarray) and np.may_share_memory(v, array) for v in live_values):
+            return
+        self._free.append(array)
+
+    def take(self, n, values):
+        """A float array of length ``n`` to hold the result of an operation on ``values``."""
+        if np.result_type(*values) != np.float64:
+            return None
+        if any(np.shape(v) not in ((), (n,)) for v in values):
+            return None
+        for i, array in enumerate(self._free):
+            if array.shape == (n,) and array.dtype == np.float64:
+                return self._free.pop(i)
+        return None
+
+
+def _column(sample, i):
+    return np.asarray(sample)[:, i]
+
+
+def _topological_order(outputs: list[Node]) -> list[Node]:
+    order = []
+    seen = set()
+    stack = [(node, False) for node in reversed(outputs)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        stack.extend((parent, False) for parent in reversed(node._parents))
+    return order
+
+
+def _flatten(outputs) -> tuple[list[Node], Callable[[list], Any]]:
+    """Flatten ``outputs`` to a list, and return a function to restore the original structure."""
+    if isinstance(outputs, Node):
+        return [outputs], lambda values: values[0]
+    if isinstance(outputs, dict):
+        keys = list(outputs.keys())
+        return list(outputs.values()), lambda values: dict(zip(keys, values))
+    if isinstance(outputs, (list, tuple)):
+        kind = type(outputs)
+        return list(outputs), lambda values: kind(values)
+    raise TypeError(f"Expected a Node, or a list, tuple or dict of nodes, got {type(outputs)}.")
@@ -0,0 +1,245 @@
+"""
+Pairwise Kendall rank correlations of a dataset, to calibrate a ``CopulaJoint`` from data.
+
+:py:func:`kendall_tau` returns a dictionary that ``CopulaJoint(marginals, kendall_tau=...)``
+accepts directly. It computes Kendall's tau-b (which accounts for ties) with `Knight's
+<https://doi.org/10.2307/2282833>`_ ``O(n log n)`` algorithm: sort the rows by one variable, and
+count the discordant pairs as the number of swaps a merge sort needs to sort the other.
+
+Compared to calling ``scipy.stats.kendalltau`` on each pair of variables:
+
+- Each variable is ranked once, rather than once per pair. A variable without ties only needs
+  to be sorted once: each pair it is part of is then a gather and a merge sort.
+- Pairs are computed in parallel threads (the sorts and SciPy's merge sort release the GIL).
+- With ``sample_size``, tau is estimated from a random subset of the rows, with confidence
+  bounds from the spread of tau over disjoint batches of that subset (see
+  :py:func:`pairwise_tau`). The standard error of tau shrinks like ``1 / sqrt(n)``, so a few
+  hundred thousand rows are usually plenty.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> import pandas as pd
+>>> from rvtools.construct import CopulaJoint, lognorm, norm
+>>> from rvtools.kendall import kendall_tau, pairwise_tau
+>>> rng = np.random.default_rng(0)
+>>> cost = rng.lognormal(size=10_000)
+>>> data = pd.DataFrame({"cost": cost, "duration": cost + rng.exponential(size=10_000)})
+>>> tau = kendall_tau(data)
+>>> {pair: round(value, 2) for pair, value in tau.items()}
+{('cost', 'duration'): 0.59}
+>>> joint = CopulaJoint({"cost": lognorm(0, 1), "duration": norm(3, 1)}, kendall_tau=tau)
+
+Estimate from a subset of the rows, with confidence bounds:
+
+>>> result = pairwise_tau(data, sample_size=2000, random_state=0)
+>>> bool(result.low[0, 1] < tau["cost", "duration"] < result.high[0, 1])
+True
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import scipy
+
+from rvtools._random import check_random_state
+
+try:
+    # SciPy's merge sort count, which releases the GIL. It is private, so it may go away.
+    from scipy.stats._stats import _kendall_dis
+except ImportError:
+    _kendall_dis = None
+
+
+class KendallTau(NamedTuple):
+    #: Names of the variables (or positions, for an array)
+    names: list
+    #: Matrix of Kendall's tau-b, with ones on the diagonal
+    tau: np.ndarray
+    #: Lower and upper confidence bounds of ``tau``, if it was estimated from a subset of the rows
+    low: Optional[np.ndarray]
+    high: Optional[np.ndarray]
+    #: Number of rows ``tau`` was computed from
+    size: int
+
+    def to_dict(self) -> dict:
+        """The correlations as a dictionary of pairs, as accepted by ``CopulaJoint``."""
+        return {
+            (self.names[i], self.names[j]): float(self.tau[i, j])
+            for i, j in combinations(range(len(self.names)), 2)
+        }
+
+
+def kendall_tau(data, **kwargs) -> dict:
+    """
+    Kendall's tau-b between each pair of columns of ``data``, as a dictionary mapping pairs of
+    column names to correlations, for ``CopulaJoint(..., kendall_tau=...)``. See
+    :py:func:`pairwise_tau` for the arguments.
+    """
+    return pairwise_tau(data, **kwargs).to_dict()
+
+
+def pairwise_tau(
+    data,
+    *,
+    sample_size: Optional[int] = None,
+    confidence: float = 0.95,
+    n_batches: int = 20,
+    n_jobs: Optional[int] = None,
+    random_state=None,
+) -> KendallTau:
+    """
+    Kendall's tau-b between each pair of columns of ``data``.
+
+    :param data:
+        A ``DataFrame``, a dictionary mapping names to 1-D arrays, or a 2-D array with one column
+        per variable. Missing values are not allowed.
+    :param sample_size:
+        If given (and smaller than the number of rows), estimate tau from this many rows, drawn
+        at random without replacement. In either case, compute confidence bounds: tau is also
+        computed on each of ``n_batches`` disjoint batches of the rows, and the standard error is
+        the standard deviation of the batches' taus divided by ``sqrt(n_batches)``.
+    :param confidence: Confidence level of the bounds.
+    :param n_batches: Number of batches for the confidence bounds.
+    :param n_jobs: Number of threads. Defaults to the number of CPUs.
+    """
+    names, columns = _columns(data)
+    n_rows = len(columns[0]) if columns else 0
+    if n_rows < 2:
+        raise ValueError(f"At least 2 rows are needed, got {n_rows}.")
+
+    if sample_size is not None and sample_size < n_rows:
+        rows = check_random_state(random_state).choice(n_rows, sample_size, replace=False)
+        columns = [column[np.sort(rows)] for column in columns]
+        n_rows = sample_size
+    ranked = [_Ranked(column) for column in columns]
+    batches = None
+    if sample_size is not None:
+        if n_rows < 2 * n_batches:
+            raise ValueError(
+                f"Confidence bounds need at least 2 * n_batches = {2 * n_batches} rows, "
+                f"got {n_rows}."
+            )
+        batches = np.array_split(np.arange(n_rows), n_batches)
+
+    def compute(pair):
+        x, y = (ranked[k] for k in pair)
+        tau = x.tau_b(y)
+        if batches is None:
+            return tau, np.nan
+        batch_taus = [_tau_b(x.ranks[rows], y.ranks[rows]) for rows in batches]
+        return tau, np.std(batch_taus, ddof=1) / np.sqrt(n_batches)
+
+    pairs = list(combinations(range(len(names)), 2))
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        results = list(executor.map(compute, pairs))
+
+    tau, stderr = np.eye(len(names)), np.zeros((len(names), len(names)))
+    for (i, j), (value, error) in zip(pairs, results):
+        tau[i, j] = tau[j, i] = value
+        stderr[i, j] = stderr[j, i] = error
+    low = high = None
+    if batches is not None:
+        z = scipy.special.ndtri((1 + confidence) / 2)
+        low, high = np.clip(tau - z * stderr, -1, 1), np.clip(tau + z * stderr, -1, 1)
+    return KendallTau(names=names, tau=tau, low=low, high=high, size=n_rows)
+
+
+def _columns(data) -> tuple[list, list[np.ndarray]]:
+    if isinstance(data, pd.DataFrame):
+        names, columns = list(data.columns), [data[name].to_numpy() for name in data.columns]
+    elif isinstance(data, dict):
+        names, columns = list(data.keys()), [np.asarray(v) for v in data.values()]
+    else:
+        array = np.asarray(data)
+        if array.ndim != 2:
+            raise ValueError(
+                f"Expected a 2-D array with one column per variable, got {array.ndim}-D."
+            )
+        names, columns = list(range(array.shape[1])), list(array.T)
+
+    columns = [np.asarray(column, dtype=float).ravel() for column in columns]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All columns must have the same length.")
+    if any(np.isnan(column).any() for column in columns):
+        raise ValueError("The data contain missing values. Drop or impute them first.")
+    return names, columns
+
+
+class _Ranked:
+    """A variable's dense ranks (from 1), the order that sorts it, and its number of tied pairs."""
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind="stable")
+        sorted_values = values[self.order]
+        dense = np.cumsum(np.r_[True, sorted_values[1:] != sorted_values[:-1]], dtype=np.intp)
+        self.ranks = np.empty_like(dense)
+        self.ranks[self.order] = dense
+        self.ties = _tied_pairs(self.ranks)
+
+    def tau_b(self, other: "_Ranked") -> float:
+        # Sort by the variable without ties if there is one, so that its order can be reused
+        x, y = (self, other) if self.ties <= other.ties else (other, self)
+        if x.ties:
+            return _tau_b(x.ranks, y.ranks)
+        sorted_y = y.ranks[x.order]
+        return _from_counts(len(sorted_y), _discordant(x.ranks[x.order], sorted_y), 0, 0, y.ties)
+
+
+def _tau_b(x: np.ndarray, y: np.ndarray) -> float:
+    """Kendall's tau-b of two arrays of positive integer ranks."""
+    # Sort by x, then y, so that pairs tied in x are not counted as discordant
+    keys = x.astype(np.int64) * (int(y.max()) + 1) + y
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    joint_ties = _tied_pairs(np.cumsum(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]))
+    discordant = _discordant(x[order], y[order])
+    return _from_counts(len(x), discordant, joint_ties, _tied_pairs(x), _tied_pairs(y))
+
+
+def _from_counts(n: int, discordant: int, joint_ties: int, x_ties: int, y_ties: int) -> float:
+    total = n * (n - 1) // 2
+    if x_ties == total or y_ties == total:
+        return np.nan
+    concordant_minus_discordant = total - x_ties - y_ties + joint_ties - 2 * discordant
+    return concordant_minus_discordant / np.sqrt(total - x_ties) / np.sqrt(total - y_ties)
+
+
+def _count_discordant(x: np.ndarray, y: np.ndarray) -> int:
+    """
+    The number of pairs ``i < j`` with ``y[i] > y[j]`` (for ``x`` sorted, and ``y`` sorted within
+    ties of ``x``), by a bottom-up merge sort of ``y`` in NumPy. This is a fallback for SciPy's
+    private ``_kendall_dis``.
+    """
+    y = np.asarray(y, dtype=np.int64)
+    n = len(y)
+    offset = int(y.max()) + 1 if n else 1
+    count, width = 0, 1
+    position = np.arange(n)
+    while width < n:
+        # Merge each pair of sorted runs of ``width`` values. Offsetting the values of each merged
+        # block keeps the blocks apart, so all of them are merged by a single sort.
+        block = position // (2 * width)
+        right = (position // width) % 2 == 1
+        keys = block * offset + y
+        left_keys = keys[~right]
+        # Values of the left run (in the same block) greater than each value of the right run
+        greater = np.searchsorted(left_keys, (block[right] + 1) * offset) - np.searchsorted(
+            left_keys, keys[right], side="right"
+        )
+        count += int(greater.sum())
+        y = np.sort(keys) - block * offset
+        width *= 2
+    return count
+
+
+_discordant = _count_discordant if _kendall_dis is None else _kendall_dis
+
+
+def _tied_pairs(ranks: np.ndarray) -> int:
+    counts = np.bincount(ranks).astype(np.int64)
+    return int((counts * (counts - 1) // 2).sum())
@@ -0,0 +1,176 @@
+"""
+Memoization of derived quantities of the frozen distributions returned by
+:py:mod:`rvtools.construct`.
+
+A frozen distribution's parameters never change, so neither do its moments, support, median,
+entropy, intervals and quantiles. SciPy recomputes them on every call, which for some families
+(e.g. :py:obj:`rvtools.dists.tp_uniform`, PERT and beta) means real work. The constructors in
+:py:mod:`rvtools.construct` therefore return :py:class:`CachedFrozen` distributions, which compute
+each of these once, on first use.
+
+Memory is bounded: there is one entry per method and argument, and ``ppf`` only caches calls
+with at most ``PPF_MAX_VALUES`` probabilities (e.g. a table of percentiles for a report), in a
+least-recently-used cache of ``PPF_MAX_ENTRIES`` entries. Arrays are copied on the way out, so
+callers may modify the results.
+
+Memoization is enabled by default. Disable it with :py:func:`disable` (or the
+:py:func:`disabled` context manager), or by setting the environment variable
+``RVTOOLS_MEMO=0``. While it is disabled, constructors return SciPy's own frozen distributions,
+and existing :py:class:`CachedFrozen` distributions neither use nor fill their caches.
+
+Examples
+--------
+
+>>> from rvtools.construct import pert
+>>> from rvtools import memo
+>>> d = pert(0, 3, 12)
+>>> isinstance(d, memo.CachedFrozen)
+True
+>>> d.ppf([0.05, 0.5, 0.95]).round(3)  # Computed
+array([0.917, 3.766, 7.889])
+>>> d.ppf([0.05, 0.5, 0.95]).round(3)  # Cached
+array([0.917, 3.766, 7.889])
+>>> with memo.disabled():
+...     type(pert(0, 3, 12)).__name__
+'rv_continuous_frozen'
+"""
+import functools
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from scipy.stats._distn_infrastructure import rv_continuous_frozen
+
+PPF_MAX_VALUES = 16
+PPF_MAX_ENTRIES = 32
+
+_enabled = os.environ.get("RVTOOLS_MEMO", "1") != "0"
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def disabled():
+    """Disable memoization within a ``with`` block."""
+    previous = _enabled
+    disable()
+    try:
+        yield
+    finally:
+        if previous:
+            enable()
+
+
+class CachedFrozen(rv_continuous_frozen):
+    """
+    A frozen continuous distribution that caches its derived quantities. Create one with
+    :py:func:`memoize`.
+    """
+
+    def _cached(self, key, compute):
+        if not _enabled:
+            return compute()
+        memo = self.__dict__.setdefault("_memo", {})
+        if key not in memo:
+            memo[key] = compute()
+        return _copy(memo[key])
+
+    def support(self):
+        return self._cached("support", super().support)
+
+    def mean(self):
+        return self._cached("mean", super().mean)
+
+    def var(self):
+        return self._cached("var", super().var)
+
+    def std(self):
+        return self._cached("std", super().std)
+
+    def median(self):
+        return self._cached("median", super().median)
+
+    def entropy(self):
+        return self._cached("entropy", super().entropy)
+
+    def stats(self, moments="mv"):
+        return self._cached(("stats", moments), functools.partial(super().stats, moments))
+
+    def moment(self, order=None):
+        return self._cached(("moment", _key(order)), functools.partial(super().moment, order))
+
+    def interval(self, confidence=None):
+        compute = functools.partial(super().interval, confidence)
+        return self._cached(("interval", _key(confidence)), compute)
+
+    def ppf(self, q):
+        q_array = np.asarray(q)
+        if not _enabled or q_array.size > PPF_MAX_VALUES or q_array.dtype == object:
+            return super().ppf(q)
+        key = _key(q_array)
+        cache = self.__dict__.setdefault("_ppf_memo", OrderedDict())
+        if key in cache:
+            cache.move_to_end(key)
+        else:
+            cache[key] = super().ppf(q)
+            if len(cache) > PPF_MAX_ENTRIES:
+                cache.popitem(last=False)
+        return _copy(cache[key])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_memo", None)
+        state.pop("_ppf_memo", None)
+        return state
+
+
+def memoize(dist):
+    """
+    A :py:class:`CachedFrozen` view of a frozen continuous distribution, sharing its underlying
+    distribution object. Anything else (and anything while memoization is disabled) is returned
+    unchanged.
+    """
+    if not _enabled or type(dist) is not rv_continuous_frozen:
+        return dist
+    cached = CachedFrozen.__new__(CachedFrozen)
+    cached.__dict__.update(dist.__dict__)
+    return cached
+
+
+def memoized(constructor):
+    """Decorate a constructor, so that it returns :py:func:`memoize` of its result."""
+
+    @functools.wraps(constructor)
+    def wrapper(*args, **kwargs):
+        return memoize(constructor(*args, **kwargs))
+
+    return wrapper
+
+
+def _copy(value):
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value
+
+
+def _key(value):
+    """A hashable key for a number or array (of numbers), or ``None``."""
+    if value is None:
+        return None
+    array = np.asarray(value)
+    return array.dtype.str, array.shape, array.tobytes()
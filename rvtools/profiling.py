@@ -0,0 +1,252 @@
+"""
+Opt-in profiling of calls to distribution methods, to find where time goes in model setup and
+evaluation.
+
+While profiling is enabled, every call to a public method of a SciPy distribution (``ppf``,
+``cdf``, ``rvs``, ``stats``, ...) is counted and timed, keyed by ``(family, method, path)``:
+
+- ``path`` is ``"fallback"`` if the call went through one of SciPy's slow generic
+  implementations, which the family does not override: numerical integration of the PDF for
+  ``cdf``, moments and entropy, numerical differentiation of the CDF for ``pdf``, and root-finding
+  on the CDF for ``ppf`` (also used by ``rvs`` and ``isf``). Otherwise, it is ``"fast"``.
+- The generic implementations themselves are also recorded, as methods ``_pdf``, ``_cdf``,
+  ``_ppf``, ``_munp`` and ``_entropy`` with path ``"fallback"``.
+- Other slow paths (e.g. Python-level loops over the values) can be recorded explicitly, with
+  :py:func:`region`.
+
+Times are inclusive: a call to ``mean`` that calls ``stats`` is counted under both.
+
+SciPy's methods are only patched while profiling is enabled, so there is no overhead otherwise.
+Methods that a family overrides with its own public method (rather than the private ``_ppf``
+etc.) are not seen.
+
+Examples
+--------
+
+>>> from rvtools import profiling
+>>> from rvtools.construct import norm, tp_uniform
+>>> with profiling.profile() as prof:
+...     _ = norm(0, 1).ppf([0.1, 0.9])
+...     _ = tp_uniform(0, 1, 3, 0.3).stats(moments="s")
+>>> prof.report()["norm"]["ppf"]["fast"]["calls"]
+1
+>>> prof.report()["TwoPieceUniform"]["stats"]["fallback"]["calls"]
+1
+
+Or enable profiling globally, e.g. for a whole script:
+
+>>> prof = profiling.enable()
+>>> _ = norm(0, 1).cdf(0)
+>>> profiling.disable() is prof
+True
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional, Union
+
+from scipy.stats import rv_continuous
+from scipy.stats._distn_infrastructure import rv_generic
+
+# Public methods, which are classified as fast or fallback
+PUBLIC_METHODS = {
+    rv_continuous: ["pdf", "logpdf", "cdf", "logcdf", "sf", "logsf", "ppf", "isf", "expect", "fit"],
+    rv_generic: ["rvs", "stats", "moment", "entropy", "median", "mean", "var", "std", "interval"],
+}
+# SciPy's generic implementations, used when a family does not override them
+GENERIC_METHODS = {
+    rv_continuous: ["_pdf", "_cdf", "_entropy"],
+    rv_generic: ["_ppf", "_munp"],
+}
+
+DEFAULT_MAX_EVENTS = 1_000_000
+
+
+class Profile:
+    """
+    Counts and wall times of calls, collected while profiling is enabled.
+
+    :param max_events:
+        Maximum number of individual calls to keep for :py:meth:`to_chrome_trace`. Counts and
+        total times are always complete.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        # (family, method, path) -> [calls, nanoseconds]
+        self._totals = defaultdict(lambda: [0, 0])
+        self._events = []
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def report(self) -> dict:
+        """
+        Nested dictionary ``{family: {method: {path: {"calls": int, "seconds": float}}}}``.
+        """
+        report = {}
+        with self._lock:
+            for (family, method, path), (calls, nanoseconds) in sorted(self._totals.items()):
+                report.setdefault(family, {}).setdefault(method, {})[path] = {
+                    "calls": calls,
+                    "seconds": nanoseconds / 1e9,
+                }
+        return report
+
+    def to_chrome_trace(self, path: Union[str, os.PathLike]):
+        """
+        Write the calls to a JSON file in the `Trace Event Format
+        <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>`_, which
+        can be opened in ``chrome://tracing`` or `Perfetto <https://ui.perfetto.dev>`_.
+        """
+        with self._lock:
+            events = [
+                {
+                    "name": f"{family}.{method}",
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1e3,
+                    "dur": (end - start) / 1e3,
+                    "pid": os.getpid(),
+                    "tid": thread,
+                }
+                for family, method, category, start, end, thread in self._events
+            ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def _record(self, family: str, method: str, path: str, start: int, end: int):
+        with self._lock:
+            totals = self._totals[family, method, path]
+            totals[0] += 1
+            totals[1] += end - start
+            if len(self._events) < self.max_events:
+                self._events.append((family, method, path, start, end, threading.get_ident()))
+
+
+_active: Optional[Profile] = None
+_originals = {}
+_local = threading.local()
+
+
+def enable(profile: Profile = None) -> Profile:
+    """Start recording calls into ``profile`` (a new one by default), and return it."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("Profiling is already enabled.")
+    _active = Profile() if profile is None else profile
+    _patch()
+    return _active
+
+
+def disable() -> Optional[Profile]:
+    """Stop recording calls, and return the profile that was being recorded (if any)."""
+    global _active
+    profile, _active = _active, None
+    _unpatch()
+    return profile
+
+
+def is_enabled() -> bool:
+    return _active is not None
+
+
+@contextmanager
+def profile(max_events: int = DEFAULT_MAX_EVENTS):
+    """Record calls within a ``with`` block."""
+    prof = enable(Profile(max_events))
+    try:
+        yield prof
+    finally:
+        disable()
+
+
+@contextmanager
+def region(family: str, method: str):
+    """
+    Record the code in a ``with`` block as a slow path (``"fallback"``) of ``method`` of
+    ``family``. Does nothing if profiling is disabled.
+    """
+    prof = _active
+    if prof is None:
+        yield
+        return
+    _mark_fallback()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        prof._record(family, method, "fallback", start, time.perf_counter_ns())
+
+
+def family_name(dist) -> str:
+    """``"norm"`` for SciPy's ``norm_gen``, otherwise the class name."""
+    name = type(dist).__name__
+    return name[: -len("_gen")] if name.endswith("_gen") else name
+
+
+def _stack() -> list:
+    """Calls to public methods in progress on this thread, innermost last."""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _mark_fallback():
+    for frame in _stack():
+        frame["fallback"] = True
+
+
+def _wrap_public(func, method: str):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        prof = _active
+        if prof is None:
+            return func(self, *args, **kwargs)
+        frame = {"fallback": False}
+        stack = _stack()
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            end = time.perf_counter_ns()
+            stack.pop()
+            path = "fallback" if frame["fallback"] else "fast"
+            prof._record(family_name(self), method, path, start, end)
+
+    return wrapper
+
+
+def _wrap_generic(func, method: str):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        prof = _active
+        if prof is None:
+            return func(self, *args, **kwargs)
+        _mark_fallback()
+        start = time.perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            prof._record(family_name(self), method, "fallback", start, time.perf_counter_ns())
+
+    return wrapper
+
+
+def _patch():
+    for methods, wrap in [(PUBLIC_METHODS, _wrap_public), (GENERIC_METHODS, _wrap_generic)]:
+        for cls, names in methods.items():
+            for name in names:
+                original = cls.__dict__[name]
+                _originals[cls, name] = original
+                setattr(cls, name, wrap(original, name))
+
+
+def _unpatch():
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
@@ -0,0 +1,189 @@
+"""
+Arithmetic on (frozen) distributions of independent random variables.
+
+Where the result has a closed form, it is returned as a frozen distribution of the appropriate
+family, at the cost of a few floating-point operations:
+
+- sums of independent normals are normal
+- products and (non-zero) powers of independent log-normals are log-normal
+- affine transforms ``scale * X + loc`` with ``scale > 0`` stay in the family of ``X`` (for any
+  SciPy location-scale family, which includes all distributions in :py:mod:`rvtools.dists`)
+- numbers and :py:obj:`rvtools.dists.certainty` distributions are treated as constants
+
+Otherwise, the result is estimated by Monte Carlo: ``size`` samples are drawn from every operand,
+combined, and returned as a histogram distribution (``scipy.stats.rv_histogram``).
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import norm, lognorm, certainty
+>>> from rvtools.propagate import add, multiply, power
+>>> d = add(norm(1, 3), norm(2, 4), 10)
+>>> d.mean(), d.std()
+(13.0, 5.0)
+>>> d = multiply(lognorm(mu=1, sigma=3), power(lognorm(mu=2, sigma=2), 2), certainty(1))
+>>> np.isclose(d.median(), np.exp(5))
+True
+"""
+from numbers import Real
+from typing import Union
+
+import numpy as np
+import scipy
+from scipy.stats.distributions import rv_frozen
+
+from rvtools._random import check_random_state
+from rvtools.construct.lognorm import from_params as lognorm_from_params
+from rvtools.dists import certainty
+from rvtools.fam import is_frozen_certainty, is_frozen_lognorm, is_frozen_norm
+
+Operand = Union[Real, rv_frozen]
+
+DEFAULT_SIZE = 1_000_000
+
+
+def add(*terms: Operand, size: int = DEFAULT_SIZE, random_state=None) -> rv_frozen:
+    """
+    The distribution of the sum of independent ``terms``.
+
+    >>> from rvtools.construct import norm
+    >>> add(norm(0, 1), 5).mean()
+    5.0
+    """
+    constant = sum(_constant(t) for t in terms if _is_constant(t))
+    dists = [t for t in terms if not _is_constant(t)]
+
+    if not dists:
+        return certainty(constant)
+    if len(dists) == 1:
+        return affine(dists[0], loc=constant, size=size, random_state=random_state)
+    if all(is_frozen_norm(d) for d in dists):
+        mean = sum(d.mean() for d in dists) + constant
+        sd = np.sqrt(sum(d.var() for d in dists))
+        return scipy.stats.norm(mean, sd)
+
+    # One generator for all terms, so that they are independent even given an integer seed
+    rng = check_random_state(random_state)
+    samples = sum(d.rvs(size=size, random_state=rng) for d in dists)
+    return _from_samples(samples + constant)
+
+
+def multiply(*factors: Operand, size: int = DEFAULT_SIZE, random_state=None) -> rv_frozen:
+    """
+    The distribution of the product of independent ``factors``.
+
+    >>> import numpy as np
+    >>> from rvtools.construct import lognorm
+    >>> d = multiply(lognorm(mu=0, sigma=3), lognorm(mu=1, sigma=4))
+    >>> np.isclose(d.median(), np.exp(1))
+    True
+    """
+    constant = np.prod([_constant(f) for f in factors if _is_constant(f)])
+    dists = [f for f in factors if not _is_constant(f)]
+
+    if not dists or constant == 0:
+        return certainty(constant)
+    if len(dists) == 1:
+        return affine(dists[0], scale=constant, size=size, random_state=random_state)
+    if constant > 0 and all(_is_plain_lognorm(d) for d in dists):
+        params = [_lognorm_params(d) for d in dists]
+        mu = sum(mu for mu, _ in params) + np.log(constant)
+        sigma = np.sqrt(sum(sigma**2 for _, sigma in params))
+        return lognorm_from_params(mu, sigma)
+
+    rng = check_random_state(random_state)
+    samples = np.prod([d.rvs(size=size, random_state=rng) for d in dists], axis=0)
+    return _from_samples(samples * constant)
+
+
+def power(base: Operand, exponent: Real, size: int = DEFAULT_SIZE, random_state=None) -> rv_frozen:
+    """
+    The distribution of ``base ** exponent``.
+
+    >>> import numpy as np
+    >>> from rvtools.construct import lognorm
+    >>> d = power(lognorm(mu=1, sigma=2), -2)
+    >>> np.isclose(d.median(), np.exp(-2))
+    True
+    """
+    if _is_constant(base):
+        return certainty(_constant(base) ** exponent)
+    if exponent == 0:
+        return certainty(1)
+    if exponent == 1:
+        return base
+    if _is_plain_lognorm(base):
+        mu, sigma = _lognorm_params(base)
+        return lognorm_from_params(exponent * mu, abs(exponent) * sigma)
+
+    return _from_samples(base.rvs(size=size, random_state=random_state) ** exponent)
+
+
+def affine(
+    dist: Operand, scale: Real = 1, loc: Real = 0, size: int = DEFAULT_SIZE, random_state=None
+) -> rv_frozen:
+    """
+    The distribution of ``scale * dist + loc``.
+
+    This is closed-form for any location-scale family when ``scale > 0``, and for symmetric
+    families (normal and uniform) when ``scale < 0``.
+
+    >>> from rvtools.construct import uniform
+    >>> affine(uniform(0, 1), scale=-2, loc=1).support()
+    (-1.0, 1.0)
+    """
+    if _is_constant(dist):
+        return certainty(scale * _constant(dist) + loc)
+    if scale == 0:
+        return certainty(loc)
+    if scale == 1 and loc == 0:
+        return dist
+
+    shapes, old_loc, old_scale = dist.dist._parse_args(*dist.args, **dist.kwds)
+    if scale > 0:
+        return dist.dist.freeze(*shapes, loc=scale * old_loc + loc, scale=scale * old_scale)
+    if is_frozen_norm(dist):
+        return scipy.stats.norm(scale * old_loc + loc, -scale * old_scale)
+    if isinstance(dist.dist, scipy.stats._continuous_distns.uniform_gen):
+        # Reflecting [old_loc, old_loc + old_scale] moves the left bound to the right end
+        new_loc = scale * (old_loc + old_scale) + loc
+        return scipy.stats.uniform(new_loc, -scale * old_scale)
+
+    return _from_samples(scale * dist.rvs(size=size, random_state=random_state) + loc)
+
+
+def _is_constant(operand: Operand) -> bool:
+    return isinstance(operand, Real) or is_frozen_certainty(operand)
+
+
+def _constant(operand: Operand) -> Real:
+    if isinstance(operand, Real):
+        return operand
+    # Works whatever the ``loc`` and ``scale`` of the frozen certainty
+    return operand.ppf(0.5)
+
+
+def _is_plain_lognorm(dist) -> bool:
+    """A log-normal with ``loc=0``, i.e. one whose log is normally distributed."""
+    if not is_frozen_lognorm(dist):
+        return False
+    _, loc, _ = dist.dist._parse_args(*dist.args, **dist.kwds)
+    return loc == 0
+
+
+def _lognorm_params(dist) -> tuple[Real, Real]:
+    """``mu`` and ``sigma`` of a frozen SciPy log-normal (with ``loc=0``)."""
+    (sigma,), _, scale = dist.dist._parse_args(*dist.args, **dist.kwds)
+    return np.log(scale), sigma
+
+
+def _from_samples(samples, bins=1000) -> rv_frozen:
+    """
+    Fallback when there is no closed form: a histogram of Monte Carlo samples.
+
+    Bins have equal probability mass rather than equal width, so that heavy tails do not squash
+    the bulk of the distribution into a handful of bins.
+    """
+    edges = np.unique(np.quantile(samples, np.linspace(0, 1, bins + 1)))
+    return scipy.stats.rv_histogram(np.histogram(samples, bins=edges), density=False).freeze()
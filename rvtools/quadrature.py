@@ -0,0 +1,269 @@
+"""
+Deterministic expectations of models with a few inputs, by Gauss-Hermite quadrature.
+
+For a model with 2-6 smooth inputs, Monte Carlo needs millions of samples for a few digits of
+precision. :py:func:`expect` instead evaluates the model on a grid of nodes in the latent space
+of the Gaussian copula (where the inputs are correlated standard normals), mapped to the inputs
+through each marginal's ``ppf``, and sums the outputs with Gauss-Hermite weights. For a smooth
+model, a few hundred evaluations typically give 6 or more digits. Convergence is fastest for
+inputs that are smooth functions of their latent normal (e.g. normal and log-normal inputs), and
+slower for bounded inputs (e.g. uniform and beta).
+
+Two kinds of grid are available:
+
+- ``"tensor"``: the product of one-dimensional rules with ``2 * level - 1`` nodes each, so
+  ``(2 * level - 1) ** d`` nodes for ``d`` inputs.
+- ``"sparse"``: a Smolyak sparse grid, combining products of one-dimensional rules with 1, 3, 5,
+  ..., ``2 * level - 1`` nodes. It needs far fewer nodes than a tensor grid of similar accuracy
+  once there are more than 2 or 3 inputs.
+
+The level is increased until two successive levels agree to within the tolerance. Their
+difference is reported as the error estimate. Outputs at nodes shared between levels are
+reused.
+
+Point masses are handled exactly, rather than integrated through a ``ppf`` with jumps:
+certainties take no grid dimension at all, and independent mixtures (e.g. a certainty of 0 with
+a log-normal) and Bernoulli inputs are expanded into the sum of their components, weighted by
+their probabilities. Correlated mixtures and Bernoulli inputs are integrated through their
+``ppf``, which converges slowly.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import certainty, lognorm, mixture, norm
+>>> from rvtools.quadrature import expect
+>>> inputs = {
+...     "price": lognorm(mu=0, sigma=0.5),
+...     "quantity": norm(10, 2),
+...     "discount": mixture([certainty(0), norm(1, 0.1)], [0.8, 0.2]),
+... }
+>>> def model(x):
+...     return x["price"] * x["quantity"] - x["discount"]
+>>> result = expect(model, inputs)
+>>> round(result.value, 8)  # Exactly exp(0.125) * 10 - 0.2
+11.13148453
+>>> result.converged, result.n_evaluations
+(True, 150)
+"""
+import functools
+import itertools
+from math import comb
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from rvtools._joint import Inputs, Unpacked, check_output, to_inputs, unpack
+from rvtools.fam import is_frozen_bernoulli, is_frozen_certainty, is_frozen_mixture
+
+METHODS = ("auto", "tensor", "sparse")
+# Nodes closer than this (in the latent space) are the same node
+_NODE_DECIMALS = 12
+
+
+class Expectation(NamedTuple):
+    #: Estimate of the expected output
+    value: float
+    #: Difference between the estimates of the last two levels
+    error: float
+    #: Number of model evaluations, over all levels
+    n_evaluations: int
+    #: The level of the grid of ``value``
+    level: int
+    #: Whether ``error`` is within the tolerance (rather than ``max_evaluations`` being reached)
+    converged: bool
+
+
+def expect(
+    model: Callable[[dict], np.ndarray],
+    inputs: Inputs,
+    *,
+    rtol: float = 1e-6,
+    atol: float = 0.0,
+    method: str = "auto",
+    max_evaluations: int = 10_000,
+) -> Expectation:
+    """
+    The expectation of ``model(inputs)``, by Gauss-Hermite quadrature in the latent space.
+
+    :param model:
+        A vectorized function of the inputs (see :ref:`models`), called on the quadrature nodes.
+    :param inputs: The random inputs of the model. See :ref:`models`.
+    :param rtol: Tolerance on the error estimate, relative to the absolute value of the estimate.
+    :param atol: Absolute tolerance on the error estimate. Either tolerance suffices.
+    :param method:
+        ``"tensor"`` or ``"sparse"`` grids. ``"auto"`` uses tensor grids for up to 2 dimensions
+        (inputs that are not point masses), and sparse grids otherwise.
+    :param max_evaluations:
+        Stop (without converging) rather than evaluate a level that would bring the total number
+        of model evaluations above this.
+    """
+    if method not in METHODS:
+        raise ValueError(f"`method` must be one of {METHODS}, got {method!r}.")
+    unpacked = unpack(inputs)
+    scenarios = [_Scenario(model, unpacked, weight, fixed) for weight, fixed in _expand(unpacked)]
+    n_dims = max(len(scenario.active) for scenario in scenarios)
+    if method == "auto":
+        method = "tensor" if n_dims <= 2 else "sparse"
+    grid = _tensor_grid if method == "tensor" else _sparse_grid
+
+    previous, error = None, np.inf
+    level, n_evaluations = 1, 0
+    while True:
+        grids = [grid(len(scenario.active), level) for scenario in scenarios]
+        n_new = sum(scenario.n_new(nodes) for scenario, (nodes, _) in zip(scenarios, grids))
+        if previous is not None and n_evaluations + n_new > max_evaluations:
+            return Expectation(previous, error, n_evaluations, level - 1, False)
+        n_evaluations += n_new
+        value = float(
+            sum(
+                scenario.weight * (weights @ scenario.outputs(nodes))
+                for scenario, (nodes, weights) in zip(scenarios, grids)
+            )
+        )
+        if n_dims == 0:
+            return Expectation(value, 0.0, n_evaluations, level, True)
+        if previous is not None:
+            error = abs(value - previous)
+            if error <= max(atol, rtol * abs(value)):
+                return Expectation(value, error, n_evaluations, level, True)
+        previous = value
+        level += 1
+
+
+def _expand(unpacked: Unpacked) -> list[tuple[float, dict]]:
+    """
+    Split independent inputs with point masses into scenarios, with their probabilities. In each
+    scenario, some inputs are fixed to a point mass (or to a component of a mixture), given by a
+    dictionary mapping their positions to their distributions.
+    """
+    options = []
+    for j, marginal in enumerate(unpacked.marginals):
+        correlated = np.any(np.delete(unpacked.corr[j], j) != 0)
+        if is_frozen_mixture(marginal) and not correlated:
+            components, weights = marginal.dist._components, marginal.dist._weights
+            options.append([(w, {j: c}) for c, w in zip(components, weights) if w > 0])
+        elif is_frozen_bernoulli(marginal) and not correlated:
+            low, high = marginal.support()
+            p = float(marginal.pmf(high))
+            options.append([(1 - p, {j: float(low)}), (p, {j: float(high)})])
+        else:
+            options.append([(1.0, {j: marginal})])
+
+    scenarios = []
+    for combination in itertools.product(*options):
+        weight = float(np.prod([w for w, _ in combination]))
+        if weight > 0:
+            scenarios.append(
+                (weight, {j: d for _, option in combination for j, d in option.items()})
+            )
+    return scenarios
+
+
+class _Scenario:
+    """
+    The model, with some inputs fixed to point masses, as a function of the latent normals of
+    the other ("active") inputs. Remembers the outputs at the nodes it has been evaluated at.
+    """
+
+    def __init__(self, model, unpacked: Unpacked, weight: float, distributions: dict):
+        self.model = model
+        self.weight = weight
+        self.names = unpacked.names
+        self.fixed, active = {}, []
+        for j in range(len(unpacked.names)):
+            dist = distributions[j]
+            if isinstance(dist, float):
+                self.fixed[j] = dist
+            elif is_frozen_certainty(dist):
+                self.fixed[j] = float(dist.ppf(0.5))
+            else:
+                active.append(j)
+        self.active = active
+        corr = unpacked.corr[np.ix_(active, active)]
+        self.cholesky = np.linalg.cholesky(corr) if active else np.zeros((0, 0))
+        self.unpacked = Unpacked(
+            [unpacked.names[j] for j in active],
+            [distributions[j] for j in active],
+            corr,
+            unpacked.named,
+        )
+        self.known = {}
+
+    def n_new(self, nodes: np.ndarray) -> int:
+        return sum(key not in self.known for key in set(self._keys(nodes)))
+
+    def outputs(self, nodes: np.ndarray) -> np.ndarray:
+        keys = self._keys(nodes)
+        new = {}
+        for i, key in enumerate(keys):
+            if key not in self.known:
+                new.setdefault(key, i)
+        if new:
+            rows = nodes[list(new.values())]
+            self.known.update(zip(new, self._evaluate(rows)))
+        return np.array([self.known[key] for key in keys])
+
+    def _keys(self, nodes: np.ndarray) -> list[bytes]:
+        rounded = np.round(nodes, _NODE_DECIMALS) + 0.0  # Without negative zeros
+        return [row.tobytes() for row in rounded]
+
+    def _evaluate(self, nodes: np.ndarray) -> np.ndarray:
+        values = to_inputs(self.unpacked, nodes @ self.cholesky.T)
+        for j, value in self.fixed.items():
+            values[self.names[j]] = np.full(len(nodes), value)
+        return check_output(self.model({name: values[name] for name in self.names}), len(nodes))
+
+
+@functools.lru_cache(maxsize=None)
+def _gauss_hermite(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Nodes and weights of the ``n``-point Gauss-Hermite rule for the standard normal."""
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n)
+    return nodes, weights / weights.sum()
+
+
+@functools.lru_cache(maxsize=None)
+def _tensor_grid(n_dims: int, level: int) -> tuple[np.ndarray, np.ndarray]:
+    return _product([2 * level - 1] * n_dims)
+
+
+@functools.lru_cache(maxsize=None)
+def _sparse_grid(n_dims: int, level: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Smolyak's combination of products of the ``2 * i - 1``-point rules, for multi-indices ``i``
+    (from 1) with ``max(n_dims, level) <= sum(i) <= level + n_dims - 1``. Duplicate nodes are
+    merged.
+    """
+    if n_dims == 0:
+        return _product([])
+    all_nodes, all_weights = [], []
+    top = level + n_dims - 1
+    for index in _compositions(n_dims, max(n_dims, level), top):
+        coefficient = (-1) ** (top - sum(index)) * comb(n_dims - 1, top - sum(index))
+        nodes, weights = _product([2 * i - 1 for i in index])
+        all_nodes.append(nodes)
+        all_weights.append(coefficient * weights)
+    nodes = np.round(np.concatenate(all_nodes), _NODE_DECIMALS) + 0.0
+    unique, inverse = np.unique(nodes, axis=0, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), weights=np.concatenate(all_weights))
+    keep = weights != 0
+    return unique[keep], weights[keep]
+
+
+def _product(sizes: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    rules = [_gauss_hermite(n) for n in sizes]
+    if not rules:
+        return np.zeros((1, 0)), np.ones(1)
+    nodes = np.stack(np.meshgrid(*[r[0] for r in rules], indexing="ij"), -1)
+    weights = functools.reduce(np.multiply.outer, [r[1] for r in rules])
+    return nodes.reshape(-1, len(sizes)), weights.ravel()
+
+
+def _compositions(n_dims: int, low: int, high: int):
+    """Tuples of ``n_dims`` positive integers whose sum is between ``low`` and ``high``."""
+    if n_dims == 1:
+        yield from ((i,) for i in range(max(low, 1), high + 1))
+        return
+    for first in range(1, high - n_dims + 2):
+        for rest in _compositions(n_dims - 1, low - first, high - first):
+            yield (first,) + rest
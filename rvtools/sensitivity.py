@@ -0,0 +1,175 @@
+"""
+Variance-based global sensitivity analysis: which inputs of a model matter, and how much.
+
+The first-order Sobol index of an input is the fraction of the variance of the output that
+would be removed by knowing that input (``Var(E[Y | X_i]) / Var(Y)``). The total index is the
+fraction that would remain if all other inputs were known (``E[Var(Y | X_~i)] / Var(Y)``), so it
+includes the effect of the input's interactions with the others.
+
+Examples
+--------
+
+>>> from rvtools.construct import norm, uniform
+>>> from rvtools.sensitivity import sobol
+>>> inputs = {"a": norm(1, 1), "b": norm(0, 2), "c": uniform(0, 1)}
+>>> def model(x):
+...     return x["a"] + x["b"] + x["a"] * x["c"]
+>>> indices = sobol(model, inputs, 20_000, random_state=0)
+>>> indices.to_frame()[["first_order", "total"]].round(2)
+   first_order  total
+a         0.35   0.37
+b         0.62   0.62
+c         0.01   0.03
+"""
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from rvtools._joint import Inputs, chunks, evaluate, is_independent, unpack
+
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+class SobolIndices(NamedTuple):
+    names: list
+    first_order: np.ndarray
+    total: np.ndarray
+    #: Bootstrap confidence intervals, one row ``(low, high)`` per input
+    first_order_ci: np.ndarray
+    total_ci: np.ndarray
+    #: Variance of the output
+    variance: float
+
+    def to_frame(self) -> pd.DataFrame:
+        """The indices and confidence intervals as a ``DataFrame`` with one row per input."""
+        return pd.DataFrame(
+            {
+                "first_order": self.first_order,
+                "first_order_low": self.first_order_ci[:, 0],
+                "first_order_high": self.first_order_ci[:, 1],
+                "total": self.total,
+                "total_low": self.total_ci[:, 0],
+                "total_high": self.total_ci[:, 1],
+            },
+            index=self.names,
+        )
+
+
+def sobol(
+    model: Callable[[dict], np.ndarray],
+    inputs: Inputs,
+    size: int = 10_000,
+    *,
+    n_bootstrap: int = 200,
+    confidence: float = 0.95,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> SobolIndices:
+    """
+    Estimate the first-order and total Sobol indices of each input of ``model``.
+
+    :param model:
+        A vectorized function of the inputs (see :ref:`models`), called on at most
+        ``chunk_size`` samples at a time.
+    :param inputs: The random inputs of the model. See :ref:`models`.
+    :param size:
+        The number of base samples. The model is evaluated on ``size * (n_inputs + 2)`` samples
+        for independent inputs, and ``size * (n_inputs + 1)`` for correlated inputs.
+    :param n_bootstrap: The number of bootstrap resamples for the confidence intervals.
+    :param confidence: The level of the (percentile bootstrap) confidence intervals.
+
+    For independent inputs, first-order indices are estimated with the estimator of `Saltelli
+    et al. (2010) <https://doi.org/10.1016/j.cpc.2009.09.018>`_, and total indices with that of
+    Jansen (1999), from a base sample and one sample per input in which only that input is
+    redrawn.
+
+    For correlated inputs, the classic estimators do not apply, because redrawing one input
+    independently of the others leaves the joint distribution. Instead:
+
+    - first-order indices are estimated from the base sample alone, with the rank-based
+      estimator of `Gamboa et al. (2022) <https://doi.org/10.1016/j.ejor.2020.11.051>`_: sorted
+      by ``X_i``, neighboring outputs share (nearly) the same ``X_i``, so the covariance of
+      neighbors estimates ``Var(E[Y | X_i])``
+    - total indices are estimated with Jansen's estimator, but redrawing each input from its
+      conditional distribution given the others, which is normal in the latent space of the
+      Gaussian copula (following `Kucherenko et al. (2012)
+      <https://doi.org/10.1016/j.cpc.2011.12.020>`_)
+
+    With correlated inputs, indices need not sum to one even for additive models: an input
+    correlated with an important input has a high first-order index, and a low total index.
+    """
+    unpacked = unpack(inputs)
+    n_inputs = len(unpacked.names)
+    rng = np.random.default_rng(random_state)
+    cholesky = np.linalg.cholesky(unpacked.corr)
+    independent = is_independent(unpacked.corr)
+
+    base = rng.standard_normal((size, n_inputs)) @ cholesky.T
+    # For independent inputs, this is the second sample matrix of Saltelli's scheme
+    fresh = rng.standard_normal((size, n_inputs))
+
+    y_base = evaluate(model, unpacked, chunks(base, chunk_size))
+    y_redrawn = np.empty((n_inputs, size))
+    for i in range(n_inputs):
+        redrawn = (
+            _redraw(latent, i, innovations[:, i], unpacked.corr)
+            for latent, innovations in zip(chunks(base, chunk_size), chunks(fresh, chunk_size))
+        )
+        y_redrawn[i] = evaluate(model, unpacked, redrawn)
+
+    if independent:
+        y_fresh = evaluate(model, unpacked, chunks(fresh, chunk_size))
+
+        def estimate(rows):
+            a, b, ab = y_base[rows], y_fresh[rows], y_redrawn[:, rows]
+            variance = np.var(np.concatenate([a, b]))
+            first_order = np.mean(b * (ab - a), axis=1) / variance
+            total = 0.5 * np.mean((a - ab) ** 2, axis=1) / variance
+            return first_order, total, variance
+
+    else:
+        # The marginal quantile functions are increasing, so sorting by the latent normals sorts
+        # by the inputs
+        y_sorted = y_base[np.argsort(base, axis=0).T]
+        neighbor_products = y_sorted[:, :-1] * y_sorted[:, 1:]
+
+        def estimate(rows):
+            a, ab = y_base[rows], y_redrawn[:, rows]
+            variance = np.var(a)
+            pairs = np.minimum(rows, size - 2)
+            first_order = (np.mean(neighbor_products[:, pairs], axis=1) - a.mean() ** 2) / variance
+            total = 0.5 * np.mean((a - ab) ** 2, axis=1) / variance
+            return first_order, total, variance
+
+    first_order, total, variance = estimate(np.arange(size))
+    boot_first_order = np.empty((n_bootstrap, n_inputs))
+    boot_total = np.empty((n_bootstrap, n_inputs))
+    for b in range(n_bootstrap):
+        boot_first_order[b], boot_total[b], _ = estimate(rng.integers(0, size, size))
+    tail = (1 - confidence) / 2
+    return SobolIndices(
+        names=unpacked.names,
+        first_order=first_order,
+        total=total,
+        first_order_ci=np.quantile(boot_first_order, [tail, 1 - tail], axis=0).T,
+        total_ci=np.quantile(boot_total, [tail, 1 - tail], axis=0).T,
+        variance=float(variance),
+    )
+
+
+def _redraw(latent: np.ndarray, i: int, innovations: np.ndarray, corr: np.ndarray) -> np.ndarray:
+    """
+    Copy of ``latent`` with column ``i`` redrawn from its conditional distribution given the
+    other columns (standard normal with correlation matrix ``corr``), using the standard
+    normal ``innovations``.
+    """
+    others = np.arange(len(corr)) != i
+    redrawn = latent.copy()
+    if not others.any():
+        redrawn[:, i] = innovations
+        return redrawn
+    coefficients = np.linalg.solve(corr[np.ix_(others, others)], corr[others, i])
+    conditional_sd = np.sqrt(max(1 - coefficients @ corr[others, i], 0))
+    redrawn[:, i] = latent[:, others] @ coefficients + conditional_sd * innovations
+    return redrawn
@@ -0,0 +1,338 @@
+"""
+A local HTTP server that holds distributions in memory, and answers requests for samples,
+quantiles and CDF values, so that other processes need not import SciPy and construct the
+distributions themselves.
+
+Concurrent requests for the same distribution and method are coalesced: requests arriving within
+``batch_window`` seconds of each other are concatenated into a single vectorized call to ``rvs``,
+``ppf`` or ``cdf``, whose result is split between them.
+
+Start it from the command line, with a dictionary of distributions (or ``CopulaJoint`` models)
+defined in an importable module, or a function returning one::
+
+    rvtools serve my_models:MODELS --port 8000
+    rvtools serve my_models:MODELS --unix /tmp/rvtools.sock
+
+Endpoints
+---------
+
+``GET /models``
+    A JSON object describing the available models.
+
+``POST /models/<name>/rvs?size=<n>[&seed=<seed>]``
+    ``n`` random samples. Requests with a ``seed`` are reproducible, and are not coalesced with
+    other requests. For a ``CopulaJoint``, the array has one column per marginal, and the
+    ``X-Columns`` header lists their names as JSON.
+
+``POST /models/<name>/ppf`` and ``POST /models/<name>/cdf``
+    The request body is an array (of any shape) of probabilities or values. The response has
+    the same shape.
+
+Arrays are sent and returned in the ``.npy`` format (``np.save`` and ``np.load``), with content
+type ``application/x-npy``. Errors are returned as JSON objects with an ``error`` key.
+"""
+import asyncio
+import functools
+import importlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+from copula_wrapper import CopulaJoint
+
+NPY_CONTENT_TYPE = "application/x-npy"
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 2**22
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SamplingServer:
+    """
+    :param models: A dictionary mapping names to frozen distributions or ``CopulaJoint`` models.
+    :param batch_window:
+        How long (in seconds) to wait for other requests to coalesce with, after the first
+        request of a batch arrives.
+    :param max_batch_size:
+        A batch is evaluated as soon as it has this many values (samples, probabilities, etc.).
+    :param random_state: Seed of the random generator for requests without a ``seed``.
+
+    The distributions' methods are called in a single worker thread, so the event loop keeps
+    accepting requests while a batch is evaluated.
+    """
+
+    def __init__(
+        self,
+        models: dict[str, Any],
+        *,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        random_state=None,
+    ):
+        self.models = dict(models)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._rng = np.random.default_rng(random_state)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rvtools-serve")
+        self._batchers = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000, *, path: str = None):
+        """Start listening on ``host:port``, or on the Unix socket ``path`` if it is given."""
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000, *, path: str = None):
+        server = await self.start(host, port, path=path)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def evaluate(self, name: str, method: str, values=None, size: int = None, seed=None):
+        """
+        Result of a request, without the HTTP layer: ``rvs`` of ``size`` samples (with ``seed``),
+        or ``ppf`` or ``cdf`` of ``values``.
+        """
+        model = self._model(name)
+        loop = asyncio.get_running_loop()
+        if method == "rvs":
+            if size is None or size < 0:
+                raise HTTPError(400, "'rvs' requires a non-negative 'size'.")
+            if seed is not None:
+                call = functools.partial(_rvs, model, size, np.random.default_rng(seed))
+                return await loop.run_in_executor(self._executor, call)
+            return await self._batcher(name, method).submit(size, size)
+
+        if method not in ("ppf", "cdf"):
+            raise HTTPError(404, f"Unknown method {method!r}. Expected 'rvs', 'ppf' or 'cdf'.")
+        if isinstance(model, CopulaJoint):
+            raise HTTPError(400, f"{name!r} is a joint distribution, which only supports 'rvs'.")
+        values = np.asarray(values, dtype=float)
+        result = await self._batcher(name, method).submit(values.ravel(), values.size)
+        return result.reshape(values.shape)
+
+    def _model(self, name: str):
+        try:
+            return self.models[name]
+        except KeyError:
+            raise HTTPError(404, f"Unknown model {name!r}.") from None
+
+    def _batcher(self, name: str, method: str) -> "_Batcher":
+        key = name, method
+        if key not in self._batchers:
+            model = self.models[name]
+            if method == "rvs":
+                run = functools.partial(_batch_rvs, model, self._rng)
+            else:
+                run = functools.partial(_batch_evaluate, getattr(model, method))
+            self._batchers[key] = _Batcher(
+                run, self._executor, self.batch_window, self.max_batch_size
+            )
+        return self._batchers[key]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    # The rest of the stream cannot be parsed reliably, so close the connection
+                    _write_response(writer, *_json_response(e.status, str(e)))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, response_headers, payload = await self._respond(method, target, body)
+                except HTTPError as e:
+                    status, response_headers, payload = _json_response(e.status, str(e))
+                except Exception as e:  # The model's methods may raise anything
+                    status, response_headers, payload = _json_response(400, repr(e))
+                _write_response(writer, status, response_headers, payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if parts == ["models"]:
+            if method != "GET":
+                raise HTTPError(405, "Use GET to list models.")
+            description = {name: _describe(model) for name, model in self.models.items()}
+            return _json_response(200, description)
+
+        if len(parts) != 3 or parts[0] != "models":
+            raise HTTPError(404, f"Unknown path {url.path!r}.")
+        if method != "POST":
+            raise HTTPError(405, "Use POST to query a model.")
+        _, name, model_method = parts
+
+        headers = {}
+        if model_method == "rvs":
+            try:
+                size = int(query["size"])
+                seed = int(query["seed"]) if "seed" in query else None
+            except (KeyError, ValueError):
+                raise HTTPError(400, "'rvs' requires an integer 'size' (and optional 'seed').")
+            result = await self.evaluate(name, "rvs", size=size, seed=seed)
+            model = self._model(name)
+            if isinstance(model, CopulaJoint) and model._idx_to_name:
+                headers["X-Columns"] = json.dumps([str(c) for c in model._idx_to_name])
+        else:
+            result = await self.evaluate(name, model_method, values=_load_npy(body))
+        return 200, {"Content-Type": NPY_CONTENT_TYPE, **headers}, _dump_npy(result)
+
+
+class _Batcher:
+    """
+    Collects items submitted within ``window`` seconds, and evaluates them with a single call
+    to ``run(items)``, which returns one result per item.
+    """
+
+    def __init__(self, run: Callable[[list], list], executor, window: float, max_size: int):
+        self._run = run
+        self._executor = executor
+        self._window = window
+        self._max_size = max_size
+        self._pending = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def submit(self, item, size: int) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self._pending_size += size
+        if self._pending_size >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_size = self._pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._evaluate(batch))
+
+    async def _evaluate(self, batch):
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, self._run, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        # Futures of requests whose client disconnected may have been cancelled
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _rvs(model, size: int, rng) -> np.ndarray:
+    return np.asarray(model.rvs(size=size, random_state=rng))
+
+
+def _batch_rvs(model, rng, sizes: list[int]) -> list[np.ndarray]:
+    samples = _rvs(model, sum(sizes), rng)
+    return np.split(samples, np.cumsum(sizes)[:-1])
+
+
+def _batch_evaluate(method, arrays: list[np.ndarray]) -> list[np.ndarray]:
+    values = method(np.concatenate(arrays))
+    return np.split(np.asarray(values), np.cumsum([len(a) for a in arrays])[:-1])
+
+
+def _describe(model) -> dict:
+    if isinstance(model, CopulaJoint):
+        columns = model._idx_to_name or list(range(len(model.marginals)))
+        return {"kind": "joint", "columns": [str(c) for c in columns]}
+    return {"kind": "univariate", "family": type(model.dist).__name__}
+
+
+def load_models(spec: str) -> dict:
+    """
+    Import models from a ``"module:attribute"`` specification. The attribute is a dictionary of
+    models, or a function returning one.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected 'module:attribute', got {spec!r}.")
+    models = getattr(importlib.import_module(module_name), attribute)
+    if callable(models):
+        models = models()
+    if not isinstance(models, dict):
+        raise TypeError(f"Expected {spec} to be a dictionary of models, got {type(models)}.")
+    return models
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """``(method, target, headers, body)``, or ``None`` at the end of the stream."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    request_line = line.decode("latin-1").strip()
+    try:
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, f"Malformed request line {request_line!r}.") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    content_length = headers.get("content-length", "0")
+    if not content_length.isdigit():
+        raise HTTPError(400, f"Invalid Content-Length {content_length!r}.")
+    body = await reader.readexactly(int(content_length))
+    return method, target, headers, body
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, headers: dict, body: bytes):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    lines += [f"{key}: {value}" for key, value in headers.items()]
+    lines.append(f"Content-Length: {len(body)}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def _json_response(status: int, content) -> tuple[int, dict, bytes]:
+    if status != 200:
+        content = {"error": content}
+    return status, {"Content-Type": "application/json"}, json.dumps(content).encode()
+
+
+def _load_npy(body: bytes) -> np.ndarray:
+    try:
+        return np.load(io.BytesIO(body), allow_pickle=False)
+    except ValueError as e:
+        raise HTTPError(400, f"Could not read the request body as a .npy array: {e}") from None
+
+
+def _dump_npy(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
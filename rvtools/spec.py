@@ -0,0 +1,193 @@
+"""
+Build a ``CopulaJoint`` from a model specification in JSON or TOML, and stream samples of it to
+disk in bounded memory.
+
+A specification names a constructor from :py:mod:`rvtools.construct` for each marginal, with
+the constructor's keyword arguments (or positional ``args``), and optionally lists rank
+correlations as ``[name, name, value]`` triples:
+
+.. code-block:: toml
+
+    seed = 0
+    kendall_tau = [["cost", "duration", 0.4]]
+
+    [marginals.cost]
+    family = "lognorm"
+    p5 = 10
+    p95 = 100
+
+    [marginals.duration]
+    family = "pert"
+    args = [1, 2, 6]
+
+    [marginals.share]
+    family = "beta"
+    quantiles = { "0.1" = 0.2, "0.9" = 0.6 }
+
+From the command line::
+
+    rvtools sample model.toml --size 100000000 --out samples/
+    rvtools sample model.json --size 100000000 --out samples.parquet --seed 1
+
+Examples
+--------
+
+>>> from rvtools.spec import from_dict
+>>> joint = from_dict({
+...     "marginals": {
+...         "cost": {"family": "lognorm", "p5": 10, "p95": 100},
+...         "duration": {"family": "pert", "args": [1, 2, 6]},
+...     },
+...     "kendall_tau": [["cost", "duration", 0.4]],
+... })
+>>> list(joint.marginals)
+['cost', 'duration']
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+from copula_wrapper import CopulaJoint
+
+from rvtools._joint import to_inputs, unpack
+
+DEFAULT_CHUNK_SIZE = 2**20
+CORRELATIONS = ("kendall_tau", "spearman_rho")
+# Constructors in rvtools.construct that a specification may use
+FAMILIES = ["beta", "certainty", "lognorm", "loguniform", "norm", "pert", "tp_uniform", "uniform"]
+
+
+def load(path: Union[str, os.PathLike]) -> dict:
+    """Read a specification from a ``.json`` or ``.toml`` file."""
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path) as f:
+            return json.load(f)
+    if path.suffix == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            tomllib = _import_optional("tomli", "to read TOML files on Python < 3.11")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    raise ValueError(f"Expected a .json or .toml file, got {path}.")
+
+
+def from_dict(spec: dict) -> CopulaJoint:
+    """Build the ``CopulaJoint`` described by a specification."""
+    unknown = spec.keys() - {"marginals", "seed", *CORRELATIONS}
+    if unknown:
+        raise ValueError(f"Unknown keys in the specification: {sorted(unknown)}.")
+    if not spec.get("marginals"):
+        raise ValueError("The specification has no marginals.")
+    marginals = {name: marginal(entry) for name, entry in spec["marginals"].items()}
+    correlations = {}
+    for key in CORRELATIONS:
+        if key in spec:
+            correlations[key] = {(a, b): value for a, b, value in spec[key]}
+    if not correlations:
+        correlations["kendall_tau"] = {}
+    return CopulaJoint(marginals, **correlations)
+
+
+def marginal(entry: dict):
+    """The frozen distribution described by one entry of ``marginals``."""
+    import rvtools.construct
+
+    kwargs = dict(entry)
+    try:
+        family = kwargs.pop("family")
+    except KeyError:
+        raise ValueError(f"Marginal {entry} has no 'family'.") from None
+    constructor = getattr(rvtools.construct, family, None)
+    if family not in FAMILIES or constructor is None:
+        raise ValueError(f"Unknown family {family!r}. Expected one of {FAMILIES}.")
+    args = kwargs.pop("args", [])
+    if "quantiles" in kwargs:
+        # JSON and TOML keys are strings
+        kwargs["quantiles"] = {float(p): x for p, x in kwargs["quantiles"].items()}
+    return constructor(*args, **kwargs)
+
+
+def sample_chunks(
+    joint: CopulaJoint, size: int, *, chunk_size: int = DEFAULT_CHUNK_SIZE, random_state=None
+) -> Iterator[dict]:
+    """
+    Samples of ``joint`` in chunks of at most ``chunk_size`` rows, as dictionaries mapping names
+    to arrays.
+
+    The samples do not depend on ``chunk_size``: the latent normals are drawn row by row from
+    a single generator.
+    """
+    unpacked = unpack(joint)
+    cholesky = np.linalg.cholesky(unpacked.corr)
+    rng = np.random.default_rng(random_state)
+    for start in range(0, size, chunk_size):
+        n = min(chunk_size, size - start)
+        latent = rng.standard_normal((n, len(unpacked.names))) @ cholesky.T
+        yield to_inputs(unpacked, latent)
+
+
+def write_npy(
+    joint: CopulaJoint,
+    directory: Union[str, os.PathLike],
+    size: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> dict[str, Path]:
+    """
+    Write ``size`` samples of each marginal to ``<directory>/<name>.npy``, as memory-mapped
+    arrays that are filled one chunk at a time. Returns the paths.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    names = [str(name) for name in unpack(joint).names]
+    paths = {name: directory / f"{name}.npy" for name in names}
+    arrays = {
+        name: np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(size,))
+        for name, path in paths.items()
+    }
+    start = 0
+    for chunk in sample_chunks(joint, size, chunk_size=chunk_size, random_state=random_state):
+        for name, values in zip(names, chunk.values()):
+            arrays[name][start : start + len(values)] = values
+            arrays[name].flush()
+        start += len(values)
+    del arrays
+    return paths
+
+
+def write_parquet(
+    joint: CopulaJoint,
+    path: Union[str, os.PathLike],
+    size: int,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    random_state=None,
+) -> Path:
+    """
+    Write ``size`` samples to a Parquet file with one column per marginal, and one row group
+    per chunk. Requires ``pyarrow``.
+    """
+    pa = _import_optional("pyarrow", "to write Parquet files")
+    import pyarrow.parquet
+
+    names = [str(name) for name in unpack(joint).names]
+    schema = pa.schema([(name, pa.float64()) for name in names])
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for chunk in sample_chunks(joint, size, chunk_size=chunk_size, random_state=random_state):
+            writer.write_table(pa.table(dict(zip(names, chunk.values())), schema=schema))
+    return Path(path)
+
+
+def _import_optional(module: str, purpose: str):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ImportError(
+            f"The package {module!r} is required {purpose}. Install it with `pip install {module}`."
+        ) from None
@@ -0,0 +1,278 @@
+"""
+Streaming summaries of samples that are too large to keep in memory.
+
+A :py:class:`StreamingSummary` consumes samples in chunks, and can be merged with summaries
+computed elsewhere (e.g. by other worker processes). It tracks exact moments, and approximate
+quantiles using a `KLL sketch <https://arxiv.org/abs/1603.05346>`_ whose memory use does not
+grow with the number of samples.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import norm
+>>> from rvtools.summary import StreamingSummary, summarize
+>>> summary = summarize(norm(0, 1), 1_000_000, random_state=0)
+>>> round(summary.mean(), 2), round(summary.std(), 2)
+(0.0, 1.0)
+>>> bool(abs(summary.ppf(0.95) - 1.645) < 0.05)
+True
+
+Summaries of different chunks can be merged:
+
+>>> rng = np.random.default_rng(0)
+>>> a = StreamingSummary().update(rng.uniform(0, 1, 10_000))
+>>> b = StreamingSummary().update(rng.uniform(1, 2, 10_000))
+>>> a.merge(b).n
+20000
+>>> bool(abs(a.cdf(1) - 0.5) < 0.02)
+True
+"""
+import numpy as np
+from scipy.stats.distributions import rv_frozen
+
+
+class Moments:
+    """
+    Running count, mean and central moments (up to the fourth) of a stream of samples.
+
+    Each chunk is reduced with vectorized NumPy operations, and chunks are combined with the
+    pairwise update formulas of `Pébay (2008) <https://doi.org/10.2172/1028931>`_, which are
+    numerically stable (unlike accumulating raw power sums).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self._mean = 0.0
+        # Sums of the 2nd, 3rd and 4th powers of deviations from the mean
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+
+    def update(self, chunk) -> "Moments":
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+        other = Moments()
+        other.n = chunk.size
+        other._mean = chunk.mean()
+        deviations = chunk - other._mean
+        squared = deviations**2
+        other._m2 = squared.sum()
+        other._m3 = (squared * deviations).sum()
+        other._m4 = (squared**2).sum()
+        return self.merge(other)
+
+    def merge(self, other: "Moments") -> "Moments":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self._mean = other.n, other._mean
+            self._m2, self._m3, self._m4 = other._m2, other._m3, other._m4
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other._mean - self._mean
+
+        m4 = (
+            self._m4
+            + other._m4
+            + delta**4 * na * nb * (na**2 - na * nb + nb**2) / n**3
+            + 6 * delta**2 * (na**2 * other._m2 + nb**2 * self._m2) / n**2
+            + 4 * delta * (na * other._m3 - nb * self._m3) / n
+        )
+        m3 = (
+            self._m3
+            + other._m3
+            + delta**3 * na * nb * (na - nb) / n**2
+            + 3 * delta * (na * other._m2 - nb * self._m2) / n
+        )
+        m2 = self._m2 + other._m2 + delta**2 * na * nb / n
+
+        self.n = n
+        self._mean += delta * nb / n
+        self._m2, self._m3, self._m4 = m2, m3, m4
+        return self
+
+    def mean(self) -> float:
+        return self._mean if self.n else np.nan
+
+    def var(self, ddof=0) -> float:
+        if self.n - ddof <= 0:
+            return np.nan
+        return self._m2 / (self.n - ddof)
+
+    def std(self, ddof=0) -> float:
+        return np.sqrt(self.var(ddof))
+
+    def skew(self) -> float:
+        """Sample skewness (biased, like ``scipy.stats.skew``)."""
+        if self.n == 0 or self._m2 == 0:
+            return np.nan
+        return np.sqrt(self.n) * self._m3 / self._m2**1.5
+
+    def kurtosis(self) -> float:
+        """Sample excess kurtosis (biased, like ``scipy.stats.kurtosis``)."""
+        if self.n == 0 or self._m2 == 0:
+            return np.nan
+        return self.n * self._m4 / self._m2**2 - 3
+
+
+class QuantileSketch:
+    """
+    KLL sketch for approximate quantiles.
+
+    Samples are kept in a hierarchy of 'compactors'. An item at level ``h`` stands for ``2**h``
+    samples. When a level exceeds its capacity, it is sorted and every other item (starting
+    from a random offset) is promoted to the next level, which keeps rank estimates unbiased.
+
+    :param k:
+        Controls the accuracy. The error in the rank of any estimate is roughly ``2 / k`` of
+        the number of samples, and memory use is ``O(k)``.
+    :param random_state: Seed for the random compaction offsets.
+    """
+
+    def __init__(self, k: int = 1000, random_state=None):
+        self.k = k
+        self.n = 0
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, chunk) -> "QuantileSketch":
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        self.n += chunk.size
+        self._levels[0] = np.concatenate([self._levels[0], chunk])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for h, items in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def cdf(self, x):
+        """Estimated fraction of samples less than or equal to ``x``."""
+        items, cum_weights = self._sorted_items()
+        ranks = np.searchsorted(items, x, side="right")
+        cum_weights = np.concatenate([[0], cum_weights])
+        return cum_weights[ranks] / self.n
+
+    def ppf(self, q):
+        """Estimated ``q``-quantile of the samples."""
+        items, cum_weights = self._sorted_items()
+        idx = np.searchsorted(cum_weights, np.asarray(q) * self.n, side="left")
+        return items[np.clip(idx, 0, items.size - 1)]
+
+    def _capacity(self, h) -> int:
+        depth = len(self._levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if level.size > self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                level = np.sort(level)
+                # With an odd number of items, the largest one stays behind
+                n_even = level.size - level.size % 2
+                offset = self._rng.integers(2)
+                promoted = level[offset:n_even:2]
+                self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+                self._levels[h] = level[n_even:]
+            h += 1
+
+    def _sorted_items(self):
+        if self.n == 0:
+            raise ValueError("The sketch has no data yet. Call `update` first.")
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(level.size, 2.0**h) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+
+class StreamingSummary:
+    """
+    Moments and approximate quantiles of a stream of samples, without keeping the samples.
+
+    Moments are exact (up to floating-point error). Quantiles are estimated with a
+    :py:class:`QuantileSketch`, except for the minimum and maximum, which are exact.
+
+    :param k: Accuracy parameter of the quantile sketch.
+    :param random_state: Seed for the quantile sketch.
+    """
+
+    def __init__(self, k: int = 1000, random_state=None):
+        self.moments = Moments()
+        self.sketch = QuantileSketch(k, random_state=random_state)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def n(self) -> int:
+        return self.moments.n
+
+    def update(self, chunk) -> "StreamingSummary":
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+        self.moments.update(chunk)
+        self.sketch.update(chunk)
+        self.min = min(self.min, chunk.min())
+        self.max = max(self.max, chunk.max())
+        return self
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def mean(self) -> float:
+        return self.moments.mean()
+
+    def var(self, ddof=0) -> float:
+        return self.moments.var(ddof)
+
+    def std(self, ddof=0) -> float:
+        return self.moments.std(ddof)
+
+    def skew(self) -> float:
+        return self.moments.skew()
+
+    def kurtosis(self) -> float:
+        return self.moments.kurtosis()
+
+    def cdf(self, x):
+        x = np.asarray(x, dtype=float)
+        return np.where(x < self.min, 0.0, np.where(x >= self.max, 1.0, self.sketch.cdf(x)))
+
+    def ppf(self, q):
+        q = np.asarray(q, dtype=float)
+        return np.where(q <= 0, self.min, np.where(q >= 1, self.max, self.sketch.ppf(q)))
+
+
+def summarize(
+    dist: rv_frozen, size: int, *, chunk_size: int = 1_000_000, k: int = 1000, random_state=None
+) -> StreamingSummary:
+    """
+    Draw ``size`` samples from ``dist`` in chunks of ``chunk_size``, and summarize them without
+    ever holding more than one chunk in memory.
+    """
+    rng = np.random.default_rng(random_state)
+    summary = StreamingSummary(k, random_state=rng)
+    remaining = size
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        summary.update(dist.rvs(size=n, random_state=rng))
+        remaining -= n
+    return summary
@@ -0,0 +1,165 @@
+"""
+Scenario sweeps over the parameters of a distribution, with common random numbers.
+
+When re-evaluating a model for many values of one input's parameters, resampling everything for
+each value adds Monte Carlo noise to the differences between scenarios. Here, the underlying
+standard normals are drawn once, and pushed through each scenario's quantile function, so that
+sample ``j`` of every scenario is the same quantile of that scenario's distribution. Differences
+between scenarios are then due to the parameters alone, and the draws are shared.
+
+When the constructor accepts arrays of parameters (as the SciPy distributions and most
+constructors in :py:mod:`rvtools.construct` do), all scenarios are evaluated in one broadcast
+array operation. Otherwise, they are evaluated one at a time.
+
+Examples
+--------
+
+>>> import numpy as np
+>>> from rvtools.construct import lognorm, norm
+>>> from rvtools.sweep import scenarios, sweep
+>>> xs = np.linspace(1, 2, 200)
+>>> samples = scenarios(lambda x: lognorm(p5=x, p95=2 * x), xs, 10_000, random_state=0)
+>>> samples.shape
+(200, 10000)
+
+With common random numbers, the same sample is monotone in ``x``:
+
+>>> bool(np.all(np.diff(samples, axis=0) > 0))
+True
+
+Sweeping one input of a model, holding the other inputs' samples fixed:
+
+>>> def model(x):
+...     return x["price"] * x["quantity"]
+>>> inputs = {"quantity": lognorm(p5=10, p95=100)}
+>>> out = sweep(model, inputs, "price", lambda x: norm(x, 1), xs, 10_000, random_state=0)
+>>> out.shape
+(200, 10000)
+"""
+from typing import Any, Callable, Optional
+
+import numpy as np
+import scipy
+from numpy.typing import ArrayLike
+from scipy.stats.distributions import rv_frozen
+
+from rvtools._joint import Inputs, to_inputs, unpack
+from rvtools.fam import is_frozen_lognorm, is_frozen_norm
+
+Constructor = Callable[[Any], rv_frozen]
+
+
+def scenarios(
+    constructor: Constructor,
+    values: ArrayLike,
+    size: int,
+    *,
+    vectorized: Optional[bool] = None,
+    random_state=None,
+) -> np.ndarray:
+    """
+    Samples of the distributions ``constructor(v)`` for each ``v`` in ``values``, with common
+    random numbers.
+
+    :param constructor: A function returning a frozen distribution, e.g. ``lambda x: norm(x, 1)``.
+    :param vectorized:
+        Whether to call ``constructor`` once on all values (as a column ``values[:, None]``),
+        rather than once per value. By default, this is tried, checked, and abandoned for a loop
+        if it fails.
+    :return: An array of shape ``(len(values), size)``.
+    """
+    latent = np.random.default_rng(random_state).standard_normal(size)
+    return _scenarios(constructor, np.asarray(values), latent, vectorized)
+
+
+def sweep(
+    model: Callable[[dict], np.ndarray],
+    inputs: Inputs,
+    name,
+    constructor: Constructor,
+    values: ArrayLike,
+    size: int,
+    *,
+    vectorized: Optional[bool] = None,
+    random_state=None,
+) -> np.ndarray:
+    """
+    Evaluate ``model`` for each scenario of the input ``name``, with common random numbers.
+
+    :param model:
+        A vectorized function of the inputs (see :ref:`models`). Unlike elsewhere, it is called
+        once, with arrays that broadcast against each other: of shape ``(len(values), size)``
+        for the swept input, and ``(size,)`` for the others.
+    :param inputs:
+        The other inputs: a ``CopulaJoint``, or a dictionary or list of independent (frozen)
+        distributions. If ``name`` is one of them, the swept input takes its place in the
+        copula, i.e. keeps its rank correlations with the other inputs.
+    :param name: The name (or position) of the swept input.
+    :param constructor: A function returning the swept input's distribution for each value.
+    :param vectorized: See :py:func:`scenarios`.
+    :return: An array of shape ``(len(values), size)``.
+    """
+    unpacked = unpack(inputs)
+    rng = np.random.default_rng(random_state)
+    latent = rng.standard_normal((size, len(unpacked.names))) @ np.linalg.cholesky(unpacked.corr).T
+    if name in unpacked.names:
+        swept_latent = latent[:, unpacked.names.index(name)]
+    else:
+        swept_latent = rng.standard_normal(size)
+
+    samples = to_inputs(unpacked, latent)
+    samples[name] = _scenarios(constructor, np.asarray(values), swept_latent, vectorized)
+    shape = (len(values), size)
+    return np.broadcast_to(model(samples), shape)
+
+
+def _scenarios(constructor, values: np.ndarray, latent: np.ndarray, vectorized) -> np.ndarray:
+    if values.ndim != 1:
+        raise ValueError(f"Expected a 1-dimensional array of values, got shape {values.shape}.")
+    shape = (len(values), len(latent))
+
+    if vectorized is not False:
+        try:
+            samples = np.broadcast_to(_from_latent(constructor(values[:, None]), latent), shape)
+            ok = vectorized or _agrees_with_loop(constructor, values, latent, samples)
+        except (ValueError, TypeError):
+            if vectorized:
+                raise
+            ok = False
+        if ok:
+            return samples
+
+    samples = np.empty(shape)
+    for i, value in enumerate(values):
+        samples[i] = _from_latent(constructor(value), latent)
+    return samples
+
+
+def _agrees_with_loop(constructor, values, latent, samples, n_checks=16) -> bool:
+    """Check the first and last scenarios, in case ``constructor`` mishandled arrays silently."""
+    for i in [0, len(values) - 1]:
+        expected = _from_latent(constructor(values[i]), latent[:n_checks])
+        if not np.allclose(samples[i, :n_checks], expected, equal_nan=True):
+            return False
+    return True
+
+
+def _from_latent(dist: rv_frozen, latent: np.ndarray) -> np.ndarray:
+    """
+    The quantiles of ``dist`` at ``ndtr(latent)``, broadcast over the parameters of ``dist``.
+
+    This is done in closed form for normal and log-normal distributions. Otherwise, positive
+    latent values go through the inverse survival function, for accuracy in the upper tail.
+    """
+    if is_frozen_norm(dist) or is_frozen_lognorm(dist):
+        shapes, loc, scale = dist.dist._parse_args(*dist.args, **dist.kwds)
+        standard = latent if is_frozen_norm(dist) else np.exp(shapes[0] * latent)
+        return loc + scale * standard
+
+    upper = latent > 0
+    lower_values = dist.ppf(scipy.special.ndtr(latent[~upper]))
+    upper_values = dist.isf(scipy.special.ndtr(-latent[upper]))
+    samples = np.empty(lower_values.shape[:-1] + latent.shape)
+    samples[..., ~upper] = lower_values
+    samples[..., upper] = upper_values
+    return samples
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from rvtools.adaptive import run
+from rvtools.construct import CopulaJoint, lognorm, norm, uniform
+
+INPUTS = {"price": lognorm(mu=0, sigma=0.5), "quantity": norm(10, 2)}
+TRUE_MEAN = np.exp(0.125) * 10
+
+
+def model(x):
+    return x["price"] * x["quantity"]
+
+
+@pytest.mark.parametrize("rtol", [0.01, 0.002])
+def test_target_precision_is_reached(rtol):
+    result = run(model, INPUTS, rtol=rtol, quantiles=[0.1, 0.5, 0.9], random_state=0)
+    assert result.converged
+    assert result.size == result.sizes[-1]
+    assert result.mean_stderr <= rtol * result.mean
+    assert np.all(result.quantile_stderrs <= rtol * result.quantiles)
+    assert result.mean == pytest.approx(TRUE_MEAN, abs=5 * result.mean_stderr)
+
+
+def test_compute_matches_difficulty():
+    easy = run(lambda x: 100 + x["quantity"], INPUTS, rtol=0.002, random_state=0)
+    hard = run(lambda x: x["price"] ** 2, INPUTS, rtol=0.002, random_state=0)
+    assert easy.sizes == [10_000]
+    assert hard.converged
+    assert hard.size > 20 * easy.size
+    # Each round at most multiplies the total by `max_growth`
+    assert np.all(np.diff(hard.sizes) > 0)
+    assert np.all(np.array(hard.sizes[1:]) <= 4 * np.array(hard.sizes[:-1]))
+
+
+def test_standard_errors_are_calibrated():
+    results = [
+        run(model, INPUTS, rtol=0, quantiles=[0.9], max_size=4000, random_state=seed)
+        for seed in range(200)
+    ]
+    assert all(not r.converged and r.size == 4000 for r in results)
+    z = np.array([(r.mean - TRUE_MEAN) / r.mean_stderr for r in results])
+    assert z.std() == pytest.approx(1, abs=0.2)
+    true_q90 = np.quantile(
+        model({k: v.rvs(2_000_000, random_state=i) for i, (k, v) in enumerate(INPUTS.items())}),
+        0.9,
+    )
+    z = np.array([(r.quantiles[0] - true_q90) / r.quantile_stderrs[0] for r in results])
+    assert z.std() == pytest.approx(1, abs=0.2)
+
+
+def test_max_size():
+    result = run(model, INPUTS, rtol=1e-6, initial_size=1000, max_size=5000, random_state=0)
+    assert not result.converged
+    assert result.size == 5000
+
+
+def test_atol():
+    centered = {"a": norm(0, 1)}
+    assert not run(lambda x: x["a"], centered, max_size=50_000, random_state=0).converged
+    result = run(lambda x: x["a"], centered, atol=0.01, random_state=0)
+    assert result.converged
+    assert result.mean_stderr <= 0.01
+
+
+def test_quantiles_only():
+    result = run(lambda x: x["a"], {"a": norm(0, 1)}, quantiles=[0.9], mean=False, random_state=0)
+    assert result.converged
+    assert result.quantiles[0] == pytest.approx(1.2816, abs=5 * result.quantile_stderrs[0])
+
+
+def test_correlated_inputs_are_reproducible():
+    joint = CopulaJoint({"a": norm(0, 1), "b": uniform(1, 2)}, spearman_rho={("a", "b"): 0.5})
+    a = run(lambda x: x["a"] + x["b"], joint, random_state=0)
+    b = run(lambda x: x["a"] + x["b"], joint, chunk_size=999, random_state=0)
+    assert a == pytest.approx(b)  # Same samples, evaluated in different chunks
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"quantiles": [1.5]}, {"mean": False}, {"initial_size": 10}],
+)
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        run(model, INPUTS, **kwargs)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.bernoulli import cooccurrence, counts, frequencies, packed_rvs, unpack
+
+
+@pytest.mark.parametrize("size", [1, 7, 8, 1001, 20_000])
+def test_statistics_match_unpacked(size):
+    ps = np.random.default_rng(0).uniform(size=20)
+    packed = packed_rvs(ps, size, chunk_size=100, random_state=1)
+    assert packed.shape == (20, -(-size // 8))
+
+    samples = unpack(packed, size)
+    assert samples.shape == (20, size)
+    assert np.array_equal(np.packbits(samples, axis=1), packed)
+    assert np.array_equal(counts(packed), samples.sum(axis=1))
+    assert frequencies(packed, size) == pytest.approx(samples.mean(axis=1))
+
+    as_int = samples.astype(np.int64)
+    expected = as_int @ as_int.T / size
+    assert cooccurrence(packed, size, chunk_size=50) == pytest.approx(expected)
+
+
+def test_frequencies_converge():
+    ps = np.linspace(0, 1, 11)
+    packed = packed_rvs(ps, 200_000, random_state=0)
+    assert frequencies(packed, 200_000) == pytest.approx(ps, abs=0.005)
+    # Independent events
+    assert cooccurrence(packed, 200_000) == pytest.approx(
+        np.outer(ps, ps) + np.diag(ps - ps**2), abs=0.005
+    )
+
+
+def test_frozen_distributions():
+    events = [scipy.stats.bernoulli(0.2), scipy.stats.bernoulli(0.7)]
+    a = packed_rvs(events, 1000, random_state=0)
+    b = packed_rvs([0.2, 0.7], 1000, random_state=0)
+    assert np.array_equal(a, b)
+
+
+@pytest.mark.parametrize(
+    "events",
+    [[0.5, 1.5], [[0.5]], [scipy.stats.bernoulli(0.5, loc=1)], [scipy.stats.norm(0, 1)]],
+)
+def test_invalid_events(events):
+    with pytest.raises(ValueError):
+        packed_rvs(events, 10)
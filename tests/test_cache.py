@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import scipy
+
+import rvtools
+from rvtools.cache import SampleCache, key
+from rvtools.construct import CopulaJoint, beta, empirical, lognorm, mixture, certainty, uniform
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SampleCache(tmp_path, max_bytes=2**20)
+
+
+def test_hit_returns_same_samples(cache, tmp_path):
+    first = cache.rvs(lognorm(mu=0, sigma=1), 100, seed=1)
+    second = cache.rvs(lognorm(mu=0, sigma=1), 100, seed=1)
+    assert isinstance(second, np.memmap)
+    assert all(first == second)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_same_as_uncached(cache):
+    dist = beta(2, 3)
+    assert all(cache.rvs(dist, 100, seed=1) == dist.rvs(100, random_state=np.random.default_rng(1)))
+
+
+def test_key_is_canonical():
+    assert key(lognorm(mu=0, sigma=1), 10, 1) == key(scipy.stats.lognorm(1), 10, 1)
+    assert key(uniform(0, 1), 10, 1) == key(scipy.stats.uniform(), 10, 1)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [(beta(2, 4), 10, 1, "rvs"), (beta(2, 3), 11, 1, "rvs"), (beta(2, 3), 10, 2, "rvs")],
+)
+def test_key_depends_on_everything(other):
+    assert key(beta(2, 3), 10, 1) != key(*other)
+
+
+@pytest.mark.parametrize("module", [rvtools, np, scipy], ids=lambda module: module.__name__)
+def test_key_depends_on_versions(module, monkeypatch):
+    before = key(beta(2, 3), 10, 1)
+    monkeypatch.setattr(module, "__version__", module.__version__ + ".post1")
+    assert key(beta(2, 3), 10, 1) != before
+
+
+def test_key_instance_parameters():
+    assert key(empirical([1, 2, 3]), 10, 1) != key(empirical([1, 2, 4]), 10, 1)
+    a = mixture([certainty(0), beta(2, 3)], [0.5, 0.5])
+    b = mixture([certainty(0), beta(2, 3)], [0.4, 0.6])
+    assert key(a, 10, 1) != key(b, 10, 1)
+
+
+def test_copula_joint(cache):
+    marginals = {"a": uniform(0, 1), "b": lognorm(mu=0, sigma=1)}
+    dist = CopulaJoint(marginals, kendall_tau={("a", "b"): 0.5})
+    first = cache.rvs(dist, 100, seed=1)
+    second = cache.rvs(dist, 100, seed=1)
+    assert list(second.columns) == ["a", "b"]
+    assert first.equals(second)
+
+    other = CopulaJoint(marginals, kendall_tau={("a", "b"): 0.4})
+    assert key(dist, 100, 1) != key(other, 100, 1)
+
+
+def test_lru_eviction(tmp_path):
+    cache = SampleCache(tmp_path, max_bytes=25_000)  # Room for two arrays of 10_000 bytes
+    dist = uniform(0, 1)
+    cache.rvs(dist, 1250, seed=1)
+    cache.rvs(dist, 1250, seed=2)
+    cache.rvs(dist, 1250, seed=1)  # Now more recently used than seed=2
+    cache.rvs(dist, 1250, seed=3)
+
+    names = {p.stem for p in tmp_path.iterdir()}
+    assert names == {key(dist, 1250, 1), key(dist, 1250, 3)}
+    assert cache.size_bytes() <= 25_000
+
+
+def test_no_seed(cache):
+    with pytest.raises(ValueError, match="seed"):
+        cache.rvs(uniform(0, 1), 10, seed=None)
+
+
+def test_clear(cache, tmp_path):
+    cache.rvs(uniform(0, 1), 10, seed=1)
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
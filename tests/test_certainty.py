@@ -20,3 +20,8 @@ def test_cdf(dist, value):
 
 def test_rvs(dist, value):
     assert all(dist.rvs(10) == [value] * 10)
+
+
+def test_stats(dist, value):
+    assert dist.stats() == (value, 0)
+    assert dist.moment(2) == pytest.approx(value**2)
@@ -3,6 +3,9 @@ import pytest
 import scipy
 
 import rvtools.construct as construct
+import rvtools.dists
+from rvtools.construct.pert import params_from_quantiles as pert_params_from_quantiles
+from rvtools.construct.tp_uniform import params_from_quantiles as tp_uniform_params_from_quantiles
 from tests.conftest import assert_same_distribution
 
 
@@ -178,3 +181,87 @@ class TestLogUniform:
     def test_params_unordered(self):
         dist = construct.loguniform(10, 1)
         assert dist.support() == pytest.approx([1, 10])
+
+
+class TestPert:
+    def test_from_params(self):
+        assert_same_distribution(construct.pert(0, 3, 12), rvtools.dists.pert(0, 3, 12))
+        assert_same_distribution(
+            construct.pert(0, 3, 12, lambd=2), rvtools.dists.mpert(0, 3, 12, lambd=2)
+        )
+
+    @pytest.mark.parametrize(
+        "quantiles",
+        [{0.05: 1, 0.5: 3, 0.95: 8}, {0.1: -5, 0.5: -2, 0.9: 0}, {0.01: 0, 0.6: 2, 0.99: 7}],
+    )
+    def test_from_quantiles(self, quantiles):
+        assert_has_quantiles(construct.pert(quantiles=quantiles), quantiles)
+
+    def test_from_quantiles_fits_lambd(self):
+        true = rvtools.dists.mpert(-1, 2, 10, lambd=7)
+        quantiles = {p: true.ppf(p) for p in [0.05, 0.3, 0.5, 0.95]}
+        dist = construct.pert(quantiles=quantiles)
+        assert dist.kwds["lambd"] == pytest.approx(7)
+        assert dist.args == pytest.approx((-1, 2, 10))
+
+    def test_from_quantiles_with_fixed_params(self):
+        dist = construct.pert(mini=0, p50=3, p95=8)
+        assert dist.args[0] == 0
+        assert_has_quantiles(dist, {0.5: 3, 0.95: 8})
+
+        dist = construct.pert(mini=0, maxi=10, lambd=2, p50=3)
+        assert dist.args[::2] == (0, 10)
+        assert_has_quantiles(dist, {0.5: 3})
+
+    def test_too_few_quantiles(self):
+        with pytest.raises(ValueError, match="Expected at least 3 quantiles"):
+            construct.pert(p5=1, p95=8)
+
+    def test_inconsistent_quantiles(self):
+        with pytest.raises(ValueError, match="Could not fit"):
+            construct.pert(quantiles={0.05: 1, 0.25: 2, 0.5: 3, 0.95: 8})
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+        n = 200
+        mini = rng.uniform(-5, 5, n)
+        maxi = mini + rng.uniform(0.1, 20, n)
+        mode = mini + (maxi - mini) * rng.uniform(0.05, 0.95, n)
+        lambd = rng.uniform(1, 10, n)
+        ps = np.array([0.05, 0.25, 0.5, 0.95])
+        xs = np.array(
+            [rvtools.dists.mpert(*params).ppf(ps) for params in zip(mini, mode, maxi, lambd)]
+        )
+
+        fit = pert_params_from_quantiles(ps, xs)
+        assert fit.converged.all()
+        assert fit.residual.max() < 1e-9
+        assert fit.mode == pytest.approx(mode, rel=1e-6)
+        assert fit.lambd == pytest.approx(lambd, rel=1e-6)
+        assert (fit.iterations > 0).all()
+
+
+class TestTwoPieceUniform:
+    def test_from_params(self):
+        assert_same_distribution(
+            construct.tp_uniform(0, 1, 3, 0.3), rvtools.dists.tp_uniform(0, 1, 3, 0.3)
+        )
+        assert_same_distribution(
+            construct.tp_uniform(0, 1, 3), rvtools.dists.halves_uniform(0, 1, 3)
+        )
+
+    @pytest.mark.parametrize("quantiles", [{0.1: 1, 0.5: 3, 0.9: 11}, {0.05: -1, 0.3: 0, 0.99: 1}])
+    def test_from_quantiles(self, quantiles):
+        dist = construct.tp_uniform(quantiles=quantiles)
+        assert_has_quantiles(dist, quantiles)
+
+    def test_wrong_number_of_quantiles(self):
+        with pytest.raises(ValueError, match="exactly three"):
+            construct.tp_uniform(p10=1, p90=2)
+
+    def test_batch(self):
+        mini, sep, maxi, psep = tp_uniform_params_from_quantiles(
+            [0.1, 0.5, 0.9], [[1, 3, 11], [0, 1, 2]]
+        )
+        assert mini.tolist() == [0.5, -0.25]
+        assert maxi.tolist() == [13, 2.25]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import beta, certainty, lognorm, norm, pert, tp_uniform, uniform
+from rvtools.convolve import convolve
+from rvtools.fam import is_frozen_certainty
+
+
+def test_normals():
+    got = convolve(norm(0, 1), norm(1, 2))
+    want = scipy.stats.norm(1, np.sqrt(5))
+    ps = np.linspace(0.001, 0.999, 50)
+    assert got.ppf(ps) == pytest.approx(want.ppf(ps), abs=1e-3)
+
+
+def test_irwin_hall():
+    n = 3
+    got = convolve(*[uniform(0, 1)] * n)
+    xs = np.linspace(0, n, 31)
+    assert got.cdf(xs) == pytest.approx(scipy.stats.irwinhall(n).cdf(xs), abs=1e-4)
+
+
+def test_point_mass_shifts():
+    got = convolve(uniform(0, 1), certainty(3))
+    assert got.cdf([3.25, 3.5, 3.75]) == pytest.approx([0.25, 0.5, 0.75], abs=1e-4)
+
+
+def test_only_point_masses():
+    got = convolve(certainty(1), certainty(2))
+    assert is_frozen_certainty(got)
+    assert got.ppf(0.5) == 3
+
+
+@pytest.mark.parametrize("n_terms", [2, 50])
+def test_moments(n_terms):
+    kinds = [pert(0, 3, 12), tp_uniform(0, 1, 5, 0.3), beta(2, 5), lognorm(mu=0, sigma=0.5)]
+    terms = [kinds[i % len(kinds)] for i in range(n_terms)]
+    got = convolve(*terms)
+    assert got.mean() == pytest.approx(sum(t.mean() for t in terms), rel=1e-4)
+    assert got.var() == pytest.approx(sum(t.var() for t in terms), rel=1e-3)
+
+
+def test_matches_monte_carlo():
+    terms = [pert(0, 3, 12), tp_uniform(0, 1, 5, 0.3), beta(2, 5)]
+    got = convolve(*terms)
+    rng = np.random.default_rng(0)
+    samples = sum(t.ppf(rng.random(200_000)) for t in terms)
+    ps = np.linspace(0.01, 0.99, 99)
+    assert got.ppf(ps) == pytest.approx(np.quantile(samples, ps), rel=2e-2)
+
+
+def test_heavy_tailed():
+    term = lognorm(mu=0, sigma=3)
+    got = convolve(term, term, uniform(0, 1))
+    rng = np.random.default_rng(0)
+    samples = (
+        term.ppf(rng.random(1_000_000)) + term.ppf(rng.random(1_000_000)) + rng.random(1_000_000)
+    )
+    ps = np.linspace(0.05, 0.95, 19)
+    assert got.ppf(ps) == pytest.approx(np.quantile(samples, ps), rel=2e-2)
+    assert got.cdf(1) == pytest.approx(np.mean(samples <= 1), abs=2e-3)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import scipy
+from copula_wrapper import CopulaJoint
+
+from rvtools import dtypes
+from rvtools.construct import beta, lognorm, loguniform, norm, pert, tp_uniform, uniform
+from rvtools.dists import certainty
+
+DISTS = [
+    norm(1, 2),
+    lognorm(mu=1, sigma=0.5),
+    scipy.stats.lognorm(0.5, loc=-3, scale=2),
+    uniform(-1, 3),
+    loguniform(0.1, 100),
+    tp_uniform(0, 1, 5, 0.3),
+    beta(2, 5),
+    pert(0, 3, 12),
+]
+
+
+@pytest.mark.parametrize("dist", DISTS)
+def test_ppf_cdf_match_scipy(dist):
+    q = np.linspace(0.001, 0.999, 1001)
+    assert dtypes.ppf(dist, q).dtype == np.float32
+    assert dtypes.ppf(dist, q) == pytest.approx(dist.ppf(q), rel=1e-5, abs=1e-5)
+
+    x = dist.ppf(q)
+    assert dtypes.cdf(dist, x).dtype == np.float32
+    assert dtypes.cdf(dist, x) == pytest.approx(q, abs=1e-5)
+
+
+@pytest.mark.parametrize("dist", DISTS)
+def test_cdf_outside_support(dist):
+    x = np.array([-1e30, 1e30])
+    assert dtypes.cdf(dist, x).tolist() == [0, 1]
+    assert np.isnan(dtypes.ppf(dist, [-0.5, 1.5])).all()
+
+
+@pytest.mark.parametrize("dist", DISTS)
+def test_rvs_distribution(dist):
+    sample = dtypes.rvs(dist, 100_000, chunk_size=30_000, random_state=0)
+    assert sample.dtype == np.float32
+    assert scipy.stats.kstest(sample, dist.cdf).pvalue > 0.001
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_dtype(dtype):
+    assert dtypes.rvs(norm(0, 1), 10, dtype=dtype).dtype == dtype
+    assert dtypes.ppf(beta(2, 3), [[0.5]], dtype=dtype).shape == (1, 1)
+
+
+def test_rvs_reproducible():
+    a = dtypes.rvs(lognorm(mu=0, sigma=1), 1000, random_state=1)
+    b = dtypes.rvs(lognorm(mu=0, sigma=1), 1000, random_state=1)
+    assert (a == b).all()
+
+
+def test_certainty():
+    assert dtypes.rvs(certainty(3), 4).tolist() == [3, 3, 3, 3]
+    assert dtypes.rvs(certainty(3), 4).dtype == np.float32
+    assert dtypes.cdf(certainty(3), [2, 3, 4]).tolist() == [0, 1, 1]
+
+
+def test_integer_dtype():
+    with pytest.raises(ValueError):
+        dtypes.rvs(norm(0, 1), 10, dtype=int)
+
+
+def test_joint_rvs():
+    marginals = {"a": norm(0, 1), "b": lognorm(mu=0, sigma=1), "c": beta(2, 5)}
+    tau = {("a", "b"): 0.5, ("b", "c"): -0.3}
+    dist = CopulaJoint(marginals, kendall_tau=tau)
+    sample = dtypes.joint_rvs(dist, 20_000, chunk_size=10_000, random_state=0)
+
+    assert list(sample.columns) == ["a", "b", "c"]
+    assert (sample.dtypes == np.float32).all()
+    assert scipy.stats.kendalltau(sample["a"], sample["b"])[0] == pytest.approx(0.5, abs=0.02)
+    assert scipy.stats.kendalltau(sample["b"], sample["c"])[0] == pytest.approx(-0.3, abs=0.02)
+    for name, marginal in marginals.items():
+        assert scipy.stats.kstest(sample[name], marginal.cdf).pvalue > 0.001
+
+
+def test_joint_rvs_unnamed():
+    dist = CopulaJoint([norm(0, 1), uniform(0, 1)], kendall_tau=[[1, 0.2], [0.2, 1]])
+    sample = dtypes.joint_rvs(dist, 100, random_state=0)
+    assert sample.shape == (100, 2)
+    assert sample.dtype == np.float32
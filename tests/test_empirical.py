@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import empirical
+from rvtools.construct.empirical import sort_npy
+
+
+@pytest.fixture
+def samples():
+    return np.random.default_rng(0).lognormal(0, 1, 10_001)
+
+
+@pytest.fixture
+def dist(samples):
+    return empirical(samples)
+
+
+def test_ppf_matches_numpy_quantile(dist, samples):
+    ps = np.linspace(0, 1, 101)
+    assert dist.ppf(ps) == pytest.approx(np.quantile(samples, ps))
+
+
+def test_cdf_inverts_ppf(dist):
+    ps = np.linspace(0.001, 0.999, 99)
+    assert dist.cdf(dist.ppf(ps)) == pytest.approx(ps)
+
+
+def test_cdf_outside_support(dist, samples):
+    assert dist.cdf([samples.min() - 1, samples.max() + 1]) == pytest.approx([0, 1])
+
+
+def test_pdf():
+    # Each gap between consecutive samples has probability 1/2
+    dist = empirical([0, 1, 3])
+    assert dist.pdf([-1, 0.5, 2, 4]) == pytest.approx([0, 1 / 2, 1 / 4, 0])
+
+
+def test_moments(dist, samples):
+    assert dist.mean() == pytest.approx(np.mean(samples))
+    assert dist.var() == pytest.approx(np.var(samples))
+    assert dist.stats("s") == pytest.approx(scipy.stats.skew(samples))
+
+
+def test_rvs(dist, samples):
+    drawn = dist.rvs(size=100_000, random_state=0)
+    assert np.all((samples.min() <= drawn) & (drawn <= samples.max()))
+    assert np.median(drawn) == pytest.approx(np.median(samples), rel=0.02)
+
+
+def test_ties():
+    dist = empirical([0, 1, 1, 1, 2])
+    assert dist.cdf([0.5, 1, 1.5, 2]) == pytest.approx([1 / 8, 3 / 4, 7 / 8, 1])
+    assert dist.ppf([0.25, 0.5, 0.75, 1]) == pytest.approx([1, 1, 1, 2])
+
+
+def test_save_and_mmap(tmp_path, samples):
+    path = tmp_path / "samples.npy"
+    dist = empirical(samples, path=path)
+    assert isinstance(dist.dist._sorted, np.memmap)
+    assert dist.ppf(0.3) == pytest.approx(np.quantile(samples, 0.3))
+
+
+def test_unsorted_file(tmp_path, samples):
+    path = tmp_path / "samples.npy"
+    np.save(path, samples)
+    with pytest.raises(ValueError, match="not sorted"):
+        empirical(path=path)
+
+    sort_npy(path)
+    assert empirical(path=path).ppf(0.3) == pytest.approx(np.quantile(samples, 0.3))
+
+
+def test_too_few_samples():
+    with pytest.raises(ValueError, match="at least two"):
+        empirical([1])
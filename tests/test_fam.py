@@ -8,6 +8,10 @@ from rvtools.fam import (
     is_frozen_certainty,
     is_frozen_pert,
     is_frozen_bernoulli,
+    is_frozen_uniform,
+    is_frozen_loguniform,
+    is_frozen_tp_uniform,
+    is_frozen_mixture,
 )
 
 
@@ -44,3 +48,27 @@ def test_pert(frozen_wishart):
 def test_bernoulli(frozen_wishart):
     assert is_frozen_bernoulli(scipy.stats.bernoulli(1))
     assert not is_frozen_bernoulli(frozen_wishart)
+
+
+def test_uniform(frozen_wishart):
+    assert is_frozen_uniform(scipy.stats.uniform(1, 1))
+    assert not is_frozen_uniform(scipy.stats.loguniform(1, 2))
+    assert not is_frozen_uniform(frozen_wishart)
+
+
+def test_loguniform(frozen_wishart):
+    assert is_frozen_loguniform(scipy.stats.loguniform(1, 2))
+    assert not is_frozen_loguniform(frozen_wishart)
+
+
+def test_tp_uniform(frozen_wishart):
+    assert is_frozen_tp_uniform(rvtools.dists.tp_uniform(0, 1, 3, 0.2))
+    assert is_frozen_tp_uniform(rvtools.dists.halves_uniform(0, 1, 3))
+    assert not is_frozen_tp_uniform(frozen_wishart)
+
+
+def test_mixture(frozen_wishart):
+    components = [rvtools.dists.certainty(0), scipy.stats.norm(0, 1)]
+    assert is_frozen_mixture(rvtools.dists.Mixture(components, [0.5, 0.5]).freeze())
+    assert not is_frozen_mixture(scipy.stats.norm(0, 1))
+    assert not is_frozen_mixture(frozen_wishart)
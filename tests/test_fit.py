@@ -0,0 +1,83 @@
+import pickle
+
+import numpy as np
+import pytest
+import scipy
+
+from rvtools import memo
+from rvtools.construct import fit
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_norm_matches_scipy(rng):
+    data = rng.normal(3, 2, 100_001)
+    dist = fit.norm(data, chunk_size=1000)
+    assert isinstance(dist, memo.CachedFrozen)
+    assert dist.args == pytest.approx(scipy.stats.norm.fit(data))
+
+
+def test_lognorm_matches_scipy(rng):
+    data = rng.lognormal(1, 0.5, 100_000)
+    dist = fit.lognorm(data, chunk_size=999)
+    shape, loc, scale = scipy.stats.lognorm.fit(data, floc=0)
+    assert dist.kwds["s"] == pytest.approx(shape, rel=1e-6)
+    assert dist.kwds["scale"] == pytest.approx(scale, rel=1e-6)
+
+
+@pytest.mark.parametrize("family", [fit.uniform, fit.loguniform])
+def test_uniform_bounds_are_extrema(rng, family):
+    data = rng.uniform(2, 5, 10_000)
+    dist = family(iter(np.array_split(data, 7)))
+    assert dist.support() == (data.min(), data.max())
+
+
+@pytest.mark.parametrize("params", [(2, 5), (0.3, 0.4), (50, 3)])
+def test_beta_matches_scipy(rng, params):
+    data = rng.beta(*params, 100_000)
+    dist = fit.beta(data, chunk_size=4096)
+    expected = scipy.stats.beta.fit(data, floc=0, fscale=1)[:2]
+    assert dist.args == pytest.approx(expected, rel=1e-4)
+    assert dist.args == pytest.approx(params, rel=0.05)
+
+
+def test_merge_matches_single_pass(rng):
+    data = rng.beta(2, 5, 50_000)
+    parts = [fit.statistics(part) for part in np.array_split(data, 5)]
+    merged = pickle.loads(pickle.dumps(parts[0]))  # As if returned by a worker process
+    for part in parts[1:]:
+        merged.merge(part)
+    single = fit.statistics(data)
+    assert merged.n == single.n
+    assert merged.sum_log1m == pytest.approx(single.sum_log1m)
+    assert merged.log_moments.var() == pytest.approx(single.log_moments.var())
+    assert fit.beta(merged).args == pytest.approx(fit.beta(data).args)
+    assert fit.norm(merged).args == pytest.approx(fit.norm(data).args)
+
+
+def test_generator_and_memmap(tmp_path, rng):
+    data = rng.normal(size=10_000)
+    path = tmp_path / "data.npy"
+    np.save(path, data)
+    from_memmap = fit.norm(np.load(path, mmap_mode="r"), chunk_size=100)
+    from_generator = fit.norm(chunk for chunk in np.array_split(data, 10))
+    assert from_memmap.args == pytest.approx(from_generator.args)
+
+
+@pytest.mark.parametrize(
+    "family, data",
+    [
+        (fit.lognorm, [1.0, 2.0, 0.0]),
+        (fit.loguniform, [1.0, -2.0]),
+        (fit.beta, [0.5, 0.2, 1.0]),
+        (fit.norm, [1.0]),
+        (fit.norm, [1.0, 1.0, 1.0]),
+        (fit.norm, [1.0, np.nan]),
+    ],
+)
+def test_invalid_data(family, data):
+    with pytest.raises(ValueError):
+        family(data)
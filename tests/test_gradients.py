@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+import scipy
+
+import rvtools.dists
+from rvtools.construct import beta, lognorm, loguniform, norm, tp_uniform, uniform
+from rvtools.construct.beta import params_from_quantiles
+from rvtools.gradients import canonical_params, cdf_grad, ppf_grad
+
+# Constructors from the canonical parameters
+FAMILIES = {
+    "norm": (lambda p: norm(p["mu"], p["sigma"]), {"mu": 1.0, "sigma": 2.0}),
+    "lognorm": (lambda p: lognorm(mu=p["mu"], sigma=p["sigma"]), {"mu": 0.5, "sigma": 0.8}),
+    "uniform": (lambda p: uniform(p["a"], p["b"]), {"a": -1.0, "b": 3.0}),
+    "loguniform": (lambda p: loguniform(p["a"], p["b"]), {"a": 0.5, "b": 20.0}),
+    "tp_uniform": (
+        lambda p: tp_uniform(p["mini"], p["sep"], p["maxi"], p["psep"]),
+        {"mini": 0.0, "sep": 1.0, "maxi": 4.0, "psep": 0.3},
+    ),
+    "halves_uniform": (
+        lambda p: rvtools.dists.halves_uniform(p["mini"], p["sep"], p["maxi"]),
+        {"mini": 0.0, "sep": 1.0, "maxi": 4.0},
+    ),
+    "beta": (lambda p: beta(p["alpha"], p["beta"]), {"alpha": 2.5, "beta": 0.7}),
+}
+QS = np.array([0.001, 0.05, 0.2, 0.5, 0.7, 0.95, 0.999])
+
+
+def finite_difference(constructor, params, method, values, name, h=1e-6):
+    step = h * max(abs(params[name]), 1)
+    up, down = dict(params), dict(params)
+    up[name] += step
+    down[name] -= step
+    return (
+        getattr(constructor(up), method)(values) - getattr(constructor(down), method)(values)
+    ) / (2 * step)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_canonical_params(family):
+    constructor, params = FAMILIES[family]
+    assert canonical_params(constructor(params)) == pytest.approx(params)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_ppf_grad(family):
+    constructor, params = FAMILIES[family]
+    grad = ppf_grad(constructor(params), QS)
+    assert grad.keys() == params.keys()
+    for name in params:
+        expected = finite_difference(constructor, params, "ppf", QS, name)
+        assert grad[name] == pytest.approx(expected, rel=1e-5, abs=1e-7), name
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_cdf_grad(family):
+    constructor, params = FAMILIES[family]
+    dist = constructor(params)
+    # Avoid the kinks of the two-piece uniform's CDF
+    xs = dist.ppf(QS[QS != 0.5]) if "sep" in params else dist.ppf(QS)
+    grad = cdf_grad(dist, xs)
+    assert grad.keys() == params.keys()
+    for name in params:
+        expected = finite_difference(constructor, params, "cdf", xs, name)
+        assert grad[name] == pytest.approx(expected, rel=1e-5, abs=1e-7), name
+
+
+def test_outside_support():
+    grad = cdf_grad(uniform(0, 1), [-1, 2])
+    assert grad["a"].tolist() == [0, 0] and grad["b"].tolist() == [0, 0]
+    grad = cdf_grad(lognorm(mu=0, sigma=1), [-1, 0])
+    assert grad["mu"].tolist() == [0, 0]
+
+
+def test_vectorized_over_parameters():
+    dist = scipy.stats.beta([[1.5], [3.0]], [2.0, 4.0, 8.0])
+    grad = ppf_grad(dist, 0.3)
+    assert grad["alpha"].shape == (2, 3)
+    for i, alpha in enumerate([1.5, 3.0]):
+        for j, b in enumerate([2.0, 4.0, 8.0]):
+            single = ppf_grad(scipy.stats.beta(alpha, b), 0.3)
+            assert grad["alpha"][i, j] == pytest.approx(single["alpha"])
+
+
+@pytest.mark.parametrize("alpha", [0.1, 1, 30, 300])
+@pytest.mark.parametrize("b", [0.1, 1, 30, 300])
+def test_beta_shapes(alpha, b):
+    xs = scipy.stats.beta.ppf([1e-4, 0.1, 0.5, 0.9, 1 - 1e-4], alpha, b)
+    grad = cdf_grad(scipy.stats.beta(alpha, b), xs)
+    for name, step in [("alpha", alpha * 1e-6), ("beta", b * 1e-6)]:
+        shift = np.array([step, 0]) if name == "alpha" else np.array([0, step])
+        up = scipy.stats.beta.cdf(xs, *(np.array([alpha, b]) + shift))
+        down = scipy.stats.beta.cdf(xs, *(np.array([alpha, b]) - shift))
+        assert grad[name] == pytest.approx((up - down) / (2 * step), rel=1e-4, abs=1e-9)
+
+
+def test_unsupported():
+    with pytest.raises(TypeError):
+        canonical_params(scipy.stats.gamma(2))
+    with pytest.raises(ValueError, match="loc=0"):
+        canonical_params(scipy.stats.beta(2, 3, loc=1))
+
+
+@pytest.mark.parametrize("alpha, b", [(0.3, 0.3), (0.5, 20), (20, 0.5), (50, 60), (1, 1)])
+@pytest.mark.parametrize("ps", [[0.05, 0.95], [0.001, 0.5], [0.6, 0.99]])
+def test_beta_params_from_quantiles(alpha, b, ps):
+    qs = scipy.stats.beta.ppf(ps, alpha, b)
+    assert params_from_quantiles(ps, qs) == pytest.approx((alpha, b), rel=1e-6)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools import graph
+from rvtools.construct import CopulaJoint, beta, lognorm, norm, tp_uniform, uniform
+
+
+@pytest.fixture
+def x():
+    return graph.rv(norm(0, 1))
+
+
+@pytest.fixture
+def y():
+    return graph.rv(tp_uniform(0, 1, 3, 0.3))
+
+
+def test_matches_eager_computation(x, y):
+    xs, ys = graph.evaluate([x, y], size=10_000, chunk_size=1000, seed=0)
+    got = graph.evaluate((x * y - 1) / (1 + np.exp(x)) ** 2, size=10_000, chunk_size=1000, seed=0)
+    assert got == pytest.approx((xs * ys - 1) / (1 + np.exp(xs)) ** 2)
+
+
+def test_reproducible(x, y):
+    model = {"a": x + y, "b": np.sin(x)}
+    first = graph.evaluate(model, size=5000, chunk_size=512, seed=42)
+    second = graph.evaluate(model, size=5000, chunk_size=512, seed=42)
+    assert all(first["a"] == second["a"])
+    assert all(first["b"] == second["b"])
+    assert not all(first["a"] == graph.evaluate(model, size=5000, chunk_size=512, seed=1)["a"])
+
+
+def test_shared_subexpression_computed_once_per_chunk(x):
+    calls = []
+
+    def expensive(values):
+        calls.append(len(values))
+        return values**2
+
+    shared = graph.apply(expensive, x)
+    graph.evaluate([shared + 1, shared * 2, shared], size=1000, chunk_size=300, seed=0)
+    assert calls == [300, 300, 300, 100]
+
+
+def test_chunks_bound_intermediate_size(x, y):
+    lengths = []
+    node = graph.apply(lambda v: lengths.append(len(v)) or v, x * y)
+    chunks = list(graph.iter_chunks(node + 1, size=10_000, chunk_size=1024, seed=0))
+    assert max(lengths) == 1024
+    assert sum(len(c) for c in chunks) == 10_000
+
+
+def test_long_chain_with_buffer_reuse(x):
+    node = x
+    for i in range(20):
+        node = node + i
+    xs, got = graph.evaluate([x, node], size=1000, chunk_size=100, seed=0)
+    assert got == pytest.approx(xs + sum(range(20)))
+
+
+def test_identity_function_is_not_overwritten(x):
+    same = graph.apply(lambda v: v, x)
+    xs, got, _ = graph.evaluate([x, same, same + 1], size=100, chunk_size=10, seed=0)
+    assert all(got == xs)
+
+
+def test_joint():
+    marginals = {"a": uniform(0, 1), "b": lognorm(mu=0, sigma=1), "c": beta(2, 3)}
+    dist = CopulaJoint(marginals, kendall_tau={("a", "b"): 0.6})
+    nodes = graph.joint(dist)
+    out = graph.evaluate({"a": nodes["a"], "b": nodes["b"]}, size=20_000, seed=0)
+    tau, _ = scipy.stats.kendalltau(out["a"], out["b"])
+    assert tau == pytest.approx(0.6, abs=0.03)
+
+
+def test_tp_uniform_rvs_uses_random_state():
+    dist = tp_uniform(0, 1, 3, 0.3)
+    assert all(dist.rvs(size=10, random_state=1) == dist.rvs(size=10, random_state=1))
+
+
+def test_view_of_intermediate_is_not_overwritten(x):
+    view = graph.apply(lambda v: v[:], x + 1)
+    xs, got, _ = graph.evaluate([x, view, x + 100], size=100, chunk_size=10, seed=0)
+    assert got == pytest.approx(xs + 1)
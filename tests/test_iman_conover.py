@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy
+
+from rvtools.construct import ImanConoverJoint, beta, lognorm, norm, uniform
+from rvtools.construct.iman_conover import (
+    _MAX_CACHED_SIZE,
+    _cached_normal_scores,
+    _normal_scores,
+)
+
+
+@pytest.fixture
+def named():
+    marginals = {"a": uniform(0, 1), "b": lognorm(mu=0, sigma=1), "c": beta(2, 3)}
+    tau = {("a", "b"): 0.5, ("b", "c"): -0.3}
+    return ImanConoverJoint(marginals, kendall_tau=tau)
+
+
+def test_rank_correlations(named):
+    sample = named.rvs(20_000, random_state=0)
+    assert isinstance(sample, pd.DataFrame)
+    assert scipy.stats.kendalltau(sample["a"], sample["b"])[0] == pytest.approx(0.5, abs=0.02)
+    assert scipy.stats.kendalltau(sample["b"], sample["c"])[0] == pytest.approx(-0.3, abs=0.02)
+    assert scipy.stats.kendalltau(sample["a"], sample["c"])[0] == pytest.approx(0, abs=0.02)
+
+
+def test_marginals(named):
+    sample = named.rvs(20_000, random_state=0)
+    for name, marginal in named.marginals.items():
+        assert scipy.stats.kstest(sample[name], marginal.cdf).pvalue > 0.001
+
+
+def test_reproducible(named):
+    assert named.rvs(100, random_state=1).equals(named.rvs(100, random_state=1))
+
+
+@pytest.mark.parametrize("make", [np.random.RandomState, np.random.default_rng])
+def test_random_state_instance(named, make):
+    sample = named.rvs(20_000, random_state=make(0))
+    assert sample.equals(named.rvs(20_000, random_state=make(0)))
+    assert scipy.stats.kendalltau(sample["a"], sample["b"])[0] == pytest.approx(0.5, abs=0.02)
+
+
+def test_positional():
+    dist = ImanConoverJoint([norm(0, 1), norm(0, 1)], kendall_tau=[[1, 0.7], [0.7, 1]])
+    sample = dist.rvs(10_000, random_state=0)
+    assert sample.shape == (10_000, 2)
+    assert scipy.stats.kendalltau(sample[:, 0], sample[:, 1])[0] == pytest.approx(0.7, abs=0.02)
+
+
+def test_fewer_samples_than_dimensions(named):
+    assert named.rvs(2, random_state=0).shape == (2, 3)
+
+
+def test_large_scores_are_not_cached():
+    _cached_normal_scores.cache_clear()
+    large = _MAX_CACHED_SIZE + 1
+    np.testing.assert_allclose(_normal_scores(large).std(), 1)
+    _normal_scores(100)
+    assert _cached_normal_scores.cache_info().currsize == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import CopulaJoint, lognorm, norm
+from rvtools.importance import exceedance, weighted_sample
+
+
+def test_normal_tail():
+    threshold = scipy.stats.norm.isf(1e-5)
+    estimate = exceedance(lambda x: x[0], [norm(0, 1)], threshold, 20_000, random_state=0)
+    assert estimate.probability == pytest.approx(1e-5, rel=0.05)
+    assert estimate.stderr < 0.02 * estimate.probability
+    # The optimal mean shift is about the threshold
+    assert estimate.shift[0] == pytest.approx(threshold, abs=0.5)
+
+
+def test_lognormal_product():
+    # The product of independent log-normals is log-normal
+    inputs = {"a": lognorm(mu=0, sigma=1), "b": lognorm(mu=1, sigma=2)}
+    exact = lognorm(mu=1, sigma=np.sqrt(5))
+    threshold = exact.isf(1e-6)
+    estimate = exceedance(lambda x: x["a"] * x["b"], inputs, threshold, 50_000, random_state=0)
+    assert estimate.probability == pytest.approx(1e-6, rel=4 * estimate.stderr / 1e-6)
+    assert estimate.stderr < 0.05 * estimate.probability
+
+
+def test_correlated_sum():
+    rho = np.sin(np.pi / 2 * 0.6)
+    inputs = CopulaJoint([norm(0, 1), norm(0, 1)], kendall_tau=[[1, 0.6], [0.6, 1]])
+    exact = norm(0, np.sqrt(2 + 2 * rho))
+    threshold = exact.isf(1e-5)
+    estimate = exceedance(lambda x: x[0] + x[1], inputs, threshold, 50_000, random_state=0)
+    assert estimate.probability == pytest.approx(1e-5, rel=4 * estimate.stderr / 1e-5)
+
+
+def test_fixed_shift():
+    estimate = exceedance(lambda x: x[0], [norm(0, 1)], 3, 10_000, shift=[3], random_state=0)
+    assert estimate.shift.tolist() == [3]
+    assert estimate.probability == pytest.approx(norm(0, 1).sf(3), rel=0.1)
+    assert estimate.sample.inputs[0].shape == estimate.outputs.shape == (10_000,)
+
+
+def test_weights_are_likelihood_ratios():
+    inputs = CopulaJoint([norm(0, 1), lognorm(mu=0, sigma=1)], kendall_tau=[[1, 0.3], [0.3, 1]])
+    sample = weighted_sample(inputs, 200_000, shift=[0.5, -1], random_state=0)
+    assert sample.weights.mean() == pytest.approx(1, abs=0.02)
+    # Weighted mean of the inputs under the original distribution
+    assert np.mean(sample.weights * sample.inputs[0]) == pytest.approx(0, abs=0.02)
+    assert np.mean(sample.weights * sample.inputs[1]) == pytest.approx(np.exp(0.5), rel=0.03)
+
+
+def test_upper_tail_precision():
+    # Far beyond where ndtr(z) rounds to 1
+    sample = weighted_sample([norm(0, 1)], 1000, shift=[20], random_state=0)
+    assert np.all(np.isfinite(sample.inputs[0]))
+    assert sample.inputs[0] == pytest.approx(sample.latent[:, 0])
+
+
+def test_warns_if_threshold_not_reached():
+    with pytest.warns(UserWarning, match="did not reach"):
+        exceedance(lambda x: x[0], [norm(0, 1)], 100, 1000, max_pilots=1, random_state=0)
+
+
+def test_pilot_weights_do_not_underflow():
+    # With a large shift in many dimensions, every likelihood ratio of the elite underflows to 0
+    n_inputs = 200
+    threshold = 40 * np.sqrt(n_inputs)
+    with pytest.warns(UserWarning, match="did not reach"):
+        estimate = exceedance(
+            lambda x: sum(x.values()),
+            [norm(0, 1)] * n_inputs,
+            threshold,
+            1000,
+            pilot_size=1000,
+            random_state=0,
+        )
+    assert np.all(np.isfinite(estimate.shift))
+    assert estimate.shift.mean() > 2
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy
+
+from rvtools.construct import CopulaJoint, norm, uniform
+from rvtools import kendall
+from rvtools.kendall import kendall_tau, pairwise_tau
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=5000)
+    return pd.DataFrame(
+        {
+            "a": a,
+            "b": a + rng.normal(size=5000),
+            "c": np.round(a + rng.normal(size=5000)),  # Ties
+            "d": rng.integers(0, 3, 5000),  # Many ties
+            "e": -(a**3),
+        }
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [1, 3])
+def test_matches_scipy(data, n_jobs):
+    result = pairwise_tau(data, n_jobs=n_jobs)
+    assert result.names == list(data.columns)
+    assert result.size == len(data)
+    assert result.low is None and result.high is None
+    for i, x in enumerate(data.columns):
+        for j, y in enumerate(data.columns):
+            expected = 1 if i == j else scipy.stats.kendalltau(data[x], data[y]).statistic
+            assert result.tau[i, j] == pytest.approx(expected, abs=1e-12)
+    assert result.tau[0, 4] == -1
+
+
+def test_without_scipy_private_function(data, monkeypatch):
+    expected = pairwise_tau(data).tau
+    monkeypatch.setattr(kendall, "_discordant", kendall._count_discordant)
+    np.testing.assert_allclose(pairwise_tau(data).tau, expected, atol=1e-12)
+
+
+def test_scipy_private_function():
+    # If this fails, SciPy has moved or removed ``_kendall_dis``: the fallback is used instead,
+    # which is slower. Update the import in rvtools.kendall.
+    assert kendall._kendall_dis is not None
+    x = np.repeat(np.arange(1, 51), 20).astype(np.intp)
+    y = np.random.default_rng(0).integers(1, 30, x.size).astype(np.intp)
+    y = np.concatenate([np.sort(y[x == v]) for v in range(1, 51)])
+    assert kendall._count_discordant(x, y) == kendall._kendall_dis(x, y)
+
+
+def test_dict_for_copula(data):
+    tau = kendall_tau(data)
+    assert len(tau) == 10
+    assert tau[("a", "b")] == pytest.approx(scipy.stats.kendalltau(data["a"], data["b"])[0])
+    joint = CopulaJoint(
+        {"a": norm(0, 1), "b": uniform(0, 1)}, kendall_tau={("a", "b"): tau["a", "b"]}
+    )
+    samples = joint.rvs(20_000, random_state=np.random.default_rng(0))
+    assert scipy.stats.kendalltau(samples["a"], samples["b"])[0] == pytest.approx(
+        tau["a", "b"], abs=0.02
+    )
+
+
+def test_input_types(data):
+    expected = pairwise_tau(data).tau
+    assert pairwise_tau(data.to_numpy()).names == [0, 1, 2, 3, 4]
+    assert pairwise_tau(data.to_numpy()).tau == pytest.approx(expected)
+    assert pairwise_tau({k: data[k].to_numpy() for k in data}).tau == pytest.approx(expected)
+
+
+def test_subsample_confidence_bounds():
+    rng = np.random.default_rng(1)
+    a = rng.normal(size=100_000)
+    data = {"a": a, "b": a + 2 * rng.normal(size=100_000)}
+    exact = kendall_tau(data)[("a", "b")]
+    results = [pairwise_tau(data, sample_size=2000, random_state=seed) for seed in range(100)]
+    assert all(r.size == 2000 for r in results)
+    covered = [r.low[0, 1] <= exact <= r.high[0, 1] for r in results]
+    assert np.mean(covered) == pytest.approx(0.95, abs=0.07)
+    assert results[0].low[0, 0] == results[0].high[0, 0] == 1
+
+
+@pytest.mark.parametrize("make", [np.random.RandomState, np.random.default_rng])
+def test_subsample_random_state_instance(make):
+    a = np.random.default_rng(0).normal(size=(2, 1000))
+    data = {"a": a[0], "b": a[0] + a[1]}
+    first = pairwise_tau(data, sample_size=100, random_state=make(0))
+    second = pairwise_tau(data, sample_size=100, random_state=make(0))
+    assert first.size == 100
+    np.testing.assert_array_equal(first.tau, second.tau)
+
+
+def test_constant_column():
+    tau = pairwise_tau({"a": [1.0, 2.0, 3.0], "b": [1.0, 1.0, 1.0]}).tau
+    assert np.isnan(tau[0, 1])
+
+
+@pytest.mark.parametrize(
+    "data, kwargs",
+    [
+        ({"a": [1.0, np.nan], "b": [1.0, 2.0]}, {}),
+        ({"a": [1.0, 2.0], "b": [1.0, 2.0, 3.0]}, {}),
+        ({"a": [1.0], "b": [1.0]}, {}),
+        (np.zeros(5), {}),
+        ({"a": np.arange(30.0), "b": np.arange(30.0)}, {"sample_size": 30}),
+    ],
+)
+def test_invalid(data, kwargs):
+    with pytest.raises(ValueError):
+        pairwise_tau(data, **kwargs)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from rvtools.dists import halves_uniform, tp_uniform
+from rvtools.dists.gen import _kernels
+
+PARAMS = [(0, 1, 3, 0.3), (-1, 0.1, 5, 0.9), (1e6, 1e6 + 1, 1e6 + 2, 1 / 3), (0, 0, 1, 0.0)]
+
+
+def pdf_single(x, mini, sep, maxi, psep):
+    if mini <= x <= sep:
+        return psep * (1 / (sep - mini))
+    elif sep <= x <= maxi:
+        return (1 - psep) * (1 / (maxi - sep))
+    return 0.0
+
+
+def cdf_single(x, mini, sep, maxi, psep):
+    if x < mini:
+        return 0.0
+    elif x < sep:
+        return psep * ((x - mini) / (sep - mini))
+    elif x < maxi:
+        return psep + (1 - psep) * ((x - sep) / (maxi - sep))
+    return 1.0
+
+
+def ppf_single(p, mini, sep, maxi, psep):
+    if 0 <= p < psep:
+        return mini + p / psep * (sep - mini)
+    elif psep <= p <= 1:
+        return sep + (p - psep) / (1 - psep) * (maxi - sep)
+    return np.nan
+
+
+@pytest.fixture(params=_kernels.available_backends())
+def backend(request):
+    return request.param
+
+
+@pytest.mark.parametrize("params", PARAMS, ids=str)
+def test_matches_scalar(params, backend):
+    mini, _, maxi, _ = params
+    x = np.linspace(mini - 1, maxi + 1, 1001)
+    q = np.linspace(-0.1, 1.1, 1001)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for kernel, scalar, values in [
+            (_kernels.pdf, pdf_single, x),
+            (_kernels.cdf, cdf_single, x),
+            (_kernels.ppf, ppf_single, q),
+        ]:
+            expected = [scalar(v, *params) for v in values]
+            np.testing.assert_array_equal(kernel(values, *params, backend=backend), expected)
+
+
+def test_broadcasting(backend):
+    x = np.array([[0.5], [2.0]])
+    sep = np.array([1.0, 2.0])
+    result = _kernels.cdf(x, 0, sep, np.array([3.0]), 0.5, backend=backend)
+    assert result.shape == (2, 2)
+    np.testing.assert_allclose(result, [[0.25, 0.125], [0.75, 0.5]])
+    assert _kernels.pdf(1, 0, 2, 3, backend=backend).shape == ()
+
+
+def test_rvs_stratified_and_reproducible(backend):
+    samples = _kernels.rvs(
+        0, 1, 3, 0.3, size=(1000,), random_state=np.random.RandomState(0), backend=backend
+    )
+    assert np.all((samples[:300] >= 0) & (samples[:300] <= 1))
+    assert np.all((samples[300:] >= 1) & (samples[300:] <= 3))
+    again = _kernels.rvs(
+        0, 1, 3, 0.3, size=(1000,), random_state=np.random.RandomState(0), backend=backend
+    )
+    np.testing.assert_array_equal(samples, again)
+    with pytest.raises(NotImplementedError):
+        _kernels.rvs(0, 1, 3, size=(2, 2))
+
+
+def test_backends_agree():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1, 4, 10_000)
+    q = rng.uniform(-0.1, 1.1, 10_000)
+    psep = rng.uniform(0, 1, 10_000)
+    for kernel, values in [(_kernels.pdf, x), (_kernels.cdf, x), (_kernels.ppf, q)]:
+        np.testing.assert_array_equal(
+            kernel(values, 0, 1, 3, psep, backend="numba"),
+            kernel(values, 0, 1, 3, psep, backend="numpy"),
+        )
+
+
+def test_distributions_use_kernels():
+    np.testing.assert_allclose(tp_uniform(0, 1, 3, 0.3).pdf([-1, 0.5, 2]), [0, 0.3, 0.35])
+    np.testing.assert_allclose(halves_uniform(0, 1, 3).ppf([0.25, 0.75]), [0.5, 2])
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setenv("RVTOOLS_KERNELS", "numpy")
+    assert _kernels.default_backend() == "numpy"
+    with pytest.raises(ValueError, match="not available"):
+        _kernels.pdf(0.5, 0, 1, 3, backend="fortran")
@@ -0,0 +1,126 @@
+import pickle
+
+import numpy as np
+import pytest
+import scipy
+from scipy.stats.distributions import rv_frozen
+
+from rvtools import memo
+from rvtools.construct import (
+    beta,
+    empirical,
+    lognorm,
+    loguniform,
+    mixture,
+    norm,
+    pert,
+    tp_uniform,
+    uniform,
+)
+
+CONSTRUCTED = [
+    norm(1, 2),
+    lognorm(p5=1, p95=10),
+    beta(2, 3),
+    uniform(0, 1),
+    loguniform(1, 10),
+    pert(0, 3, 12),
+    tp_uniform(0, 1, 3, 0.2),
+    mixture([norm(0, 1), norm(5, 1)], [0.3, 0.7]),
+    empirical([1.0, 2.0, 4.0]),
+]
+
+
+@pytest.mark.parametrize("dist", CONSTRUCTED, ids=lambda d: type(d.dist).__name__)
+def test_constructors_return_cached(dist):
+    assert isinstance(dist, memo.CachedFrozen)
+    assert isinstance(dist, scipy.stats.distributions.rv_frozen)
+    plain = dist.dist.freeze(*dist.args, **dist.kwds)
+    for _ in range(2):
+        assert dist.mean() == pytest.approx(plain.mean())
+        assert dist.std() == pytest.approx(plain.std())
+        assert dist.support() == plain.support()
+        assert dist.interval(0.9) == pytest.approx(plain.interval(0.9))
+        assert dist.ppf([0.05, 0.5, 0.95]) == pytest.approx(plain.ppf([0.05, 0.5, 0.95]))
+        assert dist.stats(moments="mvs") == pytest.approx(plain.stats(moments="mvs"))
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """A cached distribution, and a dictionary counting calls to SciPy's frozen methods."""
+    calls = {}
+    for name in ["mean", "ppf", "stats"]:
+        original = getattr(rv_frozen, name)
+
+        def wrapper(*args, _name=name, _original=original, **kwargs):
+            calls[_name] = calls.get(_name, 0) + 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(rv_frozen, name, wrapper)
+    return tp_uniform(0, 1, 3, 0.2), calls
+
+
+def test_computed_once(counted):
+    dist, calls = counted
+    for _ in range(3):
+        dist.mean()
+        dist.stats()
+        dist.stats(moments="s")
+        dist.ppf([0.1, 0.9])
+        dist.ppf(0.5)
+    assert calls == {"mean": 1, "stats": 2, "ppf": 2}
+
+
+def test_large_ppf_calls_are_not_cached(counted):
+    dist, calls = counted
+    qs = np.linspace(0, 1, memo.PPF_MAX_VALUES + 1)
+    dist.ppf(qs)
+    dist.ppf(qs)
+    assert calls["ppf"] == 2
+    assert "_ppf_memo" not in dist.__dict__
+
+
+def test_ppf_cache_is_bounded(counted):
+    dist, calls = counted
+    for q in np.linspace(0, 1, 3 * memo.PPF_MAX_ENTRIES):
+        dist.ppf(q)
+    assert len(dist._ppf_memo) == memo.PPF_MAX_ENTRIES
+    dist.ppf(1.0)  # Most recent
+    dist.ppf(0.0)  # Evicted
+    assert calls["ppf"] == 3 * memo.PPF_MAX_ENTRIES + 1
+
+
+def test_results_are_copies():
+    dist = norm(0, 1)
+    result = dist.ppf([0.5, 0.9])
+    result[:] = 0
+    assert dist.ppf([0.5, 0.9]) == pytest.approx([0, 1.2815516])
+
+
+def test_disabled(counted):
+    dist, calls = counted
+    with memo.disabled():
+        assert not memo.is_enabled()
+        dist.mean()
+        dist.mean()
+        assert type(norm(0, 1)) is scipy.stats._distn_infrastructure.rv_continuous_frozen
+    assert memo.is_enabled()
+    assert calls["mean"] == 2
+    assert "_memo" not in dist.__dict__
+
+
+def test_pickle():
+    dist = pert(0, 3, 12)
+    dist.mean()
+    dist.ppf(0.5)
+    copy = pickle.loads(pickle.dumps(dist))
+    assert isinstance(copy, memo.CachedFrozen)
+    assert "_memo" not in copy.__dict__
+    assert copy.mean() == dist.mean()
+
+
+def test_memoize_leaves_other_objects_unchanged():
+    frozen = scipy.stats.bernoulli(0.5)
+    assert memo.memoize(frozen) is frozen
+    cached = norm(0, 1)
+    assert memo.memoize(cached) is cached
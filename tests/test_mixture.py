@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import beta, certainty, lognorm, mixture, norm, uniform
+from rvtools.dists.gen.mixture import alias_sample, alias_table
+
+
+@pytest.fixture
+def lognormal():
+    return lognorm(p5=1, p95=10)
+
+
+@pytest.fixture
+def with_point_mass(lognormal):
+    return mixture([certainty(0), lognormal], [0.3, 0.7])
+
+
+def test_alias_method_frequencies():
+    weights = np.array([0.5, 0.05, 0.2, 0.25])
+    prob, alias = alias_table(weights)
+    rng = np.random.default_rng(0)
+    idx = alias_sample(prob, alias, 1_000_000, rng)
+    freqs = np.bincount(idx, minlength=len(weights)) / idx.size
+    assert freqs == pytest.approx(weights, abs=2e-3)
+
+
+def test_weights_are_normalized():
+    dist = mixture([norm(0, 1), norm(10, 1)], [1, 3])
+    assert dist.mean() == pytest.approx(7.5)
+
+
+def test_point_mass_cdf(with_point_mass, lognormal):
+    assert with_point_mass.cdf(-1e-10) == 0
+    assert with_point_mass.cdf(0) == pytest.approx(0.3)
+    assert with_point_mass.cdf(5) == pytest.approx(0.3 + 0.7 * lognormal.cdf(5))
+
+
+def test_point_mass_ppf(with_point_mass, lognormal):
+    assert with_point_mass.ppf([0.1, 0.29]) == pytest.approx([0, 0])
+    ps = np.array([0.31, 0.5, 0.99])
+    assert with_point_mass.ppf(ps) == pytest.approx(lognormal.ppf((ps - 0.3) / 0.7))
+
+
+def test_point_mass_rvs(with_point_mass):
+    samples = with_point_mass.rvs(size=100_000, random_state=0)
+    assert np.mean(samples == 0) == pytest.approx(0.3, abs=0.01)
+
+
+def test_ppf_inverts_cdf():
+    dist = mixture([norm(0, 1), beta(2, 5), uniform(3, 4)], [0.2, 0.5, 0.3])
+    xs = np.linspace(-2, 4, 13)
+    assert dist.ppf(dist.cdf(xs)) == pytest.approx(xs)
+
+
+def test_moments(random_seed, with_point_mass):
+    samples = with_point_mass.rvs(size=2_000_000)
+    assert with_point_mass.mean() == pytest.approx(np.mean(samples), rel=1e-2)
+    assert with_point_mass.var() == pytest.approx(np.var(samples), rel=5e-2)
+    assert with_point_mass.stats("s") == pytest.approx(scipy.stats.skew(samples), rel=0.2)
+
+
+def test_rvs_is_reproducible(with_point_mass):
+    a = with_point_mass.rvs(size=100, random_state=42)
+    b = with_point_mass.rvs(size=100, random_state=42)
+    assert all(a == b)
+
+
+def test_mismatched_weights():
+    with pytest.raises(ValueError, match="must match"):
+        mixture([norm(0, 1)], [0.5, 0.5])
+    with pytest.raises(ValueError, match="non-negative"):
+        mixture([norm(0, 1), norm(1, 1)], [-0.5, 0.5])
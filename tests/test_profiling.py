@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+import scipy
+
+from rvtools import profiling
+from rvtools.construct import norm, tp_uniform
+from rvtools.dists import certainty
+
+
+@pytest.fixture(autouse=True)
+def disable_after():
+    yield
+    profiling.disable()
+
+
+def test_fast_path():
+    with profiling.profile() as prof:
+        norm(0, 1).ppf([0.1, 0.5])
+        norm(0, 1).cdf(0)
+        norm(0, 1).cdf(1)
+    report = prof.report()
+    assert report["norm"]["ppf"] == {"fast": {"calls": 1, "seconds": pytest.approx(0, abs=1)}}
+    assert report["norm"]["cdf"]["fast"]["calls"] == 2
+
+
+def test_generic_fallbacks():
+    class NoPpf(scipy.stats.rv_continuous):
+        def _cdf(self, x):
+            return scipy.special.ndtr(x)
+
+        def _pdf(self, x):
+            return scipy.stats.norm.pdf(x)
+
+    dist = NoPpf()
+    with profiling.profile() as prof:
+        dist.ppf(0.3)
+        dist.cdf(0.3)
+    report = prof.report()
+    assert report["NoPpf"]["ppf"].keys() == {"fallback"}
+    assert report["NoPpf"]["_ppf"]["fallback"]["calls"] == 1
+    assert report["NoPpf"]["cdf"].keys() == {"fast"}
+
+
+def test_numerical_moments_are_fallback():
+    with profiling.profile() as prof:
+        tp_uniform(0, 1, 3, 0.3).stats(moments="k")
+    report = prof.report()
+    assert report["TwoPieceUniform"]["stats"].keys() == {"fallback"}
+    assert report["TwoPieceUniform"]["_munp"]["fallback"]["calls"] > 0
+
+
+def test_explicit_regions():
+    class Looped(scipy.stats.rv_continuous):
+        def _pdf(self, x):
+            with profiling.region("Looped", "_pdf[np.vectorize]"):
+                return np.vectorize(scipy.stats.norm.pdf)(x)
+
+    with profiling.profile() as prof:
+        Looped().pdf([0.5, 2])
+        tp_uniform(0, 1, 3, 0.3).pdf([0.5, 2])
+    report = prof.report()
+    assert report["Looped"]["pdf"].keys() == {"fallback"}
+    assert report["Looped"]["_pdf[np.vectorize]"]["fallback"]["calls"] == 1
+    assert report["TwoPieceUniform"]["pdf"].keys() == {"fast"}
+
+
+def test_unpatched_when_disabled():
+    original = scipy.stats.rv_continuous.ppf
+    with profiling.profile():
+        assert scipy.stats.rv_continuous.ppf is not original
+    assert scipy.stats.rv_continuous.ppf is original
+    assert not profiling.is_enabled()
+
+
+def test_global_toggle():
+    prof = profiling.enable()
+    with pytest.raises(RuntimeError):
+        profiling.enable()
+    certainty(1).mean()
+    assert profiling.disable() is prof
+    assert "Certainty" in prof.report()
+    assert profiling.disable() is None
+
+
+def test_chrome_trace(tmp_path):
+    with profiling.profile(max_events=2) as prof:
+        for _ in range(3):
+            norm(0, 1).cdf(0)
+    path = tmp_path / "trace.json"
+    prof.to_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert len(events) == 2
+    assert events[0]["name"] == "norm.cdf"
+    assert events[0]["ph"] == "X"
+    assert events[0]["cat"] == "fast"
+    assert prof.report()["norm"]["cdf"]["fast"]["calls"] == 3
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import beta, certainty, lognorm, norm, tp_uniform, uniform
+from rvtools.fam import is_frozen_certainty, is_frozen_lognorm, is_frozen_norm
+from rvtools.propagate import add, affine, multiply, power
+from tests.conftest import assert_same_distribution
+
+
+class TestAdd:
+    def test_normals(self):
+        got = add(norm(1, 3), norm(-2, 4), certainty(0.5), 2)
+        assert is_frozen_norm(got)
+        assert_same_distribution(got, scipy.stats.norm(1.5, 5))
+
+    def test_constants_only(self):
+        got = add(1, certainty(2), 3)
+        assert is_frozen_certainty(got)
+        assert got.ppf(0.5) == 6
+
+    def test_single_dist_is_shifted(self):
+        got = add(tp_uniform(0, 1, 3), 10)
+        assert got.support() == (10, 13)
+        assert got.cdf(11) == pytest.approx(0.5)
+
+    def test_fallback(self, random_seed):
+        got = add(uniform(0, 1), uniform(0, 1))
+        # Triangular distribution on [0, 2]
+        assert got.mean() == pytest.approx(1, abs=1e-2)
+        assert got.cdf(0.5) == pytest.approx(0.125, abs=1e-2)
+
+    @pytest.mark.parametrize("make", [np.random.RandomState, np.random.default_rng])
+    def test_fallback_random_state_instance(self, make):
+        first = add(uniform(0, 1), uniform(0, 1), random_state=make(0))
+        second = add(uniform(0, 1), uniform(0, 1), random_state=make(0))
+        assert first.var() == pytest.approx(1 / 6, rel=1e-2)
+        assert first.ppf(0.3) == second.ppf(0.3)
+
+    def test_fallback_seeded_terms_are_independent(self):
+        got = add(uniform(0, 1), uniform(0, 1), random_state=0)
+        assert got.var() == pytest.approx(1 / 6, rel=1e-2)
+        assert got.cdf(0.5) == pytest.approx(0.125, abs=1e-2)
+
+
+class TestMultiply:
+    def test_lognormals(self):
+        got = multiply(lognorm(mu=1, sigma=3), lognorm(mu=-2, sigma=4), 2)
+        assert is_frozen_lognorm(got)
+        assert_same_distribution(got, lognorm(mu=-1 + np.log(2), sigma=5))
+
+    def test_zero(self):
+        got = multiply(lognorm(mu=1, sigma=3), certainty(0))
+        assert is_frozen_certainty(got)
+        assert got.ppf(0.5) == 0
+
+    def test_scaled(self):
+        got = multiply(beta(2, 3), 10)
+        assert got.support() == (0, 10)
+        assert got.mean() == pytest.approx(4)
+
+    def test_fallback(self, random_seed):
+        got = multiply(lognorm(mu=0, sigma=1), -1, lognorm(mu=0, sigma=1))
+        assert got.median() == pytest.approx(-1, rel=1e-2)
+
+    def test_fallback_seeded_factors_are_independent(self):
+        got = multiply(uniform(0, 1), uniform(0, 1), random_state=0)
+        assert got.mean() == pytest.approx(1 / 4, rel=1e-2)
+
+    def test_fallback_random_state_instance(self):
+        got = multiply(uniform(0, 1), uniform(0, 1), random_state=np.random.RandomState(0))
+        assert got.mean() == pytest.approx(1 / 4, rel=1e-2)
+
+
+class TestPower:
+    @pytest.mark.parametrize("exponent", [-3, 0.5, 2])
+    def test_lognormal(self, exponent):
+        got = power(lognorm(mu=1, sigma=2), exponent)
+        assert is_frozen_lognorm(got)
+        assert_same_distribution(got, lognorm(mu=exponent, sigma=2 * abs(exponent)))
+
+    def test_constant(self):
+        assert power(certainty(3), 2).ppf(0.5) == 9
+
+    def test_fallback(self, random_seed):
+        got = power(uniform(0, 1), 2)
+        assert got.mean() == pytest.approx(1 / 3, abs=1e-2)
+
+
+class TestAffine:
+    @pytest.mark.parametrize(
+        "dist", [beta(2, 3), tp_uniform(0, 1, 3, 0.3), lognorm(mu=0, sigma=1)], ids=repr
+    )
+    def test_positive_scale(self, dist):
+        got = affine(dist, scale=2, loc=1)
+        assert got.dist.__class__ is dist.dist.__class__
+        assert got.ppf([0.1, 0.5, 0.9]) == pytest.approx(2 * dist.ppf([0.1, 0.5, 0.9]) + 1)
+
+    def test_negative_scale_norm(self):
+        assert_same_distribution(affine(norm(1, 2), scale=-3), scipy.stats.norm(-3, 6))
+
+    def test_negative_scale_uniform(self):
+        assert_same_distribution(affine(uniform(1, 2), scale=-1, loc=1), uniform(-1, 0))
+
+    def test_zero_scale(self):
+        assert is_frozen_certainty(affine(norm(1, 2), scale=0, loc=4))
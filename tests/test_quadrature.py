@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import CopulaJoint, beta, certainty, lognorm, mixture, norm, uniform
+from rvtools.quadrature import _sparse_grid, _tensor_grid, expect
+
+
+@pytest.mark.parametrize("grid", [_tensor_grid, _sparse_grid])
+@pytest.mark.parametrize("n_dims", [1, 2, 4])
+def test_grids_integrate_polynomials(grid, n_dims):
+    nodes, weights = grid(n_dims, 4)
+    assert weights.sum() == pytest.approx(1)
+    # Exact up to total degree 7 (for the sparse grid), with E[z^2] = 1, E[z^4] = 3, E[z^6] = 15
+    assert weights @ nodes[:, 0] ** 6 == pytest.approx(15)
+    assert weights @ (nodes[:, 0] ** 3 * nodes[:, -1]) == pytest.approx(3 if n_dims == 1 else 0)
+    if n_dims > 1:
+        assert weights @ (nodes[:, 0] ** 4 * nodes[:, 1] ** 2) == pytest.approx(3)
+
+
+def test_smooth_model():
+    inputs = {
+        "a": lognorm(mu=0, sigma=0.3),
+        "b": norm(1, 1),
+        "c": uniform(0, 2),
+        "d": beta(2, 3),
+        "e": norm(0, 1),
+    }
+
+    def model(x):
+        return x["a"] * np.exp(0.3 * x["b"]) + x["c"] * x["d"] + np.sin(x["e"])
+
+    result = expect(model, inputs, rtol=1e-7)
+    expected = np.exp(0.045) * np.exp(0.3 + 0.045) + 1 * 0.4
+    assert result.converged
+    assert result.value == pytest.approx(expected, rel=1e-6)
+    assert result.error <= 1e-7 * result.value
+
+
+def test_sparse_needs_fewer_evaluations():
+    inputs = [norm(0, 1), lognorm(mu=0, sigma=0.5), uniform(1, 2), norm(2, 1)]
+
+    def model(x):
+        return x[0] ** 2 * x[1] + x[2] * x[3]
+
+    tensor = expect(model, inputs, rtol=1e-8, method="tensor")
+    sparse = expect(model, inputs, rtol=1e-8, method="sparse")
+    assert tensor.value == pytest.approx(sparse.value, rel=1e-8)
+    assert sparse.value == pytest.approx(np.exp(0.125) + 1.5 * 2, rel=1e-8)
+    assert sparse.n_evaluations < tensor.n_evaluations / 2
+
+
+def test_correlated_inputs():
+    joint = CopulaJoint({"x": norm(0, 1), "y": norm(0, 2)}, spearman_rho={("x", "y"): 0.5})
+    corr = joint._wrapped.copula.corr[0, 1]
+    result = expect(lambda v: v["x"] * v["y"], joint)
+    assert result.value == pytest.approx(2 * corr, rel=1e-10)
+    assert result.n_evaluations < 40
+
+
+def test_certainties_take_no_dimension():
+    result = expect(lambda x: x["a"] * x["b"], {"a": certainty(3), "b": certainty(2)})
+    assert result == (6.0, 0.0, 1, 1, True)
+
+    result = expect(lambda x: x["a"] * x["b"] ** 2, {"a": certainty(3), "b": norm(0, 1)})
+    assert result.value == pytest.approx(3)
+    assert result.n_evaluations < 10
+
+
+def test_point_masses_are_exact():
+    inputs = {
+        "discount": mixture([certainty(0), norm(1, 0.1)], [0.8, 0.2]),
+        "flag": scipy.stats.bernoulli(0.3),
+        "x": lognorm(mu=0, sigma=0.5),
+    }
+
+    def model(x):
+        return (x["discount"] == 0) * x["x"] + x["flag"] * 10
+
+    result = expect(model, inputs)
+    assert result.value == pytest.approx(0.8 * np.exp(0.125) + 3, rel=1e-8)
+
+    # Correlated, the discontinuous indicator is integrated through the ppf: not exact
+    joint = CopulaJoint(inputs, spearman_rho={("discount", "x"): 0.3})
+    indicator = expect(lambda x: x["discount"] == 0, joint, max_evaluations=500)
+    assert indicator.value == pytest.approx(0.8, abs=0.1)
+    assert indicator.value != pytest.approx(0.8, abs=1e-3)
+
+
+def test_max_evaluations():
+    result = expect(lambda x: np.abs(x["a"]), {"a": norm(0, 1)}, max_evaluations=20)
+    assert not result.converged
+    assert result.n_evaluations <= 20
+    assert result.value == pytest.approx(np.sqrt(2 / np.pi), abs=0.1)
+
+
+def test_model_output_shape():
+    with pytest.raises(ValueError):
+        expect(lambda x: np.zeros(3), {"a": norm(0, 1)})
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        expect(lambda x: x["a"], {"a": norm(0, 1)}, method="monte-carlo")
+
+
+def test_tensor_grid():
+    inputs = {"a": lognorm(mu=1, sigma=0.5), "b": norm(0, 2)}
+    result = expect(lambda x: x["a"] * np.exp(x["b"] / 4), inputs, method="tensor")
+    assert result.converged
+    assert result.value == pytest.approx(np.exp(1.125) * np.exp(0.125), rel=1e-6)
+    assert result.n_evaluations < 500
+
+
+def test_model_output_shape():
+    with pytest.raises(ValueError, match="one output per sample"):
+        expect(lambda x: x["a"][:1], {"a": norm(0, 1), "b": norm(0, 1)})
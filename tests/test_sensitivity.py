@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from rvtools.construct import CopulaJoint, norm, uniform
+from rvtools.sensitivity import sobol
+
+
+def ishigami(x, a=7, b=0.1):
+    return np.sin(x[0]) + a * np.sin(x[1]) ** 2 + b * x[2] ** 4 * np.sin(x[0])
+
+
+def test_ishigami():
+    inputs = [uniform(-np.pi, np.pi)] * 3
+    indices = sobol(ishigami, inputs, 50_000, random_state=0)
+
+    # Analytic values for a=7, b=0.1
+    expected_first_order = [0.3139, 0.4424, 0]
+    expected_total = [0.5576, 0.4424, 0.2437]
+    assert indices.names == [0, 1, 2]
+    assert indices.first_order == pytest.approx(expected_first_order, abs=0.02)
+    assert indices.total == pytest.approx(expected_total, abs=0.02)
+    assert indices.variance == pytest.approx(13.8446, rel=0.02)
+    assert (indices.first_order_ci[:, 0] <= indices.first_order).all()
+    assert (indices.first_order <= indices.first_order_ci[:, 1]).all()
+    assert (indices.total_ci[:, 0] <= indices.total).all()
+    assert (indices.total <= indices.total_ci[:, 1]).all()
+
+
+def test_correlated_linear():
+    # Y = X1 + X2 with standard normal inputs of correlation rho
+    rho = np.sin(np.pi / 2 * 0.5)
+    inputs = CopulaJoint({"a": norm(0, 1), "b": norm(0, 1)}, kendall_tau={("a", "b"): 0.5})
+    indices = sobol(lambda x: x["a"] + x["b"], inputs, 50_000, random_state=0)
+
+    variance = 2 + 2 * rho
+    assert indices.first_order == pytest.approx([(1 + rho) ** 2 / variance] * 2, abs=0.02)
+    assert indices.total == pytest.approx([(1 - rho**2) / variance] * 2, abs=0.02)
+    frame = indices.to_frame()
+    assert list(frame.index) == ["a", "b"]
+    assert (frame["total_low"] < frame["total_high"]).all()
+
+
+def test_uncorrelated_joint_matches_dict():
+    marginals = {"a": norm(0, 1), "b": uniform(0, 1)}
+    model = lambda x: x["a"] * x["b"]  # noqa: E731
+    from_joint = sobol(model, CopulaJoint(marginals, kendall_tau={}), 1000, random_state=0)
+    from_dict = sobol(model, marginals, 1000, random_state=0)
+    assert from_joint.first_order == pytest.approx(from_dict.first_order)
+
+
+def test_chunking_does_not_change_result():
+    inputs = [uniform(-np.pi, np.pi)] * 3
+    a = sobol(ishigami, inputs, 1000, chunk_size=128, random_state=0)
+    b = sobol(ishigami, inputs, 1000, random_state=0)
+    assert a.total == pytest.approx(b.total)
+
+
+def test_model_output_shape():
+    with pytest.raises(ValueError, match="one output per sample"):
+        sobol(lambda x: np.ones(3), [norm(0, 1)], 100)
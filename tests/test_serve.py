@@ -0,0 +1,208 @@
+import asyncio
+import io
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from rvtools.construct import CopulaJoint, lognorm, norm
+from rvtools.serve import SamplingServer, _Batcher, load_models
+
+MODELS = {
+    "normal": norm(1, 2),
+    "cost": lognorm(p5=10, p95=100),
+    "joint": CopulaJoint({"a": norm(0, 1), "b": lognorm(1, 2)}, spearman_rho={("a", "b"): 0.5}),
+}
+
+
+def http(method, target, body=b""):
+    head = f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    return head.encode() + body
+
+
+async def request(port, method, target, body=b""):
+    return await send(port, http(method, target, body))
+
+
+async def send(port, data):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), headers, payload
+
+
+def npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array))
+    return buffer.getvalue()
+
+
+def run(scenario, **kwargs):
+    """Run ``scenario(server, port)`` against a server listening on a free port."""
+
+    async def main():
+        server = SamplingServer(MODELS, **kwargs)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await scenario(server, port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    return asyncio.run(main())
+
+
+def test_ppf_and_cdf():
+    ps = np.array([[0.1, 0.5], [0.9, 0.99]])
+
+    async def scenario(server, port):
+        ppf = await request(port, "POST", "/models/normal/ppf", npy(ps))
+        cdf = await request(port, "POST", "/models/cost/cdf", npy([20.0, 50.0]))
+        return ppf, cdf
+
+    (status, headers, payload), (_, _, cdf) = run(scenario)
+    assert status == 200
+    assert headers["Content-Type"] == "application/x-npy"
+    assert np.load(io.BytesIO(payload)) == pytest.approx(MODELS["normal"].ppf(ps))
+    assert np.load(io.BytesIO(cdf)) == pytest.approx(MODELS["cost"].cdf([20.0, 50.0]))
+
+
+def test_seeded_rvs_are_reproducible():
+    async def scenario(server, port):
+        return [await request(port, "POST", "/models/cost/rvs?size=100&seed=3") for _ in range(2)]
+
+    (_, _, first), (_, _, second) = run(scenario)
+    expected = MODELS["cost"].rvs(size=100, random_state=np.random.default_rng(3))
+    assert np.load(io.BytesIO(first)) == pytest.approx(expected)
+    assert first == second
+
+
+def test_joint_rvs():
+    async def scenario(server, port):
+        return await request(port, "POST", "/models/joint/rvs?size=50")
+
+    status, headers, payload = run(scenario)
+    assert status == 200
+    assert json.loads(headers["X-Columns"]) == ["a", "b"]
+    assert np.load(io.BytesIO(payload)).shape == (50, 2)
+
+
+def test_concurrent_requests_are_coalesced(monkeypatch):
+    calls = []
+    ppf = MODELS["normal"].ppf
+    monkeypatch.setattr(MODELS["normal"], "ppf", lambda q: calls.append(len(q)) or ppf(q))
+    requests = [np.random.default_rng(i).uniform(size=i + 1) for i in range(10)]
+
+    async def scenario(server, port):
+        return await asyncio.gather(
+            *[request(port, "POST", "/models/normal/ppf", npy(q)) for q in requests]
+        )
+
+    responses = run(scenario, batch_window=0.2)
+    for q, (status, _, payload) in zip(requests, responses):
+        assert status == 200
+        assert np.load(io.BytesIO(payload)) == pytest.approx(ppf(q))
+    assert sum(calls) == sum(len(q) for q in requests)
+    assert len(calls) < len(requests)
+
+
+def test_unseeded_rvs_are_coalesced():
+    async def scenario(server, port):
+        return await asyncio.gather(*[server.evaluate("normal", "rvs", size=s) for s in [1, 5, 10]])
+
+    results = run(scenario, random_state=0)
+    assert [len(r) for r in results] == [1, 5, 10]
+    expected = MODELS["normal"].rvs(size=16, random_state=np.random.default_rng(0))
+    assert np.concatenate(results) == pytest.approx(expected)
+
+
+def test_keep_alive():
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        statuses = []
+        for _ in range(3):
+            writer.write(b"GET /models HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length"):
+                    length = int(line.split(b":")[1])
+            description = json.loads(await reader.readexactly(length))
+            statuses.append((int(status.split()[1]), description))
+        writer.close()
+        return statuses
+
+    for status, description in run(scenario):
+        assert status == 200
+        assert description["joint"] == {"kind": "joint", "columns": ["a", "b"]}
+        assert description["normal"] == {"kind": "univariate", "family": "norm_gen"}
+
+
+@pytest.mark.parametrize(
+    "data, expected_status",
+    [
+        (http("POST", "/models/missing/ppf", npy([0.5])), 404),
+        (http("POST", "/models/normal/pdf", npy([0.5])), 404),
+        (http("POST", "/nowhere"), 404),
+        (http("GET", "/models/normal/ppf"), 405),
+        (http("POST", "/models/normal/ppf", b"not an array"), 400),
+        (http("POST", "/models/normal/rvs"), 400),
+        (http("POST", "/models/joint/ppf", npy([0.5])), 400),
+        (b"GARBAGE\r\n\r\n", 400),
+        (b"POST /models/normal/ppf HTTP/1.1\r\nContent-Length: many\r\n\r\n", 400),
+    ],
+)
+def test_errors(data, expected_status):
+    async def scenario(server, port):
+        return await send(port, data)
+
+    status, headers, payload = run(scenario)
+    assert status == expected_status
+    assert "error" in json.loads(payload)
+
+
+def test_cancelled_requests_do_not_fail_the_batch():
+    async def main():
+        batcher = _Batcher(lambda items: items, None, window=0.01, max_size=100)
+        cancelled, kept = batcher.submit("a", 1), batcher.submit("b", 1)
+        cancelled.cancel()
+        return await asyncio.wait_for(kept, timeout=5)
+
+    assert asyncio.run(main()) == "b"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "rvtools.sock")
+
+    async def main():
+        server = SamplingServer(MODELS)
+        listener = await server.start(path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"POST /models/normal/rvs?size=4&seed=0 HTTP/1.1\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        server.close()
+        return response
+
+    head, _, payload = asyncio.run(main()).partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert np.load(io.BytesIO(payload)).shape == (4,)
+
+
+def test_load_models():
+    assert load_models("tests.test_serve:MODELS") is MODELS
+    with pytest.raises(ValueError):
+        load_models("tests.test_serve")
@@ -0,0 +1,126 @@
+import json
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+import scipy
+
+from rvtools import spec
+from rvtools.cli import main
+
+SPEC = {
+    "seed": 0,
+    "marginals": {
+        "cost": {"family": "lognorm", "p5": 10, "p95": 100},
+        "duration": {"family": "pert", "args": [1, 2, 6]},
+        "share": {"family": "beta", "quantiles": {"0.1": 0.2, "0.9": 0.6}},
+    },
+    "kendall_tau": [["cost", "duration", 0.4]],
+}
+
+TOML = textwrap.dedent(
+    """
+    seed = 0
+    kendall_tau = [["cost", "duration", 0.4]]
+
+    [marginals.cost]
+    family = "lognorm"
+    p5 = 10
+    p95 = 100
+
+    [marginals.duration]
+    family = "pert"
+    args = [1, 2, 6]
+
+    [marginals.share]
+    family = "beta"
+    quantiles = { "0.1" = 0.2, "0.9" = 0.6 }
+    """
+)
+
+
+def test_from_dict():
+    joint = spec.from_dict(SPEC)
+    assert list(joint.marginals) == ["cost", "duration", "share"]
+    assert joint.marginals["cost"].ppf([0.05, 0.95]) == pytest.approx([10, 100])
+    assert joint.marginals["duration"].support() == (1, 6)
+    assert joint.marginals["share"].ppf([0.1, 0.9]) == pytest.approx([0.2, 0.6])
+
+
+def test_load_json_and_toml(tmp_path):
+    (tmp_path / "model.json").write_text(json.dumps(SPEC))
+    (tmp_path / "model.toml").write_text(TOML)
+    assert spec.load(tmp_path / "model.json") == spec.load(tmp_path / "model.toml") == SPEC
+    with pytest.raises(ValueError):
+        spec.load(tmp_path / "model.yaml")
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"marginals": {}},
+        {"marginals": {"x": {"p5": 1, "p95": 2}}},
+        {"marginals": {"x": {"family": "mixture"}}},
+        {"marginals": {"x": {"family": "norm", "args": [0, 1]}}, "correlations": []},
+    ],
+)
+def test_invalid_spec(bad):
+    with pytest.raises(ValueError):
+        spec.from_dict(bad)
+
+
+def test_chunks_do_not_change_samples():
+    joint = spec.from_dict(SPEC)
+    whole = next(spec.sample_chunks(joint, 1000, chunk_size=1000, random_state=1))
+    chunks = list(spec.sample_chunks(joint, 1000, chunk_size=300, random_state=1))
+    assert [len(c["cost"]) for c in chunks] == [300, 300, 300, 100]
+    for name in whole:
+        assert np.concatenate([c[name] for c in chunks]) == pytest.approx(whole[name])
+
+
+def test_write_npy(tmp_path):
+    joint = spec.from_dict(SPEC)
+    paths = spec.write_npy(joint, tmp_path / "out", 20_000, chunk_size=3000, random_state=0)
+    assert sorted(p.name for p in paths.values()) == ["cost.npy", "duration.npy", "share.npy"]
+    samples = {name: np.load(path) for name, path in paths.items()}
+    assert all(len(s) == 20_000 for s in samples.values())
+    tau = scipy.stats.kendalltau(samples["cost"], samples["duration"]).statistic
+    assert tau == pytest.approx(0.4, abs=0.02)
+    assert scipy.stats.kendalltau(samples["cost"], samples["share"]).statistic == pytest.approx(
+        0, abs=0.02
+    )
+
+
+def test_cli_sample_npy(tmp_path):
+    (tmp_path / "model.toml").write_text(TOML)
+    out = tmp_path / "samples"
+    main(["sample", str(tmp_path / "model.toml"), "--size", "100", "--out", str(out)])
+    first = np.load(out / "cost.npy")
+    main(
+        ["sample", str(tmp_path / "model.toml"), "--size", "100", "--out", str(out), "--seed", "1"]
+    )
+    second = np.load(out / "cost.npy")
+
+    joint = spec.from_dict(SPEC)
+    expected = next(spec.sample_chunks(joint, 100, random_state=0))["cost"]
+    assert first == pytest.approx(expected)
+    assert not np.allclose(first, second)
+
+
+def test_cli_sample_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    (tmp_path / "model.json").write_text(json.dumps(SPEC))
+    out = tmp_path / "samples.parquet"
+    args = ["sample", str(tmp_path / "model.json"), "--size", "1000", "--out", str(out)]
+    main(args + ["--chunk-size", "300"])
+    file = pq.ParquetFile(out)
+    assert file.metadata.num_rows == 1000
+    assert file.metadata.num_row_groups == 4
+    assert file.schema_arrow.names == ["cost", "duration", "share"]
+
+
+def test_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        spec.write_parquet(spec.from_dict(SPEC), tmp_path / "samples.parquet", 10)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.summary import Moments, QuantileSketch, StreamingSummary
+
+
+@pytest.fixture
+def samples():
+    return np.random.default_rng(0).lognormal(0, 1, 200_000)
+
+
+def test_moments_match_numpy(samples):
+    moments = Moments()
+    for chunk in np.array_split(samples, 7):
+        moments.update(chunk)
+
+    assert moments.n == samples.size
+    assert moments.mean() == pytest.approx(np.mean(samples))
+    assert moments.var() == pytest.approx(np.var(samples))
+    assert moments.skew() == pytest.approx(scipy.stats.skew(samples))
+    assert moments.kurtosis() == pytest.approx(scipy.stats.kurtosis(samples))
+
+
+def test_moments_merge_is_order_independent(samples):
+    left, right = np.array_split(samples, [1000])
+    a = Moments().update(left).merge(Moments().update(right))
+    b = Moments().update(right).merge(Moments().update(left))
+    assert (a.mean(), a.var(), a.skew()) == pytest.approx((b.mean(), b.var(), b.skew()))
+
+
+def test_moments_empty():
+    assert np.isnan(Moments().mean())
+    assert np.isnan(Moments().update([]).var())
+
+
+def test_quantiles_empty():
+    for summary in [QuantileSketch(), StreamingSummary().update([])]:
+        with pytest.raises(ValueError, match="no data"):
+            summary.cdf(0)
+        with pytest.raises(ValueError, match="no data"):
+            summary.ppf(0.5)
+
+
+@pytest.mark.parametrize("k", [200, 1000])
+def test_sketch_rank_error(samples, k):
+    sketch = QuantileSketch(k, random_state=0)
+    for chunk in np.array_split(samples, 10):
+        sketch.update(chunk)
+
+    ps = np.linspace(0.01, 0.99, 99)
+    true_ranks = np.mean(samples[:, None] <= sketch.ppf(ps), axis=0)
+    assert np.max(np.abs(true_ranks - ps)) < 3 / k
+    assert np.max(np.abs(sketch.cdf(np.quantile(samples, ps)) - ps)) < 3 / k
+
+
+def test_sketch_memory_is_bounded(samples):
+    sketch = QuantileSketch(200, random_state=0)
+    for chunk in np.array_split(samples, 100):
+        sketch.update(chunk)
+    assert sum(level.size for level in sketch._levels) < 3 * 200
+
+
+def test_summary_merge(samples):
+    parts = np.array_split(samples, 4)
+    merged = StreamingSummary(random_state=0)
+    for part in parts:
+        merged.merge(StreamingSummary(random_state=1).update(part))
+
+    assert merged.n == samples.size
+    assert merged.mean() == pytest.approx(np.mean(samples))
+    assert merged.ppf([0, 1]) == pytest.approx([samples.min(), samples.max()])
+    assert merged.ppf(0.5) == pytest.approx(np.median(samples), rel=1e-2)
+    assert merged.cdf([samples.min() - 1, samples.max()]) == pytest.approx([0, 1])
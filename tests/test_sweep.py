@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import scipy
+
+from rvtools.construct import CopulaJoint, beta, lognorm, norm, pert, uniform
+from rvtools.sweep import scenarios, sweep
+
+XS = np.linspace(1, 3, 7)
+
+
+@pytest.mark.parametrize(
+    "constructor",
+    [
+        lambda x: lognorm(p5=x, p95=2 * x),
+        lambda x: norm(x, 1),
+        lambda x: beta(x, 2),
+        # Constructors that do not accept arrays
+        lambda x: uniform(x, x + 1),
+        lambda x: pert(0, x, 5),
+    ],
+)
+def test_scenarios_match_loop(constructor):
+    samples = scenarios(constructor, XS, 1000, random_state=0)
+    latent = np.random.default_rng(0).standard_normal(1000)
+    assert samples.shape == (len(XS), 1000)
+    for i, x in enumerate(XS):
+        expected = constructor(x).ppf(scipy.stats.norm.cdf(latent))
+        assert samples[i] == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_vectorized_flag():
+    looped = scenarios(lambda x: norm(x, 1), XS, 100, vectorized=False, random_state=0)
+    broadcast = scenarios(lambda x: norm(x, 1), XS, 100, vectorized=True, random_state=0)
+    assert looped == pytest.approx(broadcast)
+    with pytest.raises(ValueError):
+        scenarios(lambda x: uniform(x, x + 1), XS, 100, vectorized=True)
+
+
+def test_silent_broadcast_failure_is_caught():
+    # Ignores all but the first value when given an array
+    constructor = lambda x: norm(np.ravel(x)[0], 1)  # noqa: E731
+    samples = scenarios(constructor, XS, 100, random_state=0)
+    assert samples[-1] == pytest.approx(norm(XS[-1], 1).ppf(scipy.stats.norm.cdf(samples[0] - 1)))
+
+
+def test_common_random_numbers():
+    samples = scenarios(lambda x: lognorm(p5=x, p95=2 * x), XS, 1000, random_state=0)
+    assert np.all(np.diff(samples, axis=0) > 0)
+
+
+def test_upper_tail():
+    samples = scenarios(lambda x: beta(x, 2), XS, 100_000, random_state=0)
+    assert np.all(samples < 1)
+    assert np.all(np.isfinite(samples))
+
+
+def test_sweep_independent():
+    inputs = {"b": norm(10, 1)}
+    out = sweep(lambda x: x["a"] + x["b"], inputs, "a", lambda x: norm(x, 1), XS, 1000)
+    assert out.shape == (len(XS), 1000)
+    # Only the swept input changes between scenarios
+    assert np.diff(out, axis=0) == pytest.approx(np.full((len(XS) - 1, 1000), XS[1] - XS[0]))
+
+
+def test_sweep_keeps_copula():
+    inputs = CopulaJoint({"a": norm(0, 1), "b": norm(0, 1)}, kendall_tau={("a", "b"): 0.8})
+    out = sweep(
+        lambda x: x["a"] - x["b"], inputs, "a", lambda x: norm(0, x), XS, 10_000, random_state=0
+    )
+    # With scale 1, the swept input has the same distribution and copula as "a"
+    rho = np.sin(np.pi / 2 * 0.8)
+    assert np.var(out[0]) == pytest.approx(2 - 2 * rho, rel=0.05)
@@ -145,3 +145,13 @@ def test_rvs_does_not_raise(param_triple):
     mini, sep, maxi = param_triple
     dist = tp_uniform(mini, sep, maxi, 0.5)
     dist.rvs(size=10)
+
+
+@pytest.mark.parametrize(
+    "dist",
+    [tp_uniform(0, 1, 3, 0.3), halves_uniform(0, 1, 3)],
+    ids=["tp_uniform", "halves_uniform"],
+)
+def test_rvs_reproducible(dist):
+    np.testing.assert_array_equal(dist.rvs(100, random_state=0), dist.rvs(100, random_state=0))
+    assert not np.array_equal(dist.rvs(100, random_state=0), dist.rvs(100, random_state=1))
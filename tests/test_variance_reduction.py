@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from rvtools.construct import CopulaJoint, beta, empirical, lognorm, norm, tp_uniform, uniform
+from rvtools.variance_reduction import analytic_mean, antithetic_sample, estimate_mean
+
+INPUTS = {"price": lognorm(mu=0, sigma=0.5), "quantity": norm(10, 2), "share": uniform(0, 1)}
+TRUE_MEAN = np.exp(0.125) * 10 + 0.5
+
+
+def model(x):
+    return x["price"] * x["quantity"] + x["share"]
+
+
+@pytest.mark.parametrize("antithetic", [False, True])
+@pytest.mark.parametrize("control_variates", [False, True])
+def test_standard_errors_are_calibrated(antithetic, control_variates):
+    estimates = [
+        estimate_mean(
+            model,
+            INPUTS,
+            2000,
+            antithetic=antithetic,
+            control_variates=control_variates,
+            chunk_size=512,
+            random_state=seed,
+        )
+        for seed in range(200)
+    ]
+    z = np.array([(e.mean - TRUE_MEAN) / e.stderr for e in estimates])
+    assert abs(z.mean()) < 0.3
+    assert z.std() == pytest.approx(1, abs=0.15)
+
+
+def test_variance_is_reduced():
+    plain = estimate_mean(model, INPUTS, antithetic=False, control_variates=False, random_state=0)
+    assert plain.stderr == pytest.approx(plain.naive_stderr)
+    for options in [{"antithetic": True}, {"control_variates": True}]:
+        options = {"antithetic": False, "control_variates": False, **options}
+        reduced = estimate_mean(model, INPUTS, random_state=0, **options)
+        assert reduced.stderr < plain.stderr / 1.5
+
+
+def test_linear_model_is_exact():
+    def linear(x):
+        return 2 * x["price"] - 3 * x["share"] + 1
+
+    estimate = estimate_mean(linear, INPUTS, 1000, random_state=0)
+    assert estimate.mean == pytest.approx(2 * np.exp(0.125) - 3 * 0.5 + 1)
+    assert estimate.stderr < 1e-10
+
+
+def test_correlated_inputs():
+    joint = CopulaJoint(INPUTS, spearman_rho={("price", "quantity"): 0.7})
+    estimate = estimate_mean(model, joint, 200_000, random_state=0)
+    samples = joint.rvs(2_000_000, random_state=np.random.default_rng(1))
+    assert estimate.mean == pytest.approx(model(samples).mean(), abs=5 * estimate.stderr + 0.01)
+
+
+def test_controls():
+    inputs = {"known": tp_uniform(0, 1, 3, 0.2), "unknown": empirical([1.0, 2.0, 4.0])}
+    estimate = estimate_mean(lambda x: x["known"] + x["unknown"], inputs, 1000, random_state=0)
+    assert estimate.controls == ["known"]
+    assert estimate.coefficients == pytest.approx([1], abs=0.1)
+    assert analytic_mean(beta(2, 3)) == pytest.approx(0.4)
+    assert analytic_mean(empirical([1.0, 2.0])) is None
+
+
+def test_antithetic_sample():
+    samples = antithetic_sample(INPUTS, 10, random_state=0)
+    for name, dist in INPUTS.items():
+        assert dist.cdf(samples[name][:5]) + dist.cdf(samples[name][5:]) == pytest.approx(1)
+    with pytest.raises(ValueError):
+        antithetic_sample(INPUTS, 11)
+
+
+def test_model_output_shape():
+    with pytest.raises(ValueError, match="one output per sample"):
+        estimate_mean(lambda x: np.zeros(3), INPUTS, 100)